@@ -0,0 +1,41 @@
+"""Store receipt purchases as purchased_item rows
+
+Revision ID: 008_purchased_item_rows
+Revises: 007_fix_user_identity_pkey
+Create Date: 2026-03-02
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "008_purchased_item_rows"
+down_revision: Union[str, None] = "007_fix_user_identity_pkey"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def get_sql_file_path(filename: str) -> str:
+    """Get the full path to a SQL file in the versions directory."""
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+def upgrade() -> None:
+    """Store receipt purchases as purchased_item rows."""
+    sql_file = get_sql_file_path("008_purchased_item_rows_up.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
+
+
+def downgrade() -> None:
+    """Move purchased_item rows back into receipt.data."""
+    sql_file = get_sql_file_path("008_purchased_item_rows_down.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
@@ -0,0 +1,34 @@
+-- Revert changes: move purchased_item rows back into receipt.data->'purchases'
+
+UPDATE receipt r
+SET data = r.data || jsonb_build_object('purchases', p.purchases)
+FROM (
+    SELECT
+        receipt_id,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', name,
+                'quantity', quantity,
+                'unit', unit,
+                'unit_quantity', unit_quantity,
+                'price', price,
+                'item_id', item_id
+            )
+            ORDER BY position
+        ) AS purchases
+    FROM purchased_item
+    GROUP BY receipt_id
+) p
+WHERE r.id = p.receipt_id;
+
+DELETE FROM purchased_item;
+
+DROP INDEX IF EXISTS idx_purchased_item_name;
+DROP INDEX IF EXISTS idx_purchased_item_receipt_id;
+CREATE INDEX idx_purchased_item_receipt_id ON purchased_item (receipt_id);
+
+ALTER TABLE purchased_item
+    DROP COLUMN position;
+
+ALTER TABLE purchased_item
+    ALTER COLUMN item_id SET NOT NULL;
@@ -0,0 +1,35 @@
+-- Store receipt purchases as purchased_item rows instead of receipt.data->'purchases'
+--
+-- Row ids are derived from (receipt_id, position) so re-ingesting a receipt
+-- updates its rows in place; the application computes the same md5-based id.
+
+ALTER TABLE purchased_item
+    ALTER COLUMN item_id DROP NOT NULL;
+
+ALTER TABLE purchased_item
+    ADD COLUMN position INTEGER NOT NULL DEFAULT 0;
+
+DROP INDEX IF EXISTS idx_purchased_item_receipt_id;
+CREATE INDEX idx_purchased_item_receipt_id ON purchased_item (receipt_id, position);
+CREATE INDEX idx_purchased_item_name ON purchased_item (name);
+
+-- Move the purchases already stored in JSONB into rows
+INSERT INTO purchased_item (
+    id, receipt_id, position, name, quantity, unit, unit_quantity, price, item_id
+)
+SELECT
+    md5(r.id || '/' || (p.position - 1))::uuid,
+    r.id,
+    p.position - 1,
+    p.item->>'name',
+    (p.item->>'quantity')::DECIMAL(12, 3),
+    (p.item->>'unit')::quantity_unit,
+    (p.item->>'unit_quantity')::DECIMAL(12, 3),
+    (p.item->>'price')::DECIMAL(12, 2),
+    (p.item->>'item_id')::uuid
+FROM receipt r,
+    jsonb_array_elements(r.data->'purchases') WITH ORDINALITY AS p(item, position)
+WHERE jsonb_typeof(r.data->'purchases') = 'array'
+ON CONFLICT (id) DO NOTHING;
+
+UPDATE receipt SET data = data - 'purchases' WHERE data ? 'purchases';
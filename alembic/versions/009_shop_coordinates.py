@@ -0,0 +1,41 @@
+"""Keep shop lat/lon in sync with osm_data and index them
+
+Revision ID: 009_shop_coordinates
+Revises: 008_purchased_item_rows
+Create Date: 2026-03-09
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "009_shop_coordinates"
+down_revision: Union[str, None] = "008_purchased_item_rows"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def get_sql_file_path(filename: str) -> str:
+    """Get the full path to a SQL file in the versions directory."""
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+def upgrade() -> None:
+    """Keep shop lat/lon in sync with osm_data and index them."""
+    sql_file = get_sql_file_path("009_shop_coordinates_up.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
+
+
+def downgrade() -> None:
+    """Drop the shop coordinate trigger and index."""
+    sql_file = get_sql_file_path("009_shop_coordinates_down.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
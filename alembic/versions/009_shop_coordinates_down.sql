@@ -0,0 +1,8 @@
+-- Revert changes: drop the shop coordinate trigger and index
+-- (lat / lon are legacy columns and keep their values)
+
+DROP INDEX IF EXISTS idx_shop_lat_lon;
+
+DROP TRIGGER IF EXISTS set_shop_coordinates ON shop;
+
+DROP FUNCTION IF EXISTS set_shop_coordinates();
@@ -0,0 +1,24 @@
+-- Keep shop.lat / shop.lon (legacy double precision columns) in sync with
+-- shop.osm_data so bounding-box queries can filter and use an index in SQL
+
+UPDATE shop
+SET lat = (osm_data->>'lat')::DOUBLE PRECISION,
+    lon = (osm_data->>'lon')::DOUBLE PRECISION
+WHERE osm_data ? 'lat' AND osm_data ? 'lon';
+
+CREATE OR REPLACE FUNCTION set_shop_coordinates()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.osm_data ? 'lat' AND NEW.osm_data ? 'lon' THEN
+        NEW.lat = (NEW.osm_data->>'lat')::DOUBLE PRECISION;
+        NEW.lon = (NEW.osm_data->>'lon')::DOUBLE PRECISION;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER set_shop_coordinates
+    BEFORE INSERT OR UPDATE OF osm_data ON shop
+    FOR EACH ROW EXECUTE FUNCTION set_shop_coordinates();
+
+CREATE INDEX idx_shop_lat_lon ON shop (lat, lon);
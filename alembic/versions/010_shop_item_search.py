@@ -0,0 +1,41 @@
+"""Add trigram and full-text search indexes on shop_item.name
+
+Revision ID: 010_shop_item_search
+Revises: 009_shop_coordinates
+Create Date: 2026-03-12
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "010_shop_item_search"
+down_revision: Union[str, None] = "009_shop_coordinates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def get_sql_file_path(filename: str) -> str:
+    """Get the full path to a SQL file in the versions directory."""
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+def upgrade() -> None:
+    """Add trigram and full-text search indexes on shop_item.name."""
+    sql_file = get_sql_file_path("010_shop_item_search_up.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
+
+
+def downgrade() -> None:
+    """Drop the shop_item.name search indexes."""
+    sql_file = get_sql_file_path("010_shop_item_search_down.sql")
+    with open(sql_file, "r", encoding="utf-8") as f:
+        sql = f.read()
+    op.execute(sql)
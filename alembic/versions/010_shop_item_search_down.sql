@@ -0,0 +1,5 @@
+-- Revert changes: drop the shop_item.name search indexes
+-- (the pg_trgm extension stays installed)
+
+DROP INDEX IF EXISTS idx_shop_item_name_tsv;
+DROP INDEX IF EXISTS idx_shop_item_name_trgm;
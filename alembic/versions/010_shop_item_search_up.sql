@@ -0,0 +1,10 @@
+-- Item search: trigram index for typo-tolerant matching (word_similarity / <%)
+-- and a tsvector index for whole-word matching, both over shop_item.name.
+-- The expressions must match PostgreSQLQueryBuilder._search_query.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX idx_shop_item_name_trgm ON shop_item USING gin (name gin_trgm_ops);
+
+CREATE INDEX idx_shop_item_name_tsv ON shop_item
+    USING gin (to_tsvector('simple', name));
@@ -0,0 +1,5 @@
+-- Revert changes: drop shop_item.normalized_name and its index
+
+DROP INDEX IF EXISTS idx_shop_item_shop_id_normalized_name;
+
+ALTER TABLE shop_item DROP COLUMN IF EXISTS normalized_name;
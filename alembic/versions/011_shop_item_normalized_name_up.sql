@@ -0,0 +1,9 @@
+-- Receipt lines are matched to shop items by a normalized name (case, diacritics,
+-- quantities and abbreviations folded, see src/helpers/item_names.py), looked up
+-- per shop in one probe of this index. The column is backfilled in Python by the
+-- migration, new rows get it from the ShopItem schema.
+
+ALTER TABLE shop_item ADD COLUMN normalized_name TEXT;
+
+CREATE INDEX idx_shop_item_shop_id_normalized_name
+    ON shop_item (shop_id, normalized_name);
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Report near-duplicate shop item names, per shop.
+
+Streams shop_item ordered by shop, so only one shop's items are held at a time,
+and prints every group of items whose normalized names are near duplicates as
+one JSON line. Nothing is modified; merging a group is a manual decision.
+"""
+
+import json
+import logging
+import os
+import sys
+from itertools import groupby
+
+from src.adapters.db.postgresql import init_db_session
+from src.adapters.doppler import load_doppler_secrets
+from src.handlers.shop_item_dedup import duplicate_groups
+from src.schemas.common import TableName
+
+
+def report_duplicates(shop_id: str | None = None, threshold: float = 0.7) -> int:
+    logger = logging.getLogger("pbapi")
+    where = {"shop_id": shop_id} if shop_id else None
+
+    count = 0
+    with init_db_session(logger) as session:
+        session.use_table(TableName.SHOP_ITEM)
+        items = session.iter_many(where, order_by="shop_id")
+        for item_shop_id, shop_items in groupby(
+            items, key=lambda item: item["shop_id"]
+        ):
+            for group in duplicate_groups(shop_items, threshold):
+                count += 1
+                print(
+                    json.dumps(
+                        {
+                            "shop_id": str(item_shop_id),
+                            "items": [
+                                {"id": str(item["id"]), "name": item["name"]}
+                                for item in group
+                            ],
+                        },
+                        ensure_ascii=False,
+                    )
+                )
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shop item dedup report")
+    parser.add_argument(
+        "--env",
+        type=str,
+        default="dev",
+        help="Environment (dev, test, stage, prod)",
+    )
+    parser.add_argument(
+        "--shop-id",
+        type=str,
+        help="Only check this shop",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.7,
+        help="Name similarity (Jaccard of character trigrams) of duplicates",
+    )
+
+    args = parser.parse_args()
+
+    os.environ.setdefault("ENV_NAME", args.env)
+    load_doppler_secrets()
+
+    groups = report_duplicates(args.shop_id, args.threshold)
+    print(f"{groups} duplicate groups found", file=sys.stderr)
@@ -1,7 +1,50 @@
+import base64
+import binascii
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Self, List
+from typing import Any, AsyncIterator, Dict, Iterator, Self, List
 
 from src.schemas.common import TableName
+from src.schemas.schema_base import SchemaBase
+
+
+class BulkWriteResult(SchemaBase):
+    """Outcome of create_many / upsert_many."""
+
+    # id of every input row, in input order
+    ids: List[str] = []
+    # ids of rows that already existed: skipped by create_many,
+    # overwritten by upsert_many
+    conflicts: List[str] = []
+
+
+class Page(SchemaBase):
+    """One page of read_page results."""
+
+    items: List[Dict[str, Any]] = []
+    # pass as after= to read the next page, None on the last page
+    next_cursor: str | None = None
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque, URL-safe continuation token for the position after a row."""
+    data = json.dumps(values, default=str, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(values, list) or not values:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return values
 
 
 class BaseDBAdapter(ABC):
@@ -25,6 +68,14 @@ class BaseDBAdapter(ABC):
     def create_or_update_one(self, data: Dict[str, Any]) -> bool:
         pass
 
+    @abstractmethod
+    def create_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        pass
+
+    @abstractmethod
+    def upsert_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        pass
+
     @abstractmethod
     def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
         pass
@@ -35,6 +86,40 @@ class BaseDBAdapter(ABC):
     ) -> List[Dict[str, Any]]:
         pass
 
+    @abstractmethod
+    def read_page(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        """
+        Keyset pagination: up to limit rows ordered by order_by ("-" prefix for
+        descending), starting after the cursor of the previous page. Unlike an
+        offset, reading a later page costs the same as reading the first one.
+        """
+
+    @abstractmethod
+    def iter_many(
+        self, where: Dict[str, Any] | None = None, batch_size: int = 1000, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        """
+        Rows whose name matches text, typo tolerant, best match first. Each row
+        carries its score; pages continue from next_cursor like read_page.
+        """
+
     @abstractmethod
     def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
         pass
@@ -50,3 +135,93 @@ class BaseDBAdapter(ABC):
     @abstractmethod
     def drop_table(self, table_name: TableName) -> None:
         pass
+
+
+class AsyncBaseDBAdapter(ABC):
+    """Awaitable counterpart of BaseDBAdapter for adapters on asyncio drivers."""
+
+    @abstractmethod
+    def __init__(self, logger):
+        self.logger = logger
+
+    @abstractmethod
+    def use_db(self, db_name: str) -> Self:
+        pass
+
+    @abstractmethod
+    def use_table(self, table_name: TableName) -> Self:
+        pass
+
+    @abstractmethod
+    async def create_one(self, data: Dict[str, Any]) -> str:
+        pass
+
+    @abstractmethod
+    async def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def create_many(
+        self, data: List[Dict[str, Any]], **kwargs
+    ) -> BulkWriteResult:
+        pass
+
+    @abstractmethod
+    async def upsert_many(
+        self, data: List[Dict[str, Any]], **kwargs
+    ) -> BulkWriteResult:
+        pass
+
+    @abstractmethod
+    async def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        pass
+
+    @abstractmethod
+    async def read_many(
+        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
+    ) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def read_page(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        pass
+
+    @abstractmethod
+    async def iter_many(
+        self, where: Dict[str, Any] | None = None, batch_size: int = 1000, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # an async generator, as implementations are
+        yield {}
+
+    @abstractmethod
+    async def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        pass
+
+    @abstractmethod
+    async def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def update_one_by(self, where: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_one(self, _id: str, **kwargs) -> bool:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
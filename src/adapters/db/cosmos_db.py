@@ -1,6 +1,7 @@
 import os
+import re
 from abc import ABC
-from typing import Self, Dict, Any
+from typing import Self, Dict, Any, Iterator, List
 
 from azure.cosmos import exceptions
 from azure.cosmos.container import ContainerProxy
@@ -8,9 +9,20 @@ from azure.cosmos.cosmos_client import CosmosClient
 from azure.cosmos.database import DatabaseProxy
 from azure.cosmos.partition_key import PartitionKey
 
-from src.adapters.db.base import BaseDBAdapter
+from src.adapters.db.base import (
+    BaseDBAdapter,
+    BulkWriteResult,
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
 from src.schemas.common import EnvType, TableName, Operator
 
+# Cosmos DB transactional batches accept at most 100 operations
+BATCH_SIZE = 100
+# containers have no fixed columns, so order_by is only checked to be a plain field
+FIELD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
 
 class CosmosDBAdapter(BaseDBAdapter, ABC):
     container = None
@@ -40,6 +52,51 @@ class CosmosDBAdapter(BaseDBAdapter, ABC):
     def create_or_update_one(self, data: Dict[str, Any]) -> str:
         return self.container.upsert_item(data)["id"]
 
+    def create_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        existing = self._existing_ids(data, kwargs.get("partition_key"))
+        result = BulkWriteResult(ids=[item["id"] for item in data])
+
+        operations = []
+        for item in data:
+            if item["id"] in existing:
+                result.conflicts.append(item["id"])
+            else:
+                existing.add(item["id"])
+                operations.append(("create", (item,)))
+        self._execute_batches(operations, kwargs["partition_key"])
+        return result
+
+    def upsert_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        existing = self._existing_ids(data, kwargs.get("partition_key"))
+        ids = [item["id"] for item in data]
+
+        self._execute_batches(
+            [("upsert", (item,)) for item in data], kwargs["partition_key"]
+        )
+        return BulkWriteResult(
+            ids=ids, conflicts=[_id for _id in dict.fromkeys(ids) if _id in existing]
+        )
+
+    def _existing_ids(self, data: List[Dict[str, Any]], partition_key) -> set:
+        if partition_key is None:
+            raise ValueError("partition_key is required")
+        where_str, where_params = format_where(
+            {"id": (Operator.IN, [item["id"] for item in data])}
+        )
+        return {
+            item["id"]
+            for item in self.container.query_items(
+                f"SELECT r.id FROM r WHERE {where_str}", where_params, partition_key
+            )
+        }
+
+    def _execute_batches(self, operations: list, partition_key) -> None:
+        # each batch is atomic on its own; all items must share the partition key
+        for start in range(0, len(operations), BATCH_SIZE):
+            self.container.execute_item_batch(
+                operations[start : start + BATCH_SIZE], partition_key
+            )
+
     def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
         try:
             return self.container.read_item(_id, kwargs["partition_key"])
@@ -66,6 +123,81 @@ class CosmosDBAdapter(BaseDBAdapter, ABC):
             )
         return list(self.container.read_all_items(limit))
 
+    def read_page(
+        self,
+        where: dict[str, str | tuple] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        # maps to the native continuation token, which resumes the query where
+        # the previous page ended instead of skipping over it
+        partition_key = kwargs.get("partition_key")
+        if partition_key is None:
+            raise ValueError("partition_key is required")
+        continuation = decode_cursor(after)[0] if after is not None else None
+
+        where_str, where_params = format_where(where) if where else ("true", [])
+        query = f"SELECT * FROM r WHERE {where_str}"
+        if order_by:
+            field, descending = self._order_field(order_by)
+            query += f" ORDER BY r.{field} {'DESC' if descending else 'ASC'}"
+
+        pager = self.container.query_items(
+            query, where_params, partition_key, max_item_count=limit
+        ).by_page(continuation)
+        items = list(next(pager, []))
+        token = pager.continuation_token
+        return Page(items=items, next_cursor=encode_cursor([token]) if token else None)
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        """
+        Cosmos DB has no fuzzy matching, so this is a case-insensitive substring
+        match on name across partitions, every row scored 1.0. Pages continue from
+        the native continuation token like read_page.
+        """
+        continuation = decode_cursor(after)[0] if after is not None else None
+        where_str, where_params = format_where(where) if where else ("true", [])
+
+        pager = self.container.query_items(
+            f"SELECT * FROM r WHERE {where_str} AND CONTAINS(r.name, @search_text, true)",
+            [*where_params, {"name": "@search_text", "value": text}],
+            enable_cross_partition_query=True,
+            max_item_count=limit,
+        ).by_page(continuation)
+        items = [{**item, "score": 1.0} for item in next(pager, [])]
+        token = pager.continuation_token
+        return Page(items=items, next_cursor=encode_cursor([token]) if token else None)
+
+    @staticmethod
+    def _order_field(order_by: str) -> tuple[str, bool]:
+        field = order_by.removeprefix("-")
+        if not FIELD_RE.fullmatch(field):
+            raise ValueError(f"Cannot order by {field!r}")
+        return field, order_by.startswith("-")
+
+    def iter_many(
+        self, where: dict[str, str | tuple] | None = None, batch_size=1000, **kwargs
+    ) -> Iterator[dict[str, Any]]:
+        # query_items pages lazily, fetching batch_size items per request
+        partition_key = kwargs.get("partition_key")
+        if partition_key is None:
+            raise ValueError("partition_key is required")
+        where_str, where_params = format_where(where) if where else ("true", [])
+        yield from self.container.query_items(
+            f"SELECT * FROM r WHERE {where_str}",
+            where_params,
+            partition_key,
+            max_item_count=batch_size,
+        )
+
     def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
         response = self.container.replace_item(_id, data)
         return bool(response["_ts"])
@@ -127,6 +259,13 @@ def format_where(where: dict[str, str | tuple]) -> tuple[str, list[dict[str, Any
             if value[0] == Operator.NE:
                 where_str += f"r.{key}!=@{key} AND "
                 where_params.append({"name": f"@{key}", "value": value[1]})
+            elif value[0] == Operator.BETWEEN:
+                where_str += f"r.{key} BETWEEN @{key}_from AND @{key}_to AND "
+                where_params.append({"name": f"@{key}_from", "value": value[1][0]})
+                where_params.append({"name": f"@{key}_to", "value": value[1][1]})
+            elif value[0] == Operator.IN:
+                where_str += f"ARRAY_CONTAINS(@{key}, r.{key}) AND "
+                where_params.append({"name": f"@{key}", "value": list(value[1])})
         else:
             where_str += f"r.{key}=@{key} AND "
             where_params.append({"name": f"@{key}", "value": value})
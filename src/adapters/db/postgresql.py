@@ -1,12 +1,22 @@
 import os
+import threading
 import uuid
-from typing import Any, Dict, List, Self
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Self
 
 from psycopg2 import connect
 from psycopg2.extras import RealDictCursor, Json
 
-from src.adapters.db.base import BaseDBAdapter
-from src.schemas.common import TableName
+from src.adapters.db.base import (
+    BaseDBAdapter,
+    BulkWriteResult,
+    InvalidCursorError,
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
+from src.adapters.db.postgresql_pool import PostgreSQLConnectionPool
+from src.schemas.common import Operator, TableName
 
 # Define the relational columns for each table (excluding id, data, created_at, updated_at)
 TABLE_COLUMNS = {
@@ -26,6 +36,7 @@ TABLE_COLUMNS = {
     TableName.RECEIPT_URL: ["url", "receipt_id"],
     TableName.PURCHASED_ITEM: [
         "receipt_id",
+        "position",
         "name",
         "quantity",
         "unit",
@@ -33,8 +44,8 @@ TABLE_COLUMNS = {
         "price",
         "item_id",
     ],
-    TableName.SHOP_ITEM: ["shop_id", "name", "status", "barcode"],
-    TableName.SHOP: ["country_code", "company_id", "address", "osm_data"],
+    TableName.SHOP_ITEM: ["shop_id", "name", "status", "barcode", "normalized_name"],
+    TableName.SHOP: ["country_code", "company_id", "address", "osm_data", "lat", "lon"],
     TableName.USER: [
         "email",
         "name",
@@ -51,6 +62,12 @@ TABLE_COLUMNS = {
     TableName.USER_SESSION: ["identity_provider", "user_id", "user_name", "state"],
 }
 
+# PostgreSQL caps bind parameters per statement at 65535
+MAX_QUERY_PARAMS = 65535
+# text search configuration for item names; no stemming, names are RO/RU/EN mixed
+SEARCH_CONFIG = "simple"
+BULK_WRITE_PAGE_SIZE = 1000
+
 # Tables that have the 'data' JSONB column for extra fields
 TABLES_WITH_DATA_COLUMN = {
     TableName.RECEIPT,
@@ -59,19 +76,50 @@ TABLES_WITH_DATA_COLUMN = {
 }
 
 
-class PostgreSQLAdapter(BaseDBAdapter):
-    def __init__(self, logger):
-        super().__init__(logger)
-        self.connection = connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=os.environ.get("POSTGRES_PORT", "5432"),
-            database=os.environ.get("POSTGRES_DB", "postgres"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
-        )
-        self.connection.autocommit = True
-        self.current_table = None
-        self.current_db = None
+_pool: PostgreSQLConnectionPool | None = None  # pylint: disable=invalid-name
+_pool_pid: int | None = None  # pylint: disable=invalid-name
+_pool_lock = threading.Lock()
+
+
+def connect_from_env():
+    return connect(
+        host=os.environ.get("POSTGRES_HOST", "localhost"),
+        port=os.environ.get("POSTGRES_PORT", "5432"),
+        database=os.environ.get("POSTGRES_DB", "postgres"),
+        user=os.environ.get("POSTGRES_USER", "postgres"),
+        password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
+    )
+
+
+def get_pool() -> PostgreSQLConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool, _pool_pid  # pylint: disable=global-statement
+
+    with _pool_lock:
+        # connections must not be shared with a forked child process
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = PostgreSQLConnectionPool(
+                connect_from_env,
+                max_size=int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10")),
+                max_lifetime=float(
+                    os.environ.get("POSTGRES_POOL_MAX_LIFETIME", "1800")
+                ),
+                timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", "5")),
+                check_interval=float(
+                    os.environ.get("POSTGRES_POOL_CHECK_INTERVAL", "30")
+                ),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+class PostgreSQLQueryBuilder:
+    """SQL generation shared by the sync and async PostgreSQL adapters."""
+
+    # wrapper used to pass dicts as JSON parameters; differs between drivers
+    json_type: Callable[[Any], Any] = Json
+    current_table: TableName | None = None
+    current_db: str | None = None
 
     def use_db(self, db_name: str) -> Self:
         self.current_db = db_name
@@ -81,6 +129,10 @@ class PostgreSQLAdapter(BaseDBAdapter):
         self.current_table = table_name
         return self
 
+    def _require_table(self) -> None:
+        if not self.current_table:
+            raise ValueError("Table not selected. Use use_table() first.")
+
     def _get_table_columns(self) -> List[str]:
         """Get the relational columns for the current table."""
         return TABLE_COLUMNS.get(self.current_table, [])
@@ -105,7 +157,7 @@ class PostgreSQLAdapter(BaseDBAdapter):
                 columns.append(key)
                 # Handle special types
                 if isinstance(value, dict):
-                    values.append(Json(value))
+                    values.append(self.json_type(value))
                 else:
                     values.append(value)
                 placeholders.append("%s")
@@ -116,14 +168,76 @@ class PostgreSQLAdapter(BaseDBAdapter):
         # Include data column only for tables that have it
         if self._has_data_column():
             columns.append("data")
-            values.append(Json(extra_data))
+            values.append(self.json_type(extra_data))
             placeholders.append("%s")
 
         return columns, placeholders, values
 
-    def create_one(self, data: Dict[str, Any]) -> str:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+    def _row_to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a database row to a flat dictionary, merging data JSONB."""
+        result = {}
+        extra_data = {}
+
+        for key, value in row.items():
+            if key in ("created_at", "updated_at"):
+                continue
+            if key == "data" and self._has_data_column():
+                extra_data = value if value else {}
+            else:
+                result[key] = value
+
+        # Merge extra data from JSONB column
+        result.update(extra_data)
+        return result
+
+    def _build_where(self, where: Dict[str, Any]) -> tuple[List[str], list]:
+        """
+        Build WHERE conditions. A value may be an (Operator, operand) tuple,
+        e.g. {"name": (Operator.IN, ["a", "b"])} or {"lat": (Operator.BETWEEN, (1, 2))};
+        plain values mean equality.
+        """
+        conditions = []
+        params = []
+        table_columns = self._get_table_columns() + ["id"]
+        for key, value in where.items():
+            operator, operand = (
+                value if isinstance(value, tuple) else (Operator.EQ, value)
+            )
+            if key in table_columns:
+                column = key
+            elif self._has_data_column():
+                # Query JSONB field only for tables that have it
+                column = "data->>%s"
+                params.append(key)
+                # JSONB fields compare as text
+                operand = (
+                    [str(v) for v in operand]
+                    if operator in (Operator.IN, Operator.BETWEEN)
+                    else str(operand)
+                )
+            else:
+                continue
+
+            if operator == Operator.IN:
+                conditions.append(f"{column} = ANY(%s)")
+                params.append(list(operand))
+            elif operator == Operator.BETWEEN:
+                conditions.append(f"{column} BETWEEN %s AND %s")
+                params.extend(operand)
+            elif operator == Operator.NE:
+                conditions.append(f"{column} != %s")
+                params.append(operand)
+            elif operator == Operator.GTE:
+                conditions.append(f"{column} >= %s")
+                params.append(operand)
+            else:
+                conditions.append(f"{column} = %s")
+                params.append(operand)
+
+        return conditions, params
+
+    def _insert_query(self, data: Dict[str, Any]) -> tuple[str, list, str]:
+        self._require_table()
 
         _id = data.get("id")
         if not _id:
@@ -131,23 +245,17 @@ class PostgreSQLAdapter(BaseDBAdapter):
             data["id"] = _id
 
         columns, placeholders, values = self._build_insert_data(data)
+        query = (
+            f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
+            f"VALUES ({', '.join(placeholders)}) "
+            "ON CONFLICT (id) DO NOTHING RETURNING id"
+        )
+        return query, values, _id
 
-        with self.connection.cursor() as cursor:
-            query = (
-                f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
-                f"VALUES ({', '.join(placeholders)}) "
-                "ON CONFLICT (id) DO NOTHING RETURNING id"
-            )
-            cursor.execute(query, values)
-            result = cursor.fetchone()
-            return result[0] if result else _id
-
-    def create_or_update_one(self, data: Dict[str, Any]) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+    def _upsert_query(self, data: Dict[str, Any]) -> tuple[str, list]:
+        self._require_table()
 
-        _id = data.get("id")
-        if not _id:
+        if not data.get("id"):
             raise ValueError("ID is required for create_or_update_one")
 
         columns, placeholders, values = self._build_insert_data(data)
@@ -156,81 +264,281 @@ class PostgreSQLAdapter(BaseDBAdapter):
         update_cols = [c for c in columns if c != "id"]
         update_set = ", ".join([f"{col} = EXCLUDED.{col}" for col in update_cols])
 
-        with self.connection.cursor() as cursor:
-            query = f"""
-                INSERT INTO "{self.current_table}" ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                ON CONFLICT (id)
-                DO UPDATE SET {update_set}
-            """
-            cursor.execute(query, values)
-            return True
-
-    def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
-
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            query = f'SELECT * FROM "{self.current_table}" WHERE id = %s'
-            cursor.execute(query, (_id,))
-            row = cursor.fetchone()
-            if row:
-                return self._row_to_dict(row)
-            return None
+        query = f"""
+            INSERT INTO "{self.current_table}" ({', '.join(columns)})
+            VALUES ({', '.join(placeholders)})
+            ON CONFLICT (id)
+            DO UPDATE SET {update_set}
+        """
+        return query, values
 
-    def _row_to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert a database row to a flat dictionary, merging data JSONB."""
-        result = {}
-        extra_data = {}
+    def _insert_many_queries(
+        self, data: List[Dict[str, Any]], upsert: bool = False
+    ) -> tuple[List[str], List[tuple[str, list]]]:
+        """
+        Build multi-row INSERT statements for create_many / upsert_many.
 
-        for key, value in row.items():
-            if key in ("created_at", "updated_at"):
-                continue
-            if key == "data" and self._has_data_column():
-                extra_data = value if value else {}
+        Rows are grouped by their column set and split into pages that stay under
+        the bind parameter limit. Returns the id of every row, in input order, and
+        the statements. Upserts report whether each row already existed.
+        """
+        self._require_table()
+
+        ids = []
+        groups: Dict[tuple, Dict[str, list]] = {}
+        for row in data:
+            row = dict(row)
+            if not row.get("id"):
+                if upsert:
+                    raise ValueError("ID is required for upsert_many")
+                row["id"] = str(uuid.uuid4())
+            ids.append(str(row["id"]))
+
+            columns, _, values = self._build_insert_data(row)
+            # one row per id, the last one wins: ON CONFLICT DO UPDATE cannot
+            # touch the same row twice in a statement
+            groups.setdefault(tuple(columns), {})[str(row["id"])] = values
+
+        queries = []
+        for columns, rows in groups.items():
+            if upsert:
+                update_set = ", ".join(
+                    f"{col} = EXCLUDED.{col}" for col in columns if col != "id"
+                )
+                conflict = (
+                    f"DO UPDATE SET {update_set or 'id = EXCLUDED.id'} "
+                    "RETURNING id, xmax <> 0"
+                )
             else:
-                result[key] = value
-
-        # Merge extra data from JSONB column
-        result.update(extra_data)
+                conflict = "DO NOTHING RETURNING id"
+
+            row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+            page_size = min(BULK_WRITE_PAGE_SIZE, MAX_QUERY_PARAMS // len(columns))
+            rows = list(rows.values())
+            for start in range(0, len(rows), page_size):
+                page = rows[start : start + page_size]
+                query = (
+                    f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
+                    f"VALUES {', '.join([row_placeholder] * len(page))} "
+                    f"ON CONFLICT (id) {conflict}"
+                )
+                queries.append((query, [value for values in page for value in values]))
+        return ids, queries
+
+    @staticmethod
+    def _create_many_result(ids: List[str], inserted: set) -> BulkWriteResult:
+        result = BulkWriteResult(ids=ids)
+        for _id in ids:
+            if _id in inserted:
+                # a repeated id within the batch is inserted once
+                inserted.discard(_id)
+            else:
+                result.conflicts.append(_id)
         return result
 
-    def read_many(
-        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
-    ) -> List[Dict[str, Any]]:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+    @staticmethod
+    def _upsert_many_result(ids: List[str], updated: set) -> BulkWriteResult:
+        return BulkWriteResult(
+            ids=ids, conflicts=[_id for _id in dict.fromkeys(ids) if _id in updated]
+        )
+
+    def _select_one_query(self, _id: str) -> tuple[str, tuple]:
+        self._require_table()
+        return f'SELECT * FROM "{self.current_table}" WHERE id = %s', (_id,)
+
+    def _select_receipt_query(
+        self, _id: str, by_url: bool = False
+    ) -> tuple[str, tuple]:
+        """
+        Receipt row with its purchases, in receipt order, in one statement.
+        With by_url, _id is a receipt_url id (the URL hash) joined to its receipt.
+        """
+        if by_url:
+            source = (
+                f'"{TableName.RECEIPT_URL}" u '
+                f'JOIN "{TableName.RECEIPT}" r ON r.id = u.receipt_id'
+            )
+            condition = "u.id = %s"
+        else:
+            source = f'"{TableName.RECEIPT}" r'
+            condition = "r.id = %s"
+
+        query = f"""
+            SELECT r.*, COALESCE(
+                (
+                    SELECT json_agg(
+                        json_build_object(
+                            'name', p.name,
+                            'quantity', p.quantity,
+                            'unit', p.unit,
+                            'unit_quantity', p.unit_quantity,
+                            'price', p.price,
+                            'item_id', p.item_id,
+                            'status', COALESCE(i.status, 'pending')
+                        )
+                        ORDER BY p.position
+                    )
+                    FROM "{TableName.PURCHASED_ITEM}" p
+                    LEFT JOIN "{TableName.SHOP_ITEM}" i ON i.id = p.item_id
+                    WHERE p.receipt_id = r.id
+                ),
+                '[]'
+            ) AS purchases
+            FROM {source}
+            WHERE {condition}
+        """
+        return query, (_id,)
+
+    def _select_many_query(
+        self,
+        where: Dict[str, Any] | None,
+        limit: int | None,
+        offset: int | None = None,
+        order_by: str | None = None,
+    ) -> tuple[str, tuple]:
+        """order_by is a column name, prefixed with "-" for descending order."""
+        self._require_table()
 
         query = f'SELECT * FROM "{self.current_table}"'
         params = []
 
         if where:
-            conditions = []
-            table_columns = self._get_table_columns() + ["id"]
-            for key, value in where.items():
-                if key in table_columns:
-                    conditions.append(f"{key} = %s")
-                    params.append(value)
-                elif self._has_data_column():
-                    # Query JSONB field only for tables that have it
-                    conditions.append(f"data->>%s = %s")
-                    params.extend([key, str(value)])
-
+            conditions, where_params = self._build_where(where)
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
+                params.extend(where_params)
+
+        if order_by:
+            column, descending = self._order_column(order_by)
+            query += f" ORDER BY {column} {'DESC' if descending else 'ASC'}"
 
         if limit:
             query += " LIMIT %s"
             params.append(limit)
 
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return [self._row_to_dict(row) for row in rows]
+        if offset:
+            query += " OFFSET %s"
+            params.append(offset)
+
+        return query, tuple(params)
+
+    def _order_column(self, order_by: str) -> tuple[str, bool]:
+        column = order_by.removeprefix("-")
+        if column not in self._get_table_columns() + ["id"]:
+            raise ValueError(f"Cannot order {self.current_table} by {column}")
+        return column, order_by.startswith("-")
+
+    def _select_page_query(
+        self,
+        where: Dict[str, Any] | None,
+        limit: int,
+        order_by: str | None = None,
+        after: str | None = None,
+    ) -> tuple[str, tuple]:
+        """
+        Rows ordered by order_by with id as the tie-breaker, after the (value, id)
+        position in the cursor. Selects one extra row to tell if there is a next
+        page. The order column should be non-null and indexed together with id.
+        """
+        self._require_table()
+        column, descending = self._order_column(order_by or "id")
+        keys = ["id"] if column == "id" else [column, "id"]
+
+        conditions, params = self._build_where(where) if where else ([], [])
+        if after is not None:
+            values = decode_cursor(after)
+            if len(values) != len(keys):
+                raise InvalidCursorError(f"Invalid cursor: {after!r}")
+            conditions.append(
+                f"({', '.join(keys)}) {'<' if descending else '>'} "
+                f"({', '.join(['%s'] * len(keys))})"
+            )
+            params.extend(values)
 
-    def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+        query = f'SELECT * FROM "{self.current_table}"'
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY {', '.join(f'{key} {direction}' for key in keys)}"
+        query += " LIMIT %s"
+        params.append(limit + 1)
+        return query, tuple(params)
+
+    def _page_result(
+        self, rows: List[Dict[str, Any]], limit: int, order_by: str | None = None
+    ) -> Page:
+        column, _ = self._order_column(order_by or "id")
+        if len(rows) <= limit:
+            return Page(items=rows)
+
+        rows = rows[:limit]
+        last = rows[-1]
+        values = [last["id"]] if column == "id" else [last[column], last["id"]]
+        return Page(items=rows, next_cursor=encode_cursor(values))
+
+    def _search_query(
+        self,
+        text: str,
+        limit: int,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> tuple[str, tuple]:
+        """
+        Rows of the current table whose name matches text, best match first.
+
+        Matches are found through the trigram (typo tolerant) and tsvector (whole
+        word) GIN indexes on name; the score adds both similarities. Pages by the
+        (score, id) of the last row, selecting one extra row like read_page.
+        """
+        self._require_table()
+        conditions, params = self._build_where(where) if where else ([], [])
+        query = (
+            "SELECT * FROM ("
+            "SELECT *, (word_similarity(%s, name) + ts_rank("
+            f"to_tsvector('{SEARCH_CONFIG}', name), "
+            f"plainto_tsquery('{SEARCH_CONFIG}', %s)))::float8 AS score "
+            f'FROM "{self.current_table}" '
+            f"WHERE (%s <%% name OR to_tsvector('{SEARCH_CONFIG}', name) "
+            f"@@ plainto_tsquery('{SEARCH_CONFIG}', %s))"
+        )
+        params = [text, text, text, text, *params]
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        query += ") AS matches"
+
+        if after is not None:
+            values = decode_cursor(after)
+            if len(values) != 2:
+                raise InvalidCursorError(f"Invalid cursor: {after!r}")
+            query += " WHERE score < %s OR (score = %s AND id > %s)"
+            params.extend([values[0], values[0], values[1]])
+
+        query += " ORDER BY score DESC, id ASC LIMIT %s"
+        params.append(limit + 1)
+        return query, tuple(params)
+
+    @staticmethod
+    def _search_result(rows: List[Dict[str, Any]], limit: int) -> Page:
+        if len(rows) <= limit:
+            return Page(items=rows)
+        rows = rows[:limit]
+        return Page(
+            items=rows, next_cursor=encode_cursor([rows[-1]["score"], rows[-1]["id"]])
+        )
+
+    def _count_query(self, where: Dict[str, Any] | None) -> tuple[str, tuple]:
+        self._require_table()
+
+        query = f'SELECT count(*) FROM "{self.current_table}"'
+        params = []
+        if where:
+            conditions, params = self._build_where(where)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+        return query, tuple(params)
+
+    def _update_query(self, _id: str, data: Dict[str, Any]) -> tuple[str, list] | None:
+        self._require_table()
 
         table_columns = self._get_table_columns()
         set_parts = []
@@ -243,7 +551,7 @@ class PostgreSQLAdapter(BaseDBAdapter):
             if key in table_columns:
                 set_parts.append(f"{key} = %s")
                 if isinstance(value, dict):
-                    values.append(Json(value))
+                    values.append(self.json_type(value))
                 else:
                     values.append(value)
             elif self._has_data_column():
@@ -252,16 +560,241 @@ class PostgreSQLAdapter(BaseDBAdapter):
         # Update data JSONB column only for tables that have it
         if self._has_data_column():
             set_parts.append("data = %s")
-            values.append(Json(extra_data))
+            values.append(self.json_type(extra_data))
 
         if not set_parts:
-            return False
+            return None
 
         values.append(_id)
+        query = (
+            f'UPDATE "{self.current_table}" SET {", ".join(set_parts)} WHERE id = %s'
+        )
+        return query, values
+
+    def _update_by_query(
+        self, where: Dict[str, Any], data: Dict[str, Any]
+    ) -> tuple[str, list] | None:
+        self._require_table()
+        if not where:
+            raise ValueError("The 'where' parameter cannot be empty.")
+        if not data:
+            return None
+
+        where_clauses = [f"{key} = %s" for key in where.keys()]
+        where_query = " AND ".join(where_clauses)
+
+        set_clauses = [f"{key} = %s" for key in data.keys()]
+        set_query = ", ".join(set_clauses)
+
+        query = f"UPDATE {self.current_table} SET {set_query} WHERE {where_query}"
+        values = list(data.values()) + list(where.values())
+        return query, values
+
+    def _delete_query(self, _id: str) -> tuple[str, tuple]:
+        self._require_table()
+        return f'DELETE FROM "{self.current_table}" WHERE id = %s', (_id,)
+
+    def _delete_many_query(self, where: Dict[str, Any]) -> tuple[str, list]:
+        self._require_table()
+        conditions, params = self._build_where(where)
+        if not conditions:
+            raise ValueError("The 'where' parameter cannot be empty.")
+        query = f'DELETE FROM "{self.current_table}" WHERE {" AND ".join(conditions)}'
+        return query, params
+
+
+class PostgreSQLAdapter(PostgreSQLQueryBuilder, BaseDBAdapter):
+    def __init__(self, logger, pool: PostgreSQLConnectionPool | None = None):
+        super().__init__(logger)
+        self.pool = pool
+        self.connection = pool.getconn() if pool else connect_from_env()
+        self.connection.autocommit = True
+        self.current_table = None
+        self.current_db = None
+
+    def close(self) -> None:
+        """Return the connection to the pool, or close it if the adapter owns it."""
+        if self.connection is None:
+            return
+        if self.pool:
+            self.pool.putconn(self.connection)
+        else:
+            self.connection.close()
+        self.connection = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in one transaction instead of autocommit."""
+        if not self.connection.autocommit:
+            # already inside a transaction
+            yield
+            return
+
+        self.connection.autocommit = False
+        try:
+            yield
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+        finally:
+            self.connection.autocommit = True
+
+    def create_one(self, data: Dict[str, Any]) -> str:
+        query, values, _id = self._insert_query(data)
 
         with self.connection.cursor() as cursor:
-            query = f'UPDATE "{self.current_table}" SET {", ".join(set_parts)} WHERE id = %s'
             cursor.execute(query, values)
+            result = cursor.fetchone()
+            return result[0] if result else _id
+
+    def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        query, values = self._upsert_query(data)
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, values)
+            return True
+
+    def create_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        ids, queries = self._insert_many_queries(data)
+
+        inserted = set()
+        with self.transaction(), self.connection.cursor() as cursor:
+            for query, values in queries:
+                cursor.execute(query, values)
+                inserted.update(str(row[0]) for row in cursor.fetchall())
+        return self._create_many_result(ids, inserted)
+
+    def upsert_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        ids, queries = self._insert_many_queries(data, upsert=True)
+
+        updated = set()
+        with self.transaction(), self.connection.cursor() as cursor:
+            for query, values in queries:
+                cursor.execute(query, values)
+                updated.update(str(row[0]) for row in cursor.fetchall() if row[1])
+        return self._upsert_many_result(ids, updated)
+
+    def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        query, params = self._select_one_query(_id)
+
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
+
+    def read_receipt(self, _id: str, by_url: bool = False) -> Dict[str, Any] | None:
+        """
+        Read a receipt together with its purchased_item rows. With by_url, look it
+        up by receipt_url id in the same query.
+        """
+        query, params = self._select_receipt_query(_id, by_url)
+
+        self.use_table(TableName.RECEIPT)
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
+
+    def read_many(
+        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
+    ) -> List[Dict[str, Any]]:
+        query, params = self._select_many_query(
+            where, limit, kwargs.get("offset"), kwargs.get("order_by")
+        )
+
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def read_page(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        query, params = self._select_page_query(where, limit, order_by, after)
+
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._page_result(rows, limit, order_by)
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        query, params = self._search_query(text, limit, where, after)
+
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            rows = [self._row_to_dict(row) for row in cursor.fetchall()]
+        return self._search_result(rows, limit)
+
+    def count(self, where: Dict[str, Any] | None = None) -> int:
+        query, params = self._count_query(where)
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+
+    def iter_many(
+        self, where: Dict[str, Any] | None = None, batch_size: int = 1000, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like read_many, but rows are fetched lazily, batch_size at a time, through a
+        server-side cursor, so memory use does not grow with the result.
+        """
+        query, params = self._select_many_query(
+            where, kwargs.get("limit"), kwargs.get("offset"), kwargs.get("order_by")
+        )
+        for row in self._stream(query, params, batch_size, RealDictCursor):
+            yield self._row_to_dict(row)
+
+    def iter_ids(self, batch_size: int = 10000) -> Iterator[str]:
+        """Stream the ids of the current table through a server-side cursor."""
+        self._require_table()
+        query = f'SELECT id FROM "{self.current_table}"'
+        for row in self._stream(query, (), batch_size):
+            yield str(row[0])
+
+    def _stream(
+        self, query: str, params: tuple, batch_size: int, cursor_factory=None
+    ) -> Iterator[Any]:
+        # named cursors only live inside a transaction
+        with (
+            self.transaction(),
+            self.connection.cursor(
+                name=f"iter_{uuid.uuid4().hex}", cursor_factory=cursor_factory
+            ) as cursor,
+        ):
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            yield from cursor
+
+    def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        update = self._update_query(_id, data)
+        if update is None:
+            return False
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(*update)
             return cursor.rowcount > 0
 
     def update_one_by(self, where: Dict[str, Any], data: Dict[str, Any]) -> bool:
@@ -275,36 +808,27 @@ class PostgreSQLAdapter(BaseDBAdapter):
         Returns:
             True if a row was updated, False otherwise.
         """
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
-        if not where:
-            raise ValueError("The 'where' parameter cannot be empty.")
-        if not data:
+        update = self._update_by_query(where, data)
+        if update is None:
             return True
 
-        where_clauses = [f"{key} = %s" for key in where.keys()]
-        where_query = " AND ".join(where_clauses)
-
-        set_clauses = [f"{key} = %s" for key in data.keys()]
-        set_query = ", ".join(set_clauses)
-
-        query = f"UPDATE {self.current_table} SET {set_query} WHERE {where_query}"
-
-        values = list(data.values()) + list(where.values())
-
         with self.connection.cursor() as cursor:
-            cursor.execute(query, values)
+            cursor.execute(*update)
             return cursor.rowcount > 0
 
     def delete_one(self, _id: str, **kwargs) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+        query, params = self._delete_query(_id)
 
         with self.connection.cursor() as cursor:
-            query = f'DELETE FROM "{self.current_table}" WHERE id = %s'
-            cursor.execute(query, (_id,))
+            cursor.execute(query, params)
             return cursor.rowcount > 0
 
+    def delete_many(self, where: Dict[str, Any]) -> int:
+        """Deletes the rows matching where, returns how many were deleted."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(*self._delete_many_query(where))
+            return cursor.rowcount
+
     def create_table(self, table_name: TableName, **kwargs) -> Self:
         """Create a table with id and jsonb data column, plus a GIN index."""
         with self.connection.cursor() as cursor:
@@ -334,5 +858,6 @@ class PostgreSQLAdapter(BaseDBAdapter):
 
 
 def init_db_session(logger) -> PostgreSQLAdapter:
+    """Borrow a pooled connection; call close() on the session to return it."""
     db_name = os.environ["POSTGRES_DB"]
-    return PostgreSQLAdapter(logger).use_db(db_name)
+    return PostgreSQLAdapter(logger, pool=get_pool()).use_db(db_name)
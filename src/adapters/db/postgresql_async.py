@@ -0,0 +1,321 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Self
+
+from psycopg import AsyncConnection, AsyncPipeline
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
+
+from src.adapters.db.base import AsyncBaseDBAdapter, BulkWriteResult, Page
+from src.adapters.db.postgresql import PostgreSQLQueryBuilder
+from src.schemas.common import TableName
+
+# pylint: disable=invalid-name
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_loop: asyncio.AbstractEventLoop | None = None
+# pylint: enable=invalid-name
+
+
+async def _discard_pool(
+    pool: AsyncConnectionPool, loop: asyncio.AbstractEventLoop
+) -> None:
+    """Close a pool left behind by another event loop."""
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+        return
+    try:
+        await pool.close(timeout=0)
+    except RuntimeError:
+        # its loop is closed and so are its workers; the idle connections are
+        # closed when the pool is garbage collected
+        pass
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """
+    Return the process-wide async connection pool, opening it on first use.
+
+    The pool is bound to the event loop it was opened in, so the pool is closed
+    and a new one is created if the application runs under a different loop
+    (e.g. one per invocation). Connections are not pinged on checkout: idle ones
+    are closed after POSTGRES_POOL_MAX_IDLE seconds, before servers and proxies
+    drop them, and broken ones are replaced when they are returned.
+    """
+    global _async_pool, _async_pool_loop  # pylint: disable=global-statement
+
+    loop = asyncio.get_running_loop()
+    if _async_pool is None or _async_pool_loop is not loop:
+        if _async_pool is not None:
+            await _discard_pool(_async_pool, _async_pool_loop)
+        _async_pool = AsyncConnectionPool(
+            make_conninfo(
+                host=os.environ.get("POSTGRES_HOST", "localhost"),
+                port=os.environ.get("POSTGRES_PORT", "5432"),
+                dbname=os.environ.get("POSTGRES_DB", "postgres"),
+                user=os.environ.get("POSTGRES_USER", "postgres"),
+                password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
+            ),
+            kwargs={"autocommit": True},
+            min_size=0,
+            max_size=int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10")),
+            max_lifetime=float(os.environ.get("POSTGRES_POOL_MAX_LIFETIME", "1800")),
+            max_idle=float(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300")),
+            timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", "5")),
+            open=False,
+        )
+        _async_pool_loop = loop
+        await _async_pool.open()
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    """Close the process-wide async pool, from the loop it was opened in."""
+    global _async_pool, _async_pool_loop  # pylint: disable=global-statement
+
+    if _async_pool is not None:
+        pool, _async_pool, _async_pool_loop = _async_pool, None, None
+        await pool.close()
+
+
+class AsyncPostgreSQLAdapter(PostgreSQLQueryBuilder, AsyncBaseDBAdapter):
+    """
+    PostgreSQL adapter for the async routes, built on psycopg 3.
+
+    A connection is borrowed from the pool on the first query and held until
+    close(), so a request reuses one connection for all its statements.
+    """
+
+    json_type = Jsonb
+
+    def __init__(self, logger, pool: AsyncConnectionPool | None = None):
+        super().__init__(logger)
+        self.pool = pool
+        self.connection: AsyncConnection | None = None
+        self.current_table = None
+        self.current_db = None
+
+    async def _get_connection(self) -> AsyncConnection:
+        if self.connection is not None and self.connection.broken:
+            # lost mid-request; the pool replaces it, later statements reconnect
+            await self.close()
+        if self.connection is None:
+            if self.pool is None:
+                self.pool = await get_async_pool()
+            self.connection = await self.pool.getconn()
+        return self.connection
+
+    async def close(self) -> None:
+        """Return the borrowed connection, if any, to the pool."""
+        if self.connection is None:
+            return
+        await self.pool.putconn(self.connection)
+        self.connection = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def transaction(self, pipeline: bool = True) -> AsyncIterator[None]:
+        """
+        Run the enclosed statements in one transaction; nested calls use savepoints.
+
+        With pipeline (and libpq support) statements are sent without waiting for
+        the previous result; the client only waits where a result is fetched and
+        at commit. Errors surface at those points and roll the transaction back.
+        """
+        connection = await self._get_connection()
+        if pipeline and AsyncPipeline.is_supported():
+            async with connection.pipeline(), connection.transaction():
+                yield
+        else:
+            async with connection.transaction():
+                yield
+
+    async def create_one(self, data: Dict[str, Any]) -> str:
+        query, values, _id = self._insert_query(data)
+
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, values)
+            result = await cursor.fetchone()
+            # psycopg 3 returns uuid.UUID for uuid columns, keep the str contract
+            return str(result[0]) if result else _id
+
+    async def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        query, values = self._upsert_query(data)
+
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, values)
+            return True
+
+    async def create_many(
+        self, data: List[Dict[str, Any]], **kwargs
+    ) -> BulkWriteResult:
+        ids, queries = self._insert_many_queries(data)
+
+        inserted = set()
+        connection = await self._get_connection()
+        async with connection.transaction(), connection.cursor() as cursor:
+            for query, values in queries:
+                await cursor.execute(query, values)
+                inserted.update(str(row[0]) for row in await cursor.fetchall())
+        return self._create_many_result(ids, inserted)
+
+    async def upsert_many(
+        self, data: List[Dict[str, Any]], **kwargs
+    ) -> BulkWriteResult:
+        ids, queries = self._insert_many_queries(data, upsert=True)
+
+        updated = set()
+        connection = await self._get_connection()
+        async with connection.transaction(), connection.cursor() as cursor:
+            for query, values in queries:
+                await cursor.execute(query, values)
+                updated.update(str(row[0]) for row in await cursor.fetchall() if row[1])
+        return self._upsert_many_result(ids, updated)
+
+    async def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        query, params = self._select_one_query(_id)
+
+        connection = await self._get_connection()
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params)
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
+
+    async def read_receipt(
+        self, _id: str, by_url: bool = False
+    ) -> Dict[str, Any] | None:
+        """
+        Read a receipt together with its purchased_item rows. With by_url, look it
+        up by receipt_url id in the same query.
+        """
+        query, params = self._select_receipt_query(_id, by_url)
+
+        self.use_table(TableName.RECEIPT)
+        connection = await self._get_connection()
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params)
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
+
+    async def read_many(
+        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
+    ) -> List[Dict[str, Any]]:
+        query, params = self._select_many_query(
+            where, limit, kwargs.get("offset"), kwargs.get("order_by")
+        )
+
+        connection = await self._get_connection()
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params)
+            rows = await cursor.fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    async def read_page(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        query, params = self._select_page_query(where, limit, order_by, after)
+
+        connection = await self._get_connection()
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params)
+            rows = [self._row_to_dict(row) for row in await cursor.fetchall()]
+        return self._page_result(rows, limit, order_by)
+
+    async def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        query, params = self._search_query(text, limit, where, after)
+
+        connection = await self._get_connection()
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params)
+            rows = [self._row_to_dict(row) for row in await cursor.fetchall()]
+        return self._search_result(rows, limit)
+
+    async def iter_many(
+        self, where: Dict[str, Any] | None = None, batch_size: int = 1000, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like read_many, but rows are fetched lazily, batch_size at a time, through a
+        server-side cursor, so memory use does not grow with the result.
+        """
+        query, params = self._select_many_query(
+            where, kwargs.get("limit"), kwargs.get("offset"), kwargs.get("order_by")
+        )
+
+        connection = await self._get_connection()
+        # named cursors only live inside a transaction
+        async with (
+            connection.transaction(),
+            connection.cursor(
+                name=f"iter_{uuid.uuid4().hex}", row_factory=dict_row
+            ) as cursor,
+        ):
+            cursor.itersize = batch_size
+            await cursor.execute(query, params)
+            async for row in cursor:
+                yield self._row_to_dict(row)
+
+    async def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        update = self._update_query(_id, data)
+        if update is None:
+            return False
+
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(*update)
+            return cursor.rowcount > 0
+
+    async def update_one_by(self, where: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        update = self._update_by_query(where, data)
+        if update is None:
+            return True
+
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(*update)
+            return cursor.rowcount > 0
+
+    async def delete_one(self, _id: str, **kwargs) -> bool:
+        query, params = self._delete_query(_id)
+
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, params)
+            return cursor.rowcount > 0
+
+    async def delete_many(self, where: Dict[str, Any]) -> int:
+        """Deletes the rows matching where, returns how many were deleted."""
+        connection = await self._get_connection()
+        async with connection.cursor() as cursor:
+            await cursor.execute(*self._delete_many_query(where))
+            return cursor.rowcount
+
+
+def init_async_db_session(logger) -> AsyncPostgreSQLAdapter:
+    """The connection is borrowed lazily; await close() on the session to return it."""
+    db_name = os.environ["POSTGRES_DB"]
+    return AsyncPostgreSQLAdapter(logger).use_db(db_name)
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from psycopg2 import Error as PsycopgError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as PgConnection
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class PoolClosedError(Exception):
+    pass
+
+
+class PostgreSQLConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections.
+
+    Connections are opened lazily up to ``max_size``. A connection idle for longer
+    than ``check_interval`` seconds is pinged before it is handed out, and any
+    connection older than ``max_lifetime`` seconds is closed instead of being reused.
+    ``getconn`` waits at most ``timeout`` seconds for a free connection.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], PgConnection],
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        timeout: float = 5.0,
+        check_interval: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check_interval = check_interval
+
+        self._lock = threading.Condition()
+        # idle connections as (connection, last_used) pairs, most recently used last
+        self._idle: deque[tuple[PgConnection, float]] = deque()
+        self._created_at: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+        self._counters = {
+            "connections_created": 0,
+            "connections_recycled": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+    def getconn(self, timeout: float | None = None) -> PgConnection:
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        while True:
+            conn, last_used = self._acquire(deadline)
+            if conn is None:
+                # a slot was reserved for a brand-new connection
+                return self._open()
+
+            if self._is_usable(conn, last_used):
+                with self._lock:
+                    self._counters["checkouts"] += 1
+                return conn
+
+            self._discard(conn)
+
+    def putconn(self, conn: PgConnection, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = True
+            except PsycopgError:
+                discard = True
+
+        if not discard and self._is_expired(conn):
+            with self._lock:
+                self._counters["connections_recycled"] += 1
+            discard = True
+
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[PgConnection]:
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                **self._counters,
+            }
+
+    def _acquire(self, deadline: float) -> tuple[PgConnection | None, float]:
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0.0
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["checkout_timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._lock.wait(remaining)
+
+    def _open(self) -> PgConnection:
+        try:
+            conn = self._connect()
+            conn.autocommit = True
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._counters["connections_created"] += 1
+            self._counters["checkouts"] += 1
+        return conn
+
+    def _is_expired(self, conn: PgConnection) -> bool:
+        created_at = self._created_at.get(id(conn))
+        return created_at is not None and (
+            time.monotonic() - created_at >= self.max_lifetime
+        )
+
+    def _is_usable(self, conn: PgConnection, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if self._is_expired(conn):
+            with self._lock:
+                self._counters["connections_recycled"] += 1
+            return False
+        if time.monotonic() - last_used < self.check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except PsycopgError:
+            with self._lock:
+                self._counters["health_check_failures"] += 1
+            return False
+
+    def _discard(self, conn: PgConnection) -> None:
+        try:
+            conn.close()
+        except PsycopgError:
+            pass
+
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._counters["connections_closed"] += 1
+            self._lock.notify()
@@ -1,9 +1,18 @@
 import sqlite3
+import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Self
+from typing import Dict, Any, Iterator, List, Self
 
-from src.adapters.db.base import BaseDBAdapter
-from src.schemas.common import TableName
+from src.adapters.db.base import (
+    BaseDBAdapter,
+    BulkWriteResult,
+    InvalidCursorError,
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
+from src.helpers.text_index import InvertedIndex
+from src.schemas.common import Operator, TableName
 
 # Register datetime adapter for Python 3.12+
 sqlite3.register_adapter(datetime, lambda val: val.isoformat())
@@ -23,6 +32,8 @@ class SQLiteDBAdapter(BaseDBAdapter):
             db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
         )
         self.cursor = self.conn.cursor()
+        # per table: (conn.total_changes when built, index, rows by _id)
+        self._search_indexes: Dict[str, tuple[int, InvertedIndex, Dict]] = {}
 
     def use_db(self, db_name: str) -> Self:
         # SQLite doesn't really have multiple DBs in the same connection like Postgres
@@ -46,11 +57,66 @@ class SQLiteDBAdapter(BaseDBAdapter):
         self.conn.commit()
         return data.get("_id") or str(self.cursor.lastrowid)
 
-    def create_many(self, data: List[Dict[str, Any]]) -> List[str]:
+    def create_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        ids, existing = self._write_many(data, upsert=False)
+
+        result = BulkWriteResult(ids=ids)
+        for _id in ids:
+            # a repeated id within the batch is inserted once
+            if _id in existing:
+                result.conflicts.append(_id)
+            existing.add(_id)
+        return result
+
+    def upsert_many(self, data: List[Dict[str, Any]], **kwargs) -> BulkWriteResult:
+        ids, existing = self._write_many(data, upsert=True)
+        return BulkWriteResult(
+            ids=ids, conflicts=[_id for _id in dict.fromkeys(ids) if _id in existing]
+        )
+
+    def _write_many(
+        self, data: List[Dict[str, Any]], upsert: bool
+    ) -> tuple[List[str], set]:
+        """
+        executemany() per column set, all inside one transaction. Returns the row
+        ids and the subset that existed before the write.
+        """
+        groups: Dict[tuple, list] = {}
         ids = []
         for row in data:
-            ids.append(self.create_one(row))
-        return ids
+            row = row.copy()
+            if "id" in row and "_id" not in row:
+                row["_id"] = row.pop("id")
+            if not row.get("_id"):
+                row["_id"] = str(uuid.uuid4())
+            ids.append(row["_id"])
+            groups.setdefault(tuple(row.keys()), []).append(tuple(row.values()))
+
+        with self.conn:
+            existing = set(self._existing_ids(ids))
+            for columns, rows in groups.items():
+                query = (
+                    f"INSERT INTO {self.table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)}) ON CONFLICT(_id) "
+                )
+                update_set = ", ".join(
+                    f"{col}=excluded.{col}" for col in columns if col != "_id"
+                )
+                if upsert and update_set:
+                    query += f"DO UPDATE SET {update_set}"
+                else:
+                    query += "DO NOTHING"
+                self.cursor.executemany(query, rows)
+        return ids, existing
+
+    def _existing_ids(self, ids: List[str]) -> List[str]:
+        if not ids:
+            return []
+        query_string, values = format_where({"_id": (Operator.IN, ids)})
+        self.cursor.execute(
+            f"SELECT _id FROM {self.table} WHERE {query_string}", values
+        )
+        return [row[0] for row in self.cursor.fetchall()]
 
     def create_or_update_one(self, data: Dict[str, Any]) -> bool:
         _id = data.get("_id")
@@ -77,18 +143,144 @@ class SQLiteDBAdapter(BaseDBAdapter):
         query = f"SELECT * FROM {self.table}"
         values = ()
         if where:
-            query_string = " AND ".join([f"{k}=?" for k in where.keys()])
-            values = tuple(where.values())
+            query_string, values = format_where(where)
             query += f" WHERE {query_string}"
 
+        order_by = kwargs.get("order_by")
+        if order_by:
+            column, descending = self._order_column(order_by)
+            query += f" ORDER BY {column} {'DESC' if descending else 'ASC'}"
+
         if limit:
             query += f" LIMIT {limit}"
+            if kwargs.get("offset"):
+                query += f" OFFSET {int(kwargs['offset'])}"
 
         self.cursor.execute(query, values)
         results = self.cursor.fetchall()
         columns = [col[0] for col in self.cursor.description]
         return [dict(zip(columns, row)) for row in results]
 
+    def read_page(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        after: str | None = None,
+        **kwargs,
+    ) -> Page:
+        column, descending = self._order_column(order_by or "_id")
+        keys = ["_id"] if column == "_id" else [column, "_id"]
+
+        query_string, values = format_where(where) if where else ("", ())
+        conditions = [query_string] if query_string else []
+        if after is not None:
+            after_values = decode_cursor(after)
+            if len(after_values) != len(keys):
+                raise InvalidCursorError(f"Invalid cursor: {after!r}")
+            conditions.append(
+                f"({', '.join(keys)}) {'<' if descending else '>'} "
+                f"({', '.join('?' for _ in keys)})"
+            )
+            values = (*values, *after_values)
+
+        query = f"SELECT * FROM {self.table}"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY {', '.join(f'{key} {direction}' for key in keys)}"
+        query += f" LIMIT {int(limit) + 1}"
+
+        self.cursor.execute(query, values)
+        columns = [col[0] for col in self.cursor.description]
+        rows = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+        if len(rows) <= limit:
+            return Page(items=rows)
+
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][key] for key in keys])
+        return Page(items=rows, next_cursor=next_cursor)
+
+    def _order_column(self, order_by: str) -> tuple[str, bool]:
+        column = order_by.removeprefix("-")
+        self.cursor.execute(f"PRAGMA table_info({self.table})")
+        columns = [row[1] for row in self.cursor.fetchall()]
+        if column == "id" and column not in columns:
+            column = "_id"
+        if column not in columns:
+            raise ValueError(f"Cannot order {self.table} by {column}")
+        return column, order_by.startswith("-")
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        where: Dict[str, Any] | None = None,
+        after: str | None = None,
+    ) -> Page:
+        """
+        SQLite has no trigram index, so this searches an in-process inverted index
+        over the table's name column, rebuilt after writes on this connection.
+        """
+        index, rows = self._search_index()
+
+        accept = None
+        if where:
+            query_string, values = format_where(where)
+            self.cursor.execute(
+                f"SELECT _id FROM {self.table} WHERE {query_string}", values
+            )
+            accept = {row[0] for row in self.cursor.fetchall()}.__contains__
+
+        position = None
+        if after is not None:
+            position = decode_cursor(after)
+            if len(position) != 2:
+                raise InvalidCursorError(f"Invalid cursor: {after!r}")
+
+        found = index.search(
+            text, limit + 1, after=tuple(position or ()) or None, accept=accept
+        )
+        items = [{**rows[key], "score": score} for key, score in found[:limit]]
+        if len(found) <= limit:
+            return Page(items=items)
+        last = items[-1]
+        return Page(
+            items=items, next_cursor=encode_cursor([last["score"], last["_id"]])
+        )
+
+    def _search_index(self) -> tuple[InvertedIndex, Dict[str, Dict[str, Any]]]:
+        built = self._search_indexes.get(self.table)
+        if built and built[0] == self.conn.total_changes:
+            return built[1], built[2]
+
+        index, rows = InvertedIndex(), {}
+        for row in self.iter_many():
+            rows[row["_id"]] = row
+            index.add(row["_id"], row.get("name") or "")
+        self._search_indexes[self.table] = (self.conn.total_changes, index, rows)
+        return index, rows
+
+    def iter_many(
+        self, where: Dict[str, Any] | None = None, batch_size: int = 1000, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        query = f"SELECT * FROM {self.table}"
+        values = ()
+        if where:
+            query_string, values = format_where(where)
+            query += f" WHERE {query_string}"
+
+        # own cursor, so other calls can use self.cursor while this one is consumed
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, values)
+            columns = [col[0] for col in cursor.description]
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+
     def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
         columns = ", ".join([f"{k}=?" for k in data.keys()])
         values = tuple(data.values())
@@ -129,3 +321,22 @@ class SQLiteDBAdapter(BaseDBAdapter):
         query = f"DROP TABLE IF EXISTS {table_name}"
         self.cursor.execute(query)
         self.conn.commit()
+
+
+def format_where(where: Dict[str, Any]) -> tuple[str, tuple]:
+    conditions = []
+    values = []
+    for key, value in where.items():
+        if isinstance(value, tuple) and value[0] == Operator.IN:
+            conditions.append(f"{key} IN ({', '.join('?' for _ in value[1])})")
+            values.extend(value[1])
+        elif isinstance(value, tuple) and value[0] == Operator.BETWEEN:
+            conditions.append(f"{key} BETWEEN ? AND ?")
+            values.extend(value[1])
+        elif isinstance(value, tuple) and value[0] == Operator.NE:
+            conditions.append(f"{key}!=?")
+            values.append(value[1])
+        else:
+            conditions.append(f"{key}=?")
+            values.append(value)
+    return " AND ".join(conditions), tuple(values)
@@ -1,33 +1,127 @@
+import base64
+import hashlib
+import json
+import logging
 import os
+import tempfile
+import threading
+import time
 
-from dopplersdk import DopplerSDK
 from dotenv import load_dotenv
 
 from src import constants as c
 
+logger = logging.getLogger("pbapi")
 
-def load_doppler_secrets():
-    load_dotenv()
 
-    # if secrets are in .env, don't fetch them from Doppler
-    if all(k in os.environ for k in c.REQUIRED_ENV_VAR_NAMES):
-        return
+def snapshot_dir() -> str:
+    """
+    Directory of the secrets snapshots, on the function's writable disk. The
+    default is a directory of its own under the system temp directory, private to
+    the user running the function.
+    """
+    return os.environ.get("DOPPLER_SNAPSHOT_DIR") or os.path.join(
+        tempfile.gettempdir(), f"{c.DOPPLER_PROJECT_NAME}-doppler-{os.getuid()}"
+    )
 
-    token = os.environ.get(c.DOPPLER_TOKEN_NAME)
-    if not token:
-        raise EnvironmentError(f"{c.DOPPLER_TOKEN_NAME} is not set")
 
-    config = os.environ.get("DOPPLER_ENVIRONMENT", os.environ.get("ENV_NAME"))
-    if not config:
-        raise EnvironmentError("DOPPLER_ENVIRONMENT is not set")
+def snapshot_path(config: str) -> str:
+    """Encrypted secrets snapshot of a Doppler config."""
+    return os.path.join(
+        snapshot_dir(), f"{c.DOPPLER_PROJECT_NAME}-{config}-secrets.enc"
+    )
+
+
+def check_private(info: os.stat_result) -> None:
+    """Raise ValueError unless the file belongs to us and nobody else can use it."""
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ValueError("snapshot path is not private to this user")
+
+
+def snapshot_cipher(key: str):
+    # only deployments with a cache key pay for importing cryptography
+    from cryptography.fernet import Fernet  # pylint: disable=import-outside-toplevel
+
+    # any secret string is a key, Fernet wants 32 url-safe base64 encoded bytes
+    return Fernet(base64.urlsafe_b64encode(hashlib.sha256(key.encode()).digest()))
+
+
+def snapshot_age(path: str) -> float:
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return float("inf")
+
+
+def decrypt_snapshot(key: str, data: bytes) -> bytes:
+    # pylint: disable-next=import-outside-toplevel
+    from cryptography.fernet import InvalidToken
+
+    try:
+        return snapshot_cipher(key).decrypt(data)
+    except InvalidToken as e:
+        raise ValueError("snapshot not encrypted with this key") from e
+
+
+def read_snapshot(path: str, key: str) -> dict | None:
+    """Secrets saved at path, None if there are none or they can't be read."""
+    try:
+        # checked on the open file, so it can't be swapped after the check
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+        with os.fdopen(fd, "rb") as f:
+            check_private(os.fstat(f.fileno()))
+            data = f.read()
+        return json.loads(decrypt_snapshot(key, data))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("doppler secrets snapshot not readable: %s", e)
+        return None
+
+
+def write_snapshot(path: str, secrets: dict, key: str) -> None:
+    data = snapshot_cipher(key).encrypt(json.dumps(secrets).encode("utf-8"))
+
+    # readable by the owner only, written aside and renamed so readers never see
+    # a partial file
+    partial = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        check_private(os.stat(directory))
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+    except (OSError, ValueError) as e:
+        logger.warning("doppler secrets snapshot not saved: %s", e)
+
+
+def refresh_snapshot(token: str, config: str, path: str, key: str) -> threading.Thread:
+    """Fetch secrets into the snapshot in a background thread."""
+
+    def refresh():
+        try:
+            write_snapshot(path, fetch_doppler_secrets(token, config), key)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("doppler secrets refresh failed: %s", e)
+
+    thread = threading.Thread(target=refresh, name="doppler-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+def fetch_doppler_secrets(token: str, config: str) -> dict:
+    # the SDK takes a good part of a cold start to import, only load it to fetch
+    from dopplersdk import DopplerSDK  # pylint: disable=import-outside-toplevel
 
     sdk = DopplerSDK()
     sdk.set_access_token(token)
     response = sdk.secrets.list(project=c.DOPPLER_PROJECT_NAME, config=config)
+
+    secrets = {}
     if response and response.secrets:
         for key, value in response.secrets.items():
-            if key in os.environ:
-                continue
             secret_value = getattr(value, "raw", None)
             if secret_value is None and isinstance(value, dict):
                 secret_value = (
@@ -37,4 +131,48 @@ def load_doppler_secrets():
                 secret_value = value
 
             if secret_value is not None:
-                os.environ[key] = secret_value
+                secrets[key] = secret_value
+    return secrets
+
+
+def load_doppler_secrets(snapshot_ttl: float = 0, snapshot_max_age: float = 86400):
+    """
+    Load secrets into the environment, from .env or else from Doppler.
+
+    With snapshot_ttl (seconds) and DOPPLER_CACHE_KEY set, secrets fetched from
+    Doppler are also saved to a snapshot on disk, encrypted with that key, and
+    later calls load them from there without waiting on Doppler. A snapshot older
+    than snapshot_ttl is still used, and refreshed in the background for the next
+    start; one older than snapshot_max_age is not used at all. Without a cache key
+    nothing is saved.
+    """
+    load_dotenv()
+
+    # if secrets are in .env, don't fetch them from Doppler
+    if all(k in os.environ for k in c.REQUIRED_ENV_VAR_NAMES):
+        return
+
+    token = os.environ.get(c.DOPPLER_TOKEN_NAME)
+    if not token:
+        raise EnvironmentError(f"{c.DOPPLER_TOKEN_NAME} is not set")
+
+    config = os.environ.get("DOPPLER_ENVIRONMENT", os.environ.get("ENV_NAME"))
+    if not config:
+        raise EnvironmentError("DOPPLER_ENVIRONMENT is not set")
+
+    key = os.environ.get(c.DOPPLER_CACHE_KEY_NAME)
+    use_snapshot = snapshot_ttl > 0 and bool(key)
+    path = snapshot_path(config)
+    age = snapshot_age(path) if use_snapshot else float("inf")
+
+    secrets = read_snapshot(path, key) if age <= snapshot_max_age else None
+    if secrets is None:
+        secrets = fetch_doppler_secrets(token, config)
+        if use_snapshot:
+            write_snapshot(path, secrets, key)
+    elif age > snapshot_ttl:
+        refresh_snapshot(token, config, path, key)
+
+    for name, value in secrets.items():
+        if name not in os.environ:
+            os.environ[name] = value
@@ -1,33 +1,140 @@
 import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
 
 from src.adapters.logger.default import DefaultLogger
+from src.adapters.logger.queued import BoundedQueueHandler
+
+# Appwrite context of the request being handled, and the records it logged so far
+appwrite_context: ContextVar = ContextVar("appwrite_context", default=None)
+appwrite_records: ContextVar[List[Tuple[int, str]] | None] = ContextVar(
+    "appwrite_records", default=None
+)
 
 
 class AppwriteHandler(logging.Handler):
-    def __init__(self, context):
-        super().__init__()
-        self.context = context
+    """
+    Collects the records of the request being handled, see appwrite_request. One
+    handler serves all requests; records logged outside of a request are skipped.
+    """
 
     def emit(self, record):
+        records = appwrite_records.get()
+        if records is None:
+            return
         try:
-            msg = self.format(record)
-            if record.levelno >= logging.ERROR:
-                self.context.error(msg)
-            else:
-                self.context.log(msg)
-        except Exception:
+            records.append((record.levelno, self.format(record)))
+        except Exception:  # pylint: disable=broad-exception-caught
             self.handleError(record)
 
 
+@contextmanager
+def appwrite_request(context) -> Iterator[None]:
+    """
+    Routes pbapi records logged within the block (and in threads it starts with a
+    copy of its context) to the Appwrite context. They are written to it when the
+    block exits: the runtime sends context logs with the response, so they can't
+    wait on a background thread.
+    """
+    records: List[Tuple[int, str]] = []
+    context_token = appwrite_context.set(context)
+    records_token = appwrite_records.set(records)
+    try:
+        yield
+    finally:
+        appwrite_records.reset(records_token)
+        appwrite_context.reset(context_token)
+        for levelno, msg in records:
+            try:
+                if levelno >= logging.ERROR:
+                    context.error(msg)
+                else:
+                    context.log(msg)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass  # a runtime that can't take logs must not fail the request
+
+
 class AppwriteLogger(DefaultLogger):
-    def __init__(self, context, level: int = logging.INFO):
+    """
+    The pbapi logger, set up once per process. Records are collected for the
+    Appwrite context of their request (see appwrite_request), and go through a
+    bounded queue to a background thread that writes them to the console (the
+    root logger's handlers).
+    """
+
+    def __init__(self, level: int = logging.INFO, queue_size: int = 10000):
         super().__init__(level)
-        self.context = context
-
-        # Check if AppwriteHandler is already attached to avoid duplicates
-        if not any(isinstance(h, AppwriteHandler) for h in self.log.handlers):
-            handler = AppwriteHandler(context)
-            handler.setLevel(level)
-            formatter = logging.Formatter("%(levelname)s: %(message)s")
-            handler.setFormatter(formatter)
-            self.log.addHandler(handler)
+
+        # Check if the queue is already attached to avoid duplicates
+        for handler in self.log.handlers:
+            if isinstance(handler, BoundedQueueHandler):
+                self.queue_handler = handler
+                return
+
+        handler = AppwriteHandler()
+        handler.setLevel(level)
+        formatter = logging.Formatter("%(levelname)s: %(message)s")
+        handler.setFormatter(formatter)
+        self.log.addHandler(handler)
+
+        self.queue_handler = BoundedQueueHandler(
+            *logging.root.handlers, max_size=queue_size
+        )
+        self.log.addHandler(self.queue_handler)
+        # the console handlers are fed by the queue, not by propagation
+        self.log.propagate = False
+        self.queue_handler.start()
+
+
+_logger: AppwriteLogger | None = None
+_logger_lock = threading.Lock()
+
+
+def log_level(default: int) -> int:
+    """LOG_LEVEL as a level number, default when it is unset or not a level name."""
+    name = os.environ.get("LOG_LEVEL", "").strip().upper()
+    if not name:
+        return default
+    level = logging.getLevelNamesMapping().get(name)
+    if level is None:
+        logging.getLogger("pbapi").warning(
+            "LOG_LEVEL %r is not a log level, using %s",
+            name,
+            logging.getLevelName(default),
+        )
+        return default
+    return level
+
+
+def get_appwrite_logger() -> AppwriteLogger:
+    """
+    The process-wide pbapi logger, set up on first use: at startup, or on the first
+    request under Appwrite. LOG_LEVEL sets its level, by default INFO under Appwrite
+    (first used within a request's context) and DEBUG when run locally;
+    LOG_QUEUE_SIZE bounds its queue.
+    """
+    global _logger  # pylint: disable=global-statement
+
+    if _logger is not None:
+        return _logger
+    with _logger_lock:
+        if _logger is None:
+            default = logging.DEBUG if appwrite_context.get() is None else logging.INFO
+            _logger = AppwriteLogger(
+                level=log_level(default),
+                queue_size=int(os.environ.get("LOG_QUEUE_SIZE", "10000")),
+            )
+        return _logger
+
+
+async def drain_logs(timeout: float) -> None:
+    """
+    Wait up to timeout for queued pbapi records to reach the console. For shutdown;
+    at exit logging.shutdown also handles what is still queued.
+    """
+    for handler in logging.getLogger("pbapi").handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            await handler.drain(timeout)
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Tuple
+
+
+def _set_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class DrainableQueue(queue.Queue):
+    """Queue that wakes event loops waiting for all of its records to be handled."""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def task_done(self) -> None:
+        super().task_done()
+        with self.mutex:
+            if self.unfinished_tasks or not self.waiters:
+                return
+            waiters, self.waiters = self.waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_set_done, future)
+            except RuntimeError:
+                pass  # the loop is closed, its drain() timed out long ago
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to handlers running in a QueueListener thread, so logging never
+    waits on output. The queue is bounded: when it's full, records below ERROR
+    are dropped and an ERROR or above takes the place of the oldest record.
+
+    Records are formatted by the handlers in the listener thread, not when they
+    are logged, so log arguments must not change after the call. Records below
+    the level of every handler are not queued at all.
+    """
+
+    def __init__(self, *handlers: logging.Handler, max_size: int = 10000):
+        super().__init__(DrainableQueue(maxsize=max_size))
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.setLevel(
+            min((handler.level for handler in handlers), default=logging.NOTSET)
+        )
+        self.dropped = 0
+        self._running = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._running:
+                self.listener.start()
+                self._running = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the listener is a thread of this process: no need to pickle the record,
+        # and LazyStr arguments are only computed if a handler formats them
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        with self._lock:
+            self.dropped += 1
+            if record.levelno < logging.ERROR:
+                return
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait up to timeout for queued records to be handled, False on timeout."""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        with self.queue.mutex:
+            if not self.queue.unfinished_tasks:
+                return True
+            self.queue.waiters.append((loop, done))
+        try:
+            await asyncio.wait_for(done, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self) -> None:
+        # handles what is still queued (logging.shutdown closes handlers at exit)
+        with self._lock:
+            if self._running:
+                try:
+                    self.listener.stop()
+                except queue.Full:
+                    pass  # no room for the stop sentinel, the thread is a daemon
+                self._running = False
+        super().close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "max_size": self.queue.maxsize,
+            "dropped": self.dropped,
+        }
@@ -1,5 +1,22 @@
+import asyncio
+from typing import Any, Callable, List, Tuple
+
 from fastapi import FastAPI
 
+from src.adapters.logger.appwrite import appwrite_request
+
+
+def stream_methods(res) -> Tuple[Callable, Callable, Callable] | None:
+    """
+    (start, write, end) of a runtime response that supports chunked responses
+    (Open Runtimes 5+), None on older runtimes, which only send whole bodies.
+    """
+    start, end = getattr(res, "start", None), getattr(res, "end", None)
+    write = getattr(res, "writeBinary", None) or getattr(res, "write_binary", None)
+    if callable(start) and callable(write) and callable(end):
+        return start, write, end
+    return None
+
 
 class AppwriteFastAPIAdapter:
     def __init__(self, app: FastAPI):
@@ -29,11 +46,25 @@ class AppwriteFastAPIAdapter:
             "appwrite_context": context,
         }
 
-        response_body = b""
+        # body chunks are joined once at the end, += would copy the body per chunk
+        chunks: List[bytes] = []
         response_status = 200
         response_headers = {}
+        stream = stream_methods(context.res)
+        streaming = False
+        streamed: Any = None
+
+        request_sent = False
+        response_sent = asyncio.Event()
 
         async def receive():
+            nonlocal request_sent
+            if request_sent:
+                # streaming responses listen for a disconnect while they run,
+                # answering at once would keep the event loop spinning
+                await response_sent.wait()
+                return {"type": "http.disconnect"}
+            request_sent = True
             return {
                 "type": "http.request",
                 "body": (
@@ -45,33 +76,48 @@ class AppwriteFastAPIAdapter:
             }
 
         async def send(message):
-            nonlocal response_body, response_status, response_headers
+            nonlocal response_status, streaming, streamed
             if message["type"] == "http.response.start":
                 response_status = message["status"]
                 for key, value in message.get("headers", []):
                     response_headers[key.decode("latin-1")] = value.decode("latin-1")
             elif message["type"] == "http.response.body":
-                response_body += message.get("body", b"")
-
-        await self.app(scope, receive, send)
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if not more_body:
+                    response_sent.set()
+                if stream is None or (not streaming and not more_body):
+                    # whole bodies, and every body without runtime streaming
+                    if body:
+                        chunks.append(body)
+                    return
 
-        # Return Appwrite response
-        # Note: context.res.send or context.res.json depending on content type
-        content_type = response_headers.get("content-type", "")
+                start, write, end = stream
+                if not streaming:
+                    # chunked response (StreamingResponse): forward as it comes
+                    response_headers.pop("content-length", None)
+                    start(response_status, response_headers)
+                    streaming = True
+                if body:
+                    write(body)
+                if not more_body:
+                    streamed = end()
 
-        # Binary or text?
-        if "application/json" in content_type:
-            import json
+        # routes log through the one AppwriteHandler, which collects their records
+        # for this context
+        with appwrite_request(context):
+            await self.app(scope, receive, send)
 
-            try:
-                data = json.loads(response_body.decode("utf-8"))
-                return context.res.json(data, response_status)
-            except:
-                pass
+        if streaming:
+            return streamed
 
-        return context.res.send(
-            response_body.decode("utf-8"), response_status, response_headers
-        )
+        # JSON (and any other body) goes out as the bytes the app serialized,
+        # with its own content-type, instead of being parsed and re-serialized
+        body = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        binary = getattr(context.res, "binary", None)
+        if callable(binary):
+            return binary(body, response_status, response_headers)
+        return context.res.send(body.decode("utf-8"), response_status, response_headers)
 
 
 async def run_fastapi_on_appwrite(app: FastAPI, context):
@@ -12,7 +12,11 @@ if base_dir not in sys.path:
 
 from src.adapters.doppler import load_doppler_secrets
 
-load_doppler_secrets()
+# cold starts read secrets from a disk snapshot, refreshed once older than the TTL
+load_doppler_secrets(
+    snapshot_ttl=float(os.environ.get("DOPPLER_SNAPSHOT_TTL_SECONDS", "300")),
+    snapshot_max_age=float(os.environ.get("DOPPLER_SNAPSHOT_MAX_AGE_SECONDS", "86400")),
+)
 
 from src.adapters.rest.fastapi_app import app
 from src.adapters.rest.appwrite_fastapi_adapter import run_fastapi_on_appwrite
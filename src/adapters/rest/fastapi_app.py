@@ -1,24 +1,56 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response
 
+from src.adapters.db.postgresql_async import close_async_pool
+from src.adapters.logger.appwrite import drain_logs, get_appwrite_logger
 from src.adapters.rest.fastapi_routes import (
+    BarcodeRouter,
     HealthRouter,
     UserRouter,
     HomeRouter,
     ReceiptRouter,
+    ShopRouter,
 )
+from src.handlers.barcode_index import get_barcode_index
+from src.handlers.search import SearchRouter
+from src.handlers.sfs_md.receipt_url_filter import get_receipt_url_filter
+from src.handlers.shop_index import get_shop_index
+
+# longest wait at shutdown for queued log records to reach the console
+SHUTDOWN_LOG_DRAIN_SECONDS = 5.0
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # sets up the logger and starts the initial receipt url filter (when enabled),
+    # shop and barcode index builds; without a lifespan (Appwrite) the first
+    # request using them does
+    get_appwrite_logger()
+    get_receipt_url_filter()
+    get_shop_index()
+    get_barcode_index()
+    yield
+    await close_async_pool()
+    await drain_logs(SHUTDOWN_LOG_DRAIN_SECONDS)
+
 
 app = FastAPI(
     title="Plant-Based API",
     description="All things vegan and plant-based API",
     version="0.0.1",
+    lifespan=lifespan,
 )
 
 app.include_router(HealthRouter)
 app.include_router(UserRouter)
 app.include_router(HomeRouter)
 app.include_router(ReceiptRouter)
+app.include_router(ShopRouter)
+app.include_router(BarcodeRouter)
+app.include_router(SearchRouter)
 
 # Enable CORS for dashboard
 app.add_middleware(
@@ -1,14 +1,23 @@
+import asyncio
 import logging
+from http import HTTPStatus
 
 import time
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette.requests import Request
-
-from src.adapters.logger.appwrite import AppwriteLogger
-from src.adapters.logger.default import DefaultLogger
-from src.handlers.sfs_md.receipt import SfsMdReceiptHandler
-from src.handlers.user_identity import UserIdentityHandler
+from starlette.responses import JSONResponse
+
+from src.adapters.db.postgresql import get_pool
+from src.adapters.logger.appwrite import get_appwrite_logger
+from src.handlers.add_barcodes import add_barcodes_handler
+from src.handlers.barcode_index import get_barcode_index
+from src.handlers.sfs_md.receipt import AsyncSfsMdReceiptHandler, get_receipt_cache
+from src.handlers.sfs_md.receipt_url_filter import get_receipt_url_filter
+from src.handlers.shop_index import get_shop_index
+from src.handlers.shops import shops_handler
+from src.handlers.user_identity import AsyncUserIdentityHandler
 from src.schemas.request_schemas import (
+    AddBarcodesRequest,
     GetOrCreateUserByIdentityRequest,
     GetReceiptByUrlRequest,
 )
@@ -19,14 +28,18 @@ HomeRouter = APIRouter(tags=["home"])
 HealthRouter = APIRouter(prefix="/health", tags=["health"])
 UserRouter = APIRouter(prefix="/user", tags=["user"])
 ReceiptRouter = APIRouter(prefix="/receipt", tags=["receipt"])
+ShopRouter = APIRouter(prefix="/shops", tags=["shops"])
+BarcodeRouter = APIRouter(prefix="/barcodes", tags=["barcodes"])
 
+# how long a request waits for the initial shop index build
+SHOP_INDEX_WAIT_SECONDS = 5.0
 
-def get_logger(request: Request) -> logging.Logger:
-    if "appwrite_context" in request.scope:
-        context = request.scope["appwrite_context"]
-        return AppwriteLogger(context, level=logging.INFO).log
 
-    return DefaultLogger(level=logging.DEBUG).log
+async def get_logger() -> logging.Logger:
+    # async, so FastAPI calls it in place instead of in the thread pool; records
+    # reach the Appwrite context of the request logging them (see AppwriteHandler),
+    # or the console outside of Appwrite
+    return get_appwrite_logger().log
 
 
 @UserRouter.post("/get-or-create-by-identity")
@@ -34,17 +47,23 @@ async def get_or_create_user_by_identity(
     request: GetOrCreateUserByIdentityRequest, logger=Depends(get_logger)
 ):
     logger.info(f"User identity: {request.id} for provider: {request.provider}")
-    handler = UserIdentityHandler(logger)
-    return handler.get_or_create_user_by_identity(
-        request.id, request.provider, request.email, request.name
-    )
+    handler = AsyncUserIdentityHandler(logger)
+    try:
+        return await handler.get_or_create_user_by_identity(
+            request.id, request.provider, request.email, request.name
+        )
+    finally:
+        await handler.close()
 
 
 @ReceiptRouter.post("/get-or-create", response_model=SfsMdReceipt)
 async def get_or_create_receipt(request: SfsMdReceipt, logger=Depends(get_logger)):
     logger.info(f"Receipt URL: {request.receipt_url}")
-    handler = SfsMdReceiptHandler(logger)
-    return handler.get_or_create(request)
+    handler = AsyncSfsMdReceiptHandler(logger)
+    try:
+        return await handler.get_or_create(request)
+    finally:
+        await handler.close()
 
 
 @ReceiptRouter.post("/get-by-url", response_model=SfsMdReceipt)
@@ -52,13 +71,58 @@ async def get_receipt_by_url(
     request: GetReceiptByUrlRequest, logger=Depends(get_logger)
 ):
     logger.info(f"Receipt URL: {request.url}")
-    handler = SfsMdReceiptHandler(logger)
-    receipt = handler.get_by_url(request.url)
+    handler = AsyncSfsMdReceiptHandler(logger)
+    try:
+        receipt = await handler.get_by_url(request.url)
+    finally:
+        await handler.close()
     if not receipt:
         raise HTTPException(status_code=404, detail="Receipt not found")
     return receipt
 
 
+@ShopRouter.get("")
+async def list_shops(request: Request, logger=Depends(get_logger)):
+    logger.info(f"Shops: {request.url.query}")
+    # the handler runs on the sync pool, keep it off the event loop
+    status, body = await asyncio.to_thread(
+        shops_handler, dict(request.query_params), logger
+    )
+    if status != HTTPStatus.OK:
+        raise HTTPException(status_code=status, detail=body["msg"])
+    return body
+
+
+@ShopRouter.get("/nearby")
+async def nearby_shops(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    limit: int = Query(10, ge=1, le=100),
+    radius_m: float | None = Query(None, gt=0),
+    logger=Depends(get_logger),
+):
+    logger.info(f"Nearby shops: {lat}, {lon} radius: {radius_m}")
+    shop_index = get_shop_index()
+    if not shop_index.ready and not await asyncio.to_thread(
+        shop_index.wait_ready, SHOP_INDEX_WAIT_SECONDS
+    ):
+        raise HTTPException(status_code=503, detail="Shop index is not ready")
+    return {"items": shop_index.nearby(lat, lon, limit=limit, radius_m=radius_m)}
+
+
+@BarcodeRouter.post("")
+async def add_barcodes(request: AddBarcodesRequest, logger=Depends(get_logger)):
+    logger.info(f"Barcodes: {len(request.items)} items for shop: {request.shop_id}")
+    # the handler runs on the sync pool, keep it off the event loop
+    status, body = await asyncio.to_thread(
+        add_barcodes_handler, request.shop_id, request.items, logger
+    )
+    if status != HTTPStatus.OK:
+        # keep invalid_items in the body, the client shows them per item
+        return JSONResponse(status_code=status, content=body)
+    return body
+
+
 @HomeRouter.get("/", response_model=Health)
 async def home(logger=Depends(get_logger)):
     logger.info("Home endpoint called")
@@ -71,6 +135,45 @@ async def health(logger=Depends(get_logger)):
     return Health()
 
 
+@HealthRouter.get("/db-pool")
+async def db_pool_stats(logger=Depends(get_logger)):
+    logger.info("DB pool stats endpoint called")
+    return get_pool().stats()
+
+
+@HealthRouter.get("/receipt-cache")
+async def receipt_cache_stats(logger=Depends(get_logger)):
+    logger.info("Receipt cache stats endpoint called")
+    return get_receipt_cache().stats()
+
+
+@HealthRouter.get("/receipt-url-filter")
+async def receipt_url_filter_stats(logger=Depends(get_logger)):
+    logger.info("Receipt URL filter stats endpoint called")
+    url_filter = get_receipt_url_filter()
+    if not url_filter:
+        return {"enabled": False}
+    return {"enabled": True, **url_filter.stats()}
+
+
+@HealthRouter.get("/shop-index")
+async def shop_index_stats(logger=Depends(get_logger)):
+    logger.info("Shop index stats endpoint called")
+    return get_shop_index().stats()
+
+
+@HealthRouter.get("/barcode-index")
+async def barcode_index_stats(logger=Depends(get_logger)):
+    logger.info("Barcode index stats endpoint called")
+    return get_barcode_index().stats()
+
+
+@HealthRouter.get("/logging")
+async def logging_stats(logger=Depends(get_logger)):
+    logger.info("Logging stats endpoint called")
+    return get_appwrite_logger().queue_handler.stats()
+
+
 @HealthRouter.get("/deep-ping", response_model=Health)
 async def deep_ping(logger=Depends(get_logger)):
     logger.info("Deep ping endpoint called")
@@ -1,5 +1,6 @@
 DOPPLER_TOKEN_NAME = "PBAPI_DOPPLER_PROD_TOKEN"
 DOPPLER_PROJECT_NAME = "pbapi"
+DOPPLER_CACHE_KEY_NAME = "DOPPLER_CACHE_KEY"
 
 REQUIRED_ENV_VAR_NAMES = [
     "POSTGRES_HOST",
@@ -3,28 +3,66 @@ from http import HTTPStatus
 from uuid import UUID
 
 from src.adapters.db.postgresql import init_db_session
+from src.handlers.barcode_index import index_barcode
+from src.handlers.shop_item_dedup import get_shop_item_deduplicator
 from src.schemas.common import TableName, ItemBarcodeStatus
 from src.schemas.shop_item import ShopItem
 
 
-def add_barcodes_handler(shop_id: int, items: list[dict], logger) -> (HTTPStatus, dict):
-    session = init_db_session(logger)
-    session.use_table(TableName.SHOP_ITEM)
+def shop_item_row(shop_id: int, item: dict) -> dict:
+    """shop_item row for one submitted item; raises ValueError for invalid items."""
+    fields = {
+        "shop_id": shop_id,
+        "name": "_".join(item["purchase_id"].split("_")[:-1]),
+        "status": ItemBarcodeStatus(item["status"]),
+        "barcode": item.get("barcode"),
+    }
+    if item.get("item_id"):
+        fields["id"] = UUID(item["item_id"])
+    return ShopItem(**fields).model_dump(mode="json")
+
 
-    invalid_items = []
+def validate_items(shop_id: int, items: list[dict], logger) -> (list, list):
+    """(rows, invalid_items): every item is checked before anything is written."""
+    rows, invalid_items = [], []
     for item in items:
         try:
-            item = ShopItem(
-                id=UUID(item["item_id"]) if item.get("item_id") else None,
-                shop_id=shop_id,
-                name="_".join(item["purchase_id"].split("_")[:-1]),
-                status=ItemBarcodeStatus(item["status"]),
-                barcode=item.get("barcode"),
-            ).model_dump(mode="json")
-            session.create_or_update_one(item)
-        except ValueError as e:
-            invalid_items.append({"name": item["name"], "error": str(e)})
-            logger.error(f"Failed to add item: {json.dumps(item)}. Error: {e}")
+            rows.append((not item.get("item_id"), shop_item_row(shop_id, item)))
+        except (KeyError, ValueError) as e:
+            error = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+            invalid_items.append({"name": item.get("purchase_id"), "error": error})
+            logger.error(f"Failed to add item: {json.dumps(item)}. Error: {error}")
+    return rows, invalid_items
+
+
+def add_barcodes_handler(shop_id: int, items: list[dict], logger) -> (HTTPStatus, dict):
+    rows, invalid_items = validate_items(shop_id, items, logger)
+
+    possible_duplicates = []
+    if rows:
+        deduplicator = get_shop_item_deduplicator()
+        with init_db_session(logger) as session:
+            for is_new, row in rows:
+                if not is_new:
+                    continue
+                duplicates = deduplicator.find(session, shop_id, row["name"])
+                if duplicates:
+                    logger.warning(
+                        f"Item {row['name']!r} is a near duplicate of "
+                        f"{[d['name'] for d in duplicates]}"
+                    )
+                    possible_duplicates.append(
+                        {"name": row["name"], "duplicates": duplicates}
+                    )
+
+            # one multi-row statement in one transaction instead of a commit per item
+            session.use_table(TableName.SHOP_ITEM)
+            session.upsert_many([row for _, row in rows])
+
+        for is_new, row in rows:
+            if is_new:
+                deduplicator.add(shop_id, row)
+            index_barcode(row)
 
     if invalid_items:
         return HTTPStatus.BAD_REQUEST, {
@@ -32,5 +70,6 @@ def add_barcodes_handler(shop_id: int, items: list[dict], logger) -> (HTTPStatus
             "invalid_items": invalid_items,
         }
     return HTTPStatus.OK, {
-        "msg": "Purchases successfully added. You can add another URL"
+        "msg": "Purchases successfully added. You can add another URL",
+        "possible_duplicates": possible_duplicates,
     }
@@ -0,0 +1,201 @@
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from src.adapters.db.postgresql import PostgreSQLAdapter, get_pool
+from src.helpers.item_names import normalize_item_name, split_quantities
+from src.helpers.minhash import MinHashLSH
+from src.schemas.common import ItemBarcodeStatus, TableName
+from src.schemas.purchased_item import BarcodeSuggestion
+from src.schemas.sfs_md.receipt import SfsMdReceipt
+
+
+class BarcodeIndex:
+    """
+    Index from normalized item names to the barcodes shop items with that name
+    were given, so pending items can be offered the barcodes of the same product
+    in other shops.
+
+    Names are matched through MinHash LSH, so names differing by a typo or an
+    abbreviation share their barcodes, as long as their quantities are the same.
+    Barcodes added by this process are indexed as they are added; others show up
+    on the next build.
+    """
+
+    def __init__(self, threshold: float = 0.7, logger=None):
+        self.threshold = threshold
+        self.logger = logger or logging.getLogger("pbapi")
+        self.builds = 0
+        self._names: MinHashLSH | None = None
+        # normalized name -> barcode -> number of shop items
+        self._barcodes: Dict[str, Counter] = {}
+        # shop item id -> (normalized name, barcode), to move re-added items
+        self._items: Dict[str, Tuple[str, str]] = {}
+        # items added while a build is running, None when no build is running
+        self._pending: List[Dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._names is not None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Index a shop item whose barcode was added, or move a re-added one."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(item)
+            if self._names is not None:
+                self._index(self._names, self._barcodes, self._items, item)
+
+    def suggest(self, name: str, limit: int = 3) -> List[BarcodeSuggestion]:
+        """Up to limit barcodes for an item name, most likely first."""
+        names = self._names
+        if names is None:
+            return []
+
+        scores: Counter = Counter()
+        counts: Counter = Counter()
+        words, quantities = split_quantities(normalize_item_name(name))
+        with self._lock:
+            for matched, similarity in names.query(words):
+                if split_quantities(matched)[1] != quantities:
+                    continue
+                for barcode, count in self._barcodes.get(matched, {}).items():
+                    scores[barcode] += similarity * count
+                    counts[barcode] += count
+
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            BarcodeSuggestion(
+                barcode=barcode, score=round(score / total, 3), items=counts[barcode]
+            )
+            for barcode, score in ranked[:limit]
+        ]
+
+    def apply(self, receipt: SfsMdReceipt, limit: int = 3) -> None:
+        """Set barcode_suggestions of the receipt's pending purchases."""
+        if not self.ready:
+            return
+        suggestions: Dict[str, List[BarcodeSuggestion]] = {}
+        for purchase in receipt.purchases:
+            if purchase.status != ItemBarcodeStatus.PENDING:
+                continue
+            if purchase.name not in suggestions:
+                suggestions[purchase.name] = self.suggest(purchase.name, limit)
+            purchase.barcode_suggestions = suggestions[purchase.name]
+
+    def build(self) -> bool:
+        """Rebuild in the calling thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        self._build()
+        return True
+
+    def start_build(self) -> bool:
+        """Rebuild in a background thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        threading.Thread(
+            target=self._build_in_background, name="barcode-index", daemon=True
+        ).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "building": self._pending is not None,
+            "builds": self.builds,
+            "threshold": self.threshold,
+            "names": len(self._barcodes),
+            "items": len(self._items),
+        }
+
+    @staticmethod
+    def _index(
+        names: MinHashLSH,
+        barcodes: Dict[str, Counter],
+        items: Dict[str, Tuple[str, str]],
+        item: Dict[str, Any],
+    ) -> None:
+        item_id = str(item["id"])
+        previous = items.pop(item_id, None)
+        if previous is not None:
+            name, barcode = previous
+            barcodes[name][barcode] -= 1
+            if barcodes[name][barcode] <= 0:
+                del barcodes[name][barcode]
+            if not barcodes[name]:
+                del barcodes[name]
+                names.remove(name)
+
+        if item.get("status") != ItemBarcodeStatus.ADDED or not item.get("barcode"):
+            return
+        name = item.get("normalized_name") or normalize_item_name(item["name"])
+        if name not in barcodes:
+            barcodes[name] = Counter()
+            names.add(name, split_quantities(name)[0])
+        barcodes[name][item["barcode"]] += 1
+        items[item_id] = (name, item["barcode"])
+
+    def _begin_build(self) -> bool:
+        with self._lock:
+            if self._pending is not None:
+                return False
+            self._pending = []
+            return True
+
+    def _build(self) -> None:
+        try:
+            names, barcodes, items = MinHashLSH(self.threshold), {}, {}
+            with PostgreSQLAdapter(self.logger, pool=get_pool()) as db:
+                db.use_table(TableName.SHOP_ITEM)
+                for item in db.iter_many({"status": ItemBarcodeStatus.ADDED.value}):
+                    self._index(names, barcodes, items, item)
+
+            with self._lock:
+                for item in self._pending:
+                    self._index(names, barcodes, items, item)
+                self._names, self._barcodes, self._items = names, barcodes, items
+                self.builds += 1
+            self.logger.info(
+                "barcode index built: %s names, %s items", len(barcodes), len(items)
+            )
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def _build_in_background(self) -> None:
+        try:
+            self._build()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.error("barcode index build failed: %s", e)
+
+
+_barcode_index: BarcodeIndex | None = None  # pylint: disable=invalid-name
+_barcode_index_lock = threading.Lock()
+
+
+def get_barcode_index() -> BarcodeIndex:
+    """
+    The process-wide barcode index. The first call starts the initial build in the
+    background; BARCODE_INDEX_THRESHOLD sets the name similarity (Jaccard of
+    character trigrams) at which items count as the same product.
+    """
+    global _barcode_index  # pylint: disable=global-statement
+
+    with _barcode_index_lock:
+        if _barcode_index is None:
+            _barcode_index = BarcodeIndex(
+                threshold=float(os.environ.get("BARCODE_INDEX_THRESHOLD", "0.7"))
+            )
+            _barcode_index.start_build()
+        return _barcode_index
+
+
+def index_barcode(item: Dict[str, Any]) -> None:
+    """Add a shop item with a new barcode to the process-wide index, if there is one."""
+    if _barcode_index is not None:
+        _barcode_index.add(item)
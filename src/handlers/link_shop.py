@@ -1,39 +1,51 @@
 from http import HTTPStatus
+from typing import Any, Dict
 
+from src.adapters.db.base import BaseDBAdapter
 from src.adapters.db.postgresql import init_db_session
+from src.handlers.shop_index import index_shop
 from src.helpers.osm import validate_osm_url, parse_osm_url, lookup_osm_data
 from src.schemas.common import TableName, OsmType
 from src.schemas.osm_data import OsmData
 from src.schemas.shop import Shop
 
 
+def find_shop(session: BaseDBAdapter, receipt: Dict[str, Any]) -> Dict[str, Any] | None:
+    session.use_table(TableName.SHOP)
+    shops = session.read_many(
+        {
+            "company_id": receipt["company_id"],
+            "shop_address": receipt["shop_address"],
+        },
+        partition_key=receipt["country_code"],
+        limit=1,
+    )
+    return shops[0] if shops else None
+
+
 def link_shop_handler(
     url: str, user_id: str, receipt_id: str, logger
 ) -> (HTTPStatus, dict):
     if not validate_osm_url(url):
         return HTTPStatus.BAD_REQUEST, {"msg": "Unsupported URL"}
 
-    session = init_db_session(logger)
-    session.use_table(TableName.RECEIPT)
-    receipt = session.read_one(receipt_id, partition_key=user_id)
-    if not receipt:
-        return HTTPStatus.NOT_FOUND, {"msg": "Receipt not found"}
+    with init_db_session(logger) as session:
+        session.use_table(TableName.RECEIPT)
+        receipt = session.read_one(receipt_id, partition_key=user_id)
+        if not receipt:
+            return HTTPStatus.NOT_FOUND, {"msg": "Receipt not found"}
 
-    # double check that the shop doesn't exist
-    session.use_table(TableName.SHOP)
-    shops = session.read_many(
-        {"company_id": receipt["company_id"], "shop_address": receipt["shop_address"]},
-        partition_key=receipt["country_code"],
-        limit=1,
-    )
-    if shops:
-        shop = shops[0]
-    else:
+        # double check that the shop doesn't exist
+        shop = find_shop(session, receipt)
+
+    new_shop = None
+    if shop is None:
         try:
             osm_type, osm_key = parse_osm_url(url)
         except ValueError:
             return HTTPStatus.BAD_REQUEST, {"msg": "Invalid OSM URL"}
 
+        # no connection is held while OSM answers
         osm_shop_data = lookup_osm_data(osm_type, osm_key)
         if not osm_shop_data:
             return HTTPStatus.BAD_REQUEST, {"msg": "Failed to get OSM shop details"}
@@ -46,19 +58,27 @@ def link_shop_handler(
             display_name=osm_shop_data["display_name"],
             address=osm_shop_data["address"],
         )
-        shop = Shop(
+        new_shop = Shop(
             country_code=receipt["country_code"],
             company_id=receipt["company_id"],
             shop_address=receipt["shop_address"],
             osm_data=osm_data,
         ).model_dump(mode="json")
-        session.use_table(TableName.SHOP)
-        session.create_one(shop)
 
-    session.use_table(TableName.RECEIPT)
-    receipt["shop_id"] = shop["id"]
-    session.update_one(receipt_id, receipt)
-    return HTTPStatus.OK, {
-        "msg": "Shop successfully linked",
-        "data": {"shop_id": shop["id"]},
-    }
+    with init_db_session(logger) as session:
+        if new_shop is not None:
+            # another request may have linked the shop during the lookup
+            shop = find_shop(session, receipt)
+            if shop is None:
+                shop_id = session.create_one(new_shop)
+                # index the stored row, shaped like the rows the index is built from
+                shop = session.read_one(shop_id, partition_key=receipt["country_code"])
+                index_shop(shop)
+
+        session.use_table(TableName.RECEIPT)
+        receipt["shop_id"] = shop["id"]
+        session.update_one(receipt_id, receipt)
+        return HTTPStatus.OK, {
+            "msg": "Shop successfully linked",
+            "data": {"shop_id": shop["id"]},
+        }
@@ -1,9 +1,34 @@
-import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.adapters.db.base import InvalidCursorError, Page
+from src.adapters.db.postgresql_async import init_async_db_session
+from src.adapters.rest.fastapi_routes import get_logger
+from src.schemas.common import TableName
 
 SearchRouter = APIRouter(
     prefix="/v1/search",
     tags=["search"],
 )
 
-logger = logging.getLogger(__name__)
+
+@SearchRouter.get("/items", response_model=Page)
+async def search_items(
+    q: str = Query(min_length=2, max_length=200),
+    shop_id: int | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    request_logger=Depends(get_logger),
+):
+    """Shop items by name, typo tolerant, best match first."""
+    request_logger.info("Item search: %r shop: %s", q, shop_id)
+    async with init_async_db_session(request_logger) as db:
+        db.use_table(TableName.SHOP_ITEM)
+        try:
+            return await db.search(
+                q,
+                limit,
+                where=None if shop_id is None else {"shop_id": shop_id},
+                after=cursor,
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
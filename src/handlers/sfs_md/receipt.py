@@ -1,71 +1,267 @@
+import os
+import threading
 from uuid import UUID
 
 from src.adapters.db.postgresql import PostgreSQLAdapter, init_db_session
-from src.helpers.common import make_hash
-from src.schemas.common import TableName, ItemBarcodeStatus
+from src.adapters.db.postgresql_async import (
+    AsyncPostgreSQLAdapter,
+    init_async_db_session,
+)
+from src.handlers.barcode_index import get_barcode_index
+from src.handlers.sfs_md.receipt_url_filter import get_receipt_url_filter
+from src.helpers.cache import LRUCache
+from src.helpers.common import LazyStr, make_hash
+from src.helpers.item_names import normalize_item_name
+from src.schemas.common import TableName, ItemBarcodeStatus, Operator
 from src.schemas.receipt_url import ReceiptUrl
 from src.schemas.sfs_md.receipt import SfsMdReceipt
 
+_receipt_cache: LRUCache | None = None  # pylint: disable=invalid-name
+_receipt_cache_lock = threading.Lock()
+
+
+def get_receipt_cache() -> LRUCache:
+    """
+    Process-wide cache of receipts, keyed by receipt id, and of receipt ids, keyed
+    by URL hash. Sized via RECEIPT_CACHE_MAX_SIZE and RECEIPT_CACHE_TTL (seconds).
+    """
+    global _receipt_cache  # pylint: disable=global-statement
+
+    with _receipt_cache_lock:
+        if _receipt_cache is None:
+            _receipt_cache = LRUCache(
+                max_size=int(os.environ.get("RECEIPT_CACHE_MAX_SIZE", "1024")),
+                ttl=float(os.environ.get("RECEIPT_CACHE_TTL", "300")),
+            )
+        return _receipt_cache
+
+
+def get_cached_receipt(url_hash: str) -> SfsMdReceipt | None:
+    cache = get_receipt_cache()
+    receipt_id = cache.get(url_hash)
+    if receipt_id is None:
+        return None
+
+    receipt = cache.get(receipt_id)
+    # callers may modify the receipt, never hand out the cached instance
+    return receipt.model_copy(deep=True) if receipt else None
+
+
+def cache_receipt(receipt: SfsMdReceipt, url_hashes: list[str]) -> None:
+    cache = get_receipt_cache()
+    cache.set(receipt.id, receipt.model_copy(deep=True))
+    for url_hash in url_hashes:
+        cache.set(url_hash, receipt.id)
+
+
+def shop_items_where(receipt: SfsMdReceipt) -> dict:
+    """Filter matching every purchase of the receipt to its shop item at once."""
+    names = list(
+        dict.fromkeys(
+            normalize_item_name(purchase.name) for purchase in receipt.purchases
+        )
+    )
+    return {"normalized_name": (Operator.IN, names), "shop_id": receipt.shop_id}
+
+
+def apply_shop_items(receipt: SfsMdReceipt, items: list[dict]) -> None:
+    # names are not unique within a shop yet, the first match wins
+    items_by_name = {}
+    for item in items:
+        items_by_name.setdefault(item["normalized_name"], item)
+
+    for purchase in receipt.purchases:
+        item = items_by_name.get(normalize_item_name(purchase.name))
+        if item:
+            purchase.item_id = UUID(str(item["id"]))
+            purchase.status = ItemBarcodeStatus(
+                item.get("status") or ItemBarcodeStatus.PENDING
+            )
+
+
+def purchased_item_rows(receipt: SfsMdReceipt) -> list[dict]:
+    # ids follow (receipt, position) so re-ingesting a receipt updates its rows;
+    # migration 008 derives the same ids in SQL
+    return [
+        {
+            "id": str(UUID(make_hash(f"{receipt.id}/{position}"))),
+            "receipt_id": receipt.id,
+            "position": position,
+            **purchase.model_dump(
+                mode="json", exclude={"status", "barcode_suggestions"}
+            ),
+        }
+        for position, purchase in enumerate(receipt.purchases)
+    ]
+
+
+def stale_purchases_where(receipt: SfsMdReceipt) -> dict:
+    """Rows of a previous ingest of the receipt past its current last line."""
+    return {
+        "receipt_id": receipt.id,
+        "position": (Operator.GTE, len(receipt.purchases)),
+    }
+
+
+def suggest_barcodes(receipt: SfsMdReceipt) -> SfsMdReceipt:
+    """Rank barcodes for the receipt's pending purchases, for the client to confirm."""
+    if any(p.status == ItemBarcodeStatus.PENDING for p in receipt.purchases):
+        get_barcode_index().apply(receipt)
+    return receipt
+
+
+def receipt_urls(receipt: SfsMdReceipt) -> list[dict]:
+    urls = [receipt.receipt_url]
+    if receipt.receipt_canonical_url:
+        urls.append(receipt.receipt_canonical_url)
+    return [
+        ReceiptUrl(url=url, receipt_id=receipt.id).model_dump(mode="json")
+        for url in urls
+    ]
+
+
+def shop_where(receipt: SfsMdReceipt) -> dict:
+    return {
+        "address": receipt.shop_address,
+        "company_id": receipt.company_id,
+        "country_code": receipt.country_code,
+    }
+
+
+def apply_shop(receipt: SfsMdReceipt, shops: list[dict]) -> bool:
+    """Set the receipt's shop; True when its purchases need their shop items."""
+    if not shops:
+        return False
+    receipt.shop_id = int(shops[0]["id"])
+    return bool(receipt.purchases)
+
+
+def answer_without_db(url_hash: str, logger) -> tuple[bool, SfsMdReceipt | None]:
+    """(True, receipt or None) when get_by_url needs no query, (False, None) else."""
+    cached = get_cached_receipt(url_hash)
+    if cached:
+        logger.info("receipt _id (cached): " + cached.id)
+        return True, suggest_barcodes(cached)
+
+    url_filter = get_receipt_url_filter()
+    if url_filter and not url_filter.might_contain(url_hash):
+        logger.info("receipt url not found (filter)")
+        return True, None
+    return False, None
+
+
+def found_receipt(row: dict | None, url_hash: str, logger) -> SfsMdReceipt | None:
+    if not row:
+        return None
+    logger.info("receipt _id: " + row["id"])
+    receipt = SfsMdReceipt.from_row(row)
+    cache_receipt(receipt, [url_hash])
+    return suggest_barcodes(receipt)
+
+
+def stored_receipt(receipt: SfsMdReceipt, urls: list[dict], logger) -> SfsMdReceipt:
+    """Bookkeeping once a receipt is written: cache, url filter, log, suggestions."""
+    cache_receipt(receipt, [url["id"] for url in urls])
+    url_filter = get_receipt_url_filter()
+    if url_filter:
+        url_filter.add(url["id"] for url in urls)
+
+    # dumped only if the record is emitted
+    logger.info("%s", LazyStr(receipt.model_dump))
+    return suggest_barcodes(receipt)
+
 
 class SfsMdReceiptHandler:
     def __init__(self, logger):
         self.logger = logger
         self.db: PostgreSQLAdapter = init_db_session(self.logger)
 
+    def close(self) -> None:
+        self.db.close()
+
     def get_by_url(self, url: str) -> SfsMdReceipt | None:
         self.logger.info("receipt url: " + url)
 
-        self.db.use_table(TableName.RECEIPT_URL)
-        receipt_url = self.db.read_one(make_hash(url))
+        url_hash = make_hash(url)
+        answered, receipt = answer_without_db(url_hash, self.logger)
+        if answered:
+            return receipt
 
-        if receipt_url:
-            url = ReceiptUrl(**receipt_url)
-            self.logger.info("receipt _id: " + url.receipt_id)
+        row = self.db.read_receipt(url_hash, by_url=True)
+        return found_receipt(row, url_hash, self.logger)
+
+    def get_or_create(self, receipt: SfsMdReceipt) -> SfsMdReceipt:
+        get_receipt_cache().delete(receipt.id)
 
+        self.db.use_table(TableName.SHOP)
+        shops = self.db.read_many(shop_where(receipt), limit=1)
+        if apply_shop(receipt, shops):
+            self.db.use_table(TableName.SHOP_ITEM)
+            apply_shop_items(receipt, self.db.read_many(shop_items_where(receipt)))
+
+        urls = receipt_urls(receipt)
+        # one commit for the receipt, its purchases and its urls
+        with self.db.transaction():
             self.db.use_table(TableName.RECEIPT)
-            receipt = self.db.read_one(url.receipt_id)
-            if receipt:
-                return SfsMdReceipt(**receipt)
-        return None
+            self.db.create_or_update_one(
+                receipt.model_dump(mode="json", exclude={"purchases"})
+            )
+
+            self.db.use_table(TableName.PURCHASED_ITEM)
+            if receipt.purchases:
+                self.db.upsert_many(purchased_item_rows(receipt))
+            self.db.delete_many(stale_purchases_where(receipt))
+
+            self.db.use_table(TableName.RECEIPT_URL)
+            self.db.create_many(urls)
+
+        return stored_receipt(receipt, urls, self.logger)
+
+
+class AsyncSfsMdReceiptHandler:
+    def __init__(self, logger):
+        self.logger = logger
+        self.db: AsyncPostgreSQLAdapter = init_async_db_session(self.logger)
+
+    async def close(self) -> None:
+        await self.db.close()
+
+    async def get_by_url(self, url: str) -> SfsMdReceipt | None:
+        self.logger.info("receipt url: " + url)
+
+        url_hash = make_hash(url)
+        answered, receipt = answer_without_db(url_hash, self.logger)
+        if answered:
+            return receipt
+
+        row = await self.db.read_receipt(url_hash, by_url=True)
+        return found_receipt(row, url_hash, self.logger)
+
+    async def get_or_create(self, receipt: SfsMdReceipt) -> SfsMdReceipt:
+        get_receipt_cache().delete(receipt.id)
 
-    def get_or_create(self, receipt: SfsMdReceipt) -> SfsMdReceipt:
         self.db.use_table(TableName.SHOP)
-        shops = self.db.read_many(
-            {
-                "address": receipt.shop_address,
-                "company_id": receipt.company_id,
-                "country_code": receipt.country_code,
-            },
-            limit=1,
-        )
-        if shops:
-            receipt.shop_id = int(shops[0]["id"])
-
-            for i, purchase in enumerate(receipt.purchases):
-                self.db.use_table(TableName.SHOP_ITEM)
-                items = self.db.read_many(
-                    {"name": purchase.name, "shop_id": receipt.shop_id},
-                    limit=1,
-                )
-                if items:
-                    receipt.purchases[i].item_id = UUID(items[0]["id"])
-                    receipt.purchases[i].status = items[0].get(
-                        "status", ItemBarcodeStatus.PENDING
-                    )
-
-        self.db.use_table(TableName.RECEIPT)
-        self.db.create_or_update_one(receipt.model_dump(mode="json"))
-
-        self.db.use_table(TableName.RECEIPT_URL)
-        receipt_url = ReceiptUrl(url=receipt.receipt_url, receipt_id=receipt.id)
-        self.db.create_one(receipt_url.model_dump(mode="json"))
-
-        if receipt.receipt_canonical_url:
-            receipt_url_canonical = ReceiptUrl(
-                url=receipt.receipt_canonical_url,
-                receipt_id=receipt.id,
+        shops = await self.db.read_many(shop_where(receipt), limit=1)
+        if apply_shop(receipt, shops):
+            self.db.use_table(TableName.SHOP_ITEM)
+            apply_shop_items(
+                receipt, await self.db.read_many(shop_items_where(receipt))
+            )
+
+        urls = receipt_urls(receipt)
+        # one commit for the receipt, its purchases and its urls
+        async with self.db.transaction():
+            self.db.use_table(TableName.RECEIPT)
+            await self.db.create_or_update_one(
+                receipt.model_dump(mode="json", exclude={"purchases"})
             )
-            self.db.create_one(receipt_url_canonical.model_dump(mode="json"))
 
-        self.logger.info(receipt.model_dump())
-        return receipt
+            self.db.use_table(TableName.PURCHASED_ITEM)
+            if receipt.purchases:
+                await self.db.upsert_many(purchased_item_rows(receipt))
+            await self.db.delete_many(stale_purchases_where(receipt))
+
+            self.db.use_table(TableName.RECEIPT_URL)
+            await self.db.create_many(urls)
+
+        return stored_receipt(receipt, urls, self.logger)
@@ -0,0 +1,189 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+from src.adapters.db.postgresql import PostgreSQLAdapter, get_pool
+from src.helpers.bloom import BloomFilter
+from src.schemas.common import TableName
+
+MIN_CAPACITY = 1024
+# room for inserts until the next rebuild; a full filter triggers one
+CAPACITY_HEADROOM = 2
+
+
+class ReceiptUrlFilter:
+    """
+    Bloom filter over receipt_url ids (URL hashes), so get-by-url can answer most
+    misses without a database query.
+
+    A miss is only exact when this process stores every receipt URL, i.e. in a
+    single-process deployment: URLs stored by other processes only reach the filter
+    on its next build. Each build checks that the table grew by no more than the
+    URLs added here since the previous one; if it grew by more, another process is
+    writing and the filter stops answering misses for good.
+
+    Until the first build finishes every URL is reported as possibly present and
+    lookups fall through to the database. Once the filter is older than ``max_age``
+    seconds it is rebuilt in the background and lookups fall through to the database
+    again until the rebuild finishes.
+    """
+
+    def __init__(
+        self,
+        fp_rate: float = 0.01,
+        logger=None,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fp_rate = fp_rate
+        self.logger = logger or logging.getLogger("pbapi")
+        self.max_age = max_age
+        self.builds = 0
+        # False once a build has seen URLs stored by another process
+        self.exact = True
+        self._clock = clock
+        self._bloom: BloomFilter | None = None
+        # when the scan behind the current filter started
+        self._built_at = 0.0
+        # ids added while a build is running, None when no build is running
+        self._pending: list[str] | None = None
+        # ids added so far, and the row count of the last build along with the
+        # ids added before it was taken
+        self._added = 0
+        self._count: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    @property
+    def stale(self) -> bool:
+        return self._clock() - self._built_at > self.max_age
+
+    def might_contain(self, url_hash: str) -> bool:
+        bloom = self._bloom
+        if bloom is None or not self.exact:
+            return True
+        if self.stale:
+            self.start_build()
+            return True
+        return url_hash in bloom
+
+    def add(self, url_hashes: Iterable[str]) -> None:
+        url_hashes = list(url_hashes)
+        with self._lock:
+            self._added += len(url_hashes)
+            if self._pending is not None:
+                self._pending.extend(url_hashes)
+            bloom = self._bloom
+
+        if bloom is None:
+            return
+        for url_hash in url_hashes:
+            bloom.add(url_hash)
+        if len(bloom) > bloom.capacity:
+            self.start_build()
+
+    def build(self) -> bool:
+        """Rebuild in the calling thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        self._build()
+        return True
+
+    def start_build(self) -> bool:
+        """Rebuild in a background thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        threading.Thread(
+            target=self._build_in_background, name="receipt-url-filter", daemon=True
+        ).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        bloom = self._bloom
+        return {
+            "ready": bloom is not None,
+            "building": self._pending is not None,
+            "builds": self.builds,
+            "exact": self.exact,
+            "age": round(self._clock() - self._built_at, 1) if bloom else None,
+            **(bloom.stats() if bloom else {"fp_rate": self.fp_rate}),
+        }
+
+    def _begin_build(self) -> bool:
+        with self._lock:
+            if self._pending is not None:
+                return False
+            self._pending = []
+            return True
+
+    def _build(self) -> None:
+        started_at = self._clock()
+        try:
+            with PostgreSQLAdapter(self.logger, pool=get_pool()) as db:
+                db.use_table(TableName.RECEIPT_URL)
+                with self._lock:
+                    added = self._added
+                count = db.count()
+                capacity = max(MIN_CAPACITY, CAPACITY_HEADROOM * count)
+                bloom = BloomFilter(capacity, self.fp_rate)
+                for url_hash in db.iter_ids():
+                    bloom.add(url_hash)
+
+            with self._lock:
+                for url_hash in self._pending:
+                    bloom.add(url_hash)
+                self._bloom = bloom
+                self._built_at = started_at
+                self.builds += 1
+                # checked after the scan, so ids stored here before the count have
+                # been added by now
+                previous, self._count = self._count, (count, added)
+                unknown = 0
+                if previous is not None:
+                    unknown = count - previous[0] - (self._added - previous[1])
+            self.logger.info("receipt url filter built: %s urls", len(bloom))
+            if unknown > 0 and self.exact:
+                self.exact = False
+                self.logger.error(
+                    "receipt url filter disabled: %s urls stored by other processes",
+                    unknown,
+                )
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def _build_in_background(self) -> None:
+        try:
+            self._build()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.error("receipt url filter build failed: %s", e)
+
+
+_url_filter: ReceiptUrlFilter | None = None  # pylint: disable=invalid-name
+_url_filter_lock = threading.Lock()
+
+
+def get_receipt_url_filter() -> ReceiptUrlFilter | None:
+    """
+    The process-wide filter, or None unless RECEIPT_URL_FILTER_ENABLED is set, which
+    is meant for single-process deployments only (see ReceiptUrlFilter). The first
+    call starts the initial build in the background.
+    """
+    global _url_filter  # pylint: disable=global-statement
+
+    if os.environ.get("RECEIPT_URL_FILTER_ENABLED", "").lower() not in ("1", "true"):
+        return None
+
+    with _url_filter_lock:
+        if _url_filter is None:
+            _url_filter = ReceiptUrlFilter(
+                fp_rate=float(os.environ.get("RECEIPT_URL_FILTER_FP_RATE", "0.01")),
+                max_age=float(os.environ.get("RECEIPT_URL_FILTER_MAX_AGE", "300")),
+            )
+            _url_filter.start_build()
+        return _url_filter
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.adapters.db.postgresql import PostgreSQLAdapter, get_pool
+from src.helpers.spatial import GridIndex
+from src.schemas.common import TableName
+
+
+def shop_coordinates(shop: Dict[str, Any]) -> Tuple[float, float] | None:
+    """(lat, lon) of a shop row, from the lat/lon columns or else from osm_data."""
+    if shop.get("lat") is not None and shop.get("lon") is not None:
+        return float(shop["lat"]), float(shop["lon"])
+
+    osm_data = shop.get("osm_data") or {}
+    try:
+        return float(osm_data["lat"]), float(osm_data["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ShopIndex:
+    """
+    In-memory spatial index over the shop table, so bounding-box and proximity
+    queries don't go to the database.
+
+    Shops without coordinates are skipped. Shops created by this process are added
+    as they are created; others show up on the next build. A query against an index
+    older than ``max_age`` seconds starts a rebuild in the background, so results
+    trail the table by at most ``max_age`` plus one build.
+    """
+
+    def __init__(
+        self,
+        cell_deg: float = 0.01,
+        logger=None,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cell_deg = cell_deg
+        self.logger = logger or logging.getLogger("pbapi")
+        self.max_age = max_age
+        self.builds = 0
+        self._clock = clock
+        self._grid: GridIndex | None = None
+        # when the scan behind the current index started
+        self._built_at = 0.0
+        self._shops: Dict[Any, Dict[str, Any]] = {}
+        # shops added while a build is running, None when no build is running
+        self._pending: List[Dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def stale(self) -> bool:
+        return self._clock() - self._built_at > self.max_age
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def add(self, shop: Dict[str, Any]) -> None:
+        """Index a newly created shop, or move an existing one."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(shop)
+            if self._grid is not None:
+                self._index(self._grid, self._shops, shop)
+
+    def bbox(
+        self, lat_min: float, lat_max: float, lon_min: float, lon_max: float
+    ) -> List[Dict[str, Any]]:
+        """Shops inside the box, ordered by id."""
+        grid, shops = self._grid, self._shops
+        if grid is None:
+            return []
+        self._rebuild_if_stale()
+        ids = grid.bbox(lat_min, lat_max, lon_min, lon_max)
+        return [shops[_id] for _id in sorted(ids)]
+
+    def nearby(
+        self, lat: float, lon: float, limit: int = 10, radius_m: float | None = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to limit shops nearest to (lat, lon), nearest first, each with its
+        distance_m. With radius_m only shops within that distance are returned.
+        """
+        grid, shops = self._grid, self._shops
+        if grid is None:
+            return []
+        self._rebuild_if_stale()
+        if radius_m is None:
+            found = grid.nearest(lat, lon, limit)
+        else:
+            found = grid.within(lat, lon, radius_m)[:limit]
+        return [
+            {**shops[_id], "distance_m": round(distance, 1)} for _id, distance in found
+        ]
+
+    def build(self) -> bool:
+        """Rebuild in the calling thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        self._build()
+        return True
+
+    def start_build(self) -> bool:
+        """Rebuild in a background thread. Returns False if a build is already running."""
+        if not self._begin_build():
+            return False
+        threading.Thread(
+            target=self._build_in_background, name="shop-index", daemon=True
+        ).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        grid = self._grid
+        return {
+            "ready": self.ready,
+            "building": self._pending is not None,
+            "builds": self.builds,
+            "age": round(self._clock() - self._built_at, 1) if grid else None,
+            "cell_deg": self.cell_deg,
+            "shops": len(grid) if grid is not None else 0,
+        }
+
+    @staticmethod
+    def _index(grid: GridIndex, shops: Dict[Any, Dict[str, Any]], shop) -> None:
+        coordinates = shop_coordinates(shop)
+        if shop.get("id") is None or coordinates is None:
+            return
+        grid.insert(shop["id"], *coordinates)
+        shops[shop["id"]] = shop
+
+    def _rebuild_if_stale(self) -> None:
+        if self.stale:
+            self.start_build()
+
+    def _begin_build(self) -> bool:
+        with self._lock:
+            if self._pending is not None:
+                return False
+            self._pending = []
+            return True
+
+    def _build(self) -> None:
+        started_at = self._clock()
+        try:
+            grid, shops = GridIndex(self.cell_deg), {}
+            with PostgreSQLAdapter(self.logger, pool=get_pool()) as db:
+                db.use_table(TableName.SHOP)
+                for shop in db.iter_many():
+                    self._index(grid, shops, shop)
+
+            with self._lock:
+                for shop in self._pending:
+                    self._index(grid, shops, shop)
+                self._grid, self._shops = grid, shops
+                self._built_at = started_at
+                self.builds += 1
+            self._ready.set()
+            self.logger.info("shop index built: %s shops", len(grid))
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def _build_in_background(self) -> None:
+        try:
+            self._build()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.error("shop index build failed: %s", e)
+
+
+_shop_index: ShopIndex | None = None  # pylint: disable=invalid-name
+_shop_index_lock = threading.Lock()
+
+
+def get_shop_index() -> ShopIndex:
+    """
+    The process-wide shop index. The first call starts the initial build in the
+    background; SHOP_INDEX_CELL_DEG sets the grid cell size in degrees and
+    SHOP_INDEX_MAX_AGE the seconds after which a query triggers a rebuild.
+    """
+    global _shop_index  # pylint: disable=global-statement
+
+    with _shop_index_lock:
+        if _shop_index is None:
+            _shop_index = ShopIndex(
+                cell_deg=float(os.environ.get("SHOP_INDEX_CELL_DEG", "0.01")),
+                max_age=float(os.environ.get("SHOP_INDEX_MAX_AGE", "300")),
+            )
+            _shop_index.start_build()
+        return _shop_index
+
+
+def index_shop(shop: Dict[str, Any]) -> None:
+    """Add a newly created shop to the process-wide index, if there is one."""
+    if _shop_index is not None:
+        _shop_index.add(shop)
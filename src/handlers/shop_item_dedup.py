@@ -0,0 +1,137 @@
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List
+
+from src.adapters.db.base import BaseDBAdapter
+from src.helpers.cache import LRUCache
+from src.helpers.item_names import normalize_item_name, split_quantities
+from src.helpers.minhash import MinHashLSH
+from src.schemas.common import TableName
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    return item.get("normalized_name") or normalize_item_name(item["name"])
+
+
+def duplicate_groups(
+    items: Iterable[Dict[str, Any]], threshold: float = 0.7
+) -> List[List[Dict[str, Any]]]:
+    """
+    Groups of near-duplicate shop items, compared by normalized name. Items with
+    different quantities are never grouped. Items are expected to belong to one
+    shop; groups and their items keep input order.
+    """
+    lsh = MinHashLSH(threshold)
+    items_by_id: Dict[str, Dict[str, Any]] = {}
+    parent: Dict[str, str] = {}
+    quantities: Dict[str, tuple] = {}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for item in items:
+        key = str(item["id"])
+        words, quantities[key] = split_quantities(item_key(item))
+        items_by_id[key] = item
+        parent[key] = key
+        for other, _ in lsh.insert(key, words):
+            if quantities[other] == quantities[key]:
+                parent[find(other)] = find(key)
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for key, item in items_by_id.items():
+        groups.setdefault(find(key), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+class ShopItemDeduplicator:
+    """
+    Insert-time check for near-duplicate shop item names.
+
+    One index per shop is built from its items on first use and kept in an LRU
+    cache; items added through add() are indexed as they are created. Builds hold
+    a lock of their shop only, so other shops are served meanwhile.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        max_shops: int = 64,
+        ttl: float = 3600.0,
+        logger=None,
+    ):
+        self.threshold = threshold
+        self.logger = logger or logging.getLogger("pbapi")
+        self._indexes = LRUCache(max_size=max_shops, ttl=ttl)
+        self._lock = threading.Lock()
+        self._shop_locks: Dict[str, threading.Lock] = {}
+
+    def find(self, db: BaseDBAdapter, shop_id: Any, name: str) -> List[Dict[str, Any]]:
+        """
+        Indexed items of the shop with a name near name and the same quantities,
+        most similar first.
+        """
+        lsh, items = self._index(db, shop_id)
+        words, quantities = split_quantities(normalize_item_name(name))
+        return [
+            {**items[key], "similarity": round(similarity, 3)}
+            for key, similarity in lsh.query(words)
+            if split_quantities(item_key(items[key]))[1] == quantities
+        ]
+
+    def add(self, shop_id: Any, item: Dict[str, Any]) -> None:
+        """Index a newly created item; no-op until the shop's index is built."""
+        index = self._indexes.get(str(shop_id))
+        if index is not None:
+            lsh, items = index
+            items[str(item["id"])] = item
+            lsh.add(str(item["id"]), split_quantities(item_key(item))[0])
+
+    def _index(self, db: BaseDBAdapter, shop_id: Any):
+        index = self._indexes.get(str(shop_id))
+        if index is not None:
+            return index
+
+        # a cold shop only blocks requests for that shop; the scan runs outside
+        # self._lock, which only guards the per-shop locks
+        with self._shop_lock(shop_id):
+            index = self._indexes.get(str(shop_id))
+            if index is None:
+                lsh, items = MinHashLSH(self.threshold), {}
+                db.use_table(TableName.SHOP_ITEM)
+                for item in db.iter_many({"shop_id": shop_id}):
+                    items[str(item["id"])] = item
+                    lsh.add(str(item["id"]), split_quantities(item_key(item))[0])
+                index = (lsh, items)
+                self._indexes.set(str(shop_id), index)
+                self.logger.info(
+                    "shop %s item index built: %s items", shop_id, len(lsh)
+                )
+            return index
+
+    def _shop_lock(self, shop_id: Any) -> threading.Lock:
+        with self._lock:
+            return self._shop_locks.setdefault(str(shop_id), threading.Lock())
+
+
+_deduplicator: ShopItemDeduplicator | None = None  # pylint: disable=invalid-name
+_deduplicator_lock = threading.Lock()
+
+
+def get_shop_item_deduplicator() -> ShopItemDeduplicator:
+    """
+    The process-wide deduplicator. SHOP_ITEM_DEDUP_THRESHOLD sets the name
+    similarity (Jaccard of character trigrams) above which items are duplicates.
+    """
+    global _deduplicator  # pylint: disable=global-statement
+
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            _deduplicator = ShopItemDeduplicator(
+                threshold=float(os.environ.get("SHOP_ITEM_DEDUP_THRESHOLD", "0.7"))
+            )
+        return _deduplicator
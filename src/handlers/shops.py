@@ -1,9 +1,10 @@
-import os
 from http import HTTPStatus
 from typing import Any
 
-from src.adapters.db.postgresql import PostgreSQLAdapter
-from src.schemas.common import EnvType, TableName
+from src.adapters.db.base import InvalidCursorError, decode_cursor, encode_cursor
+from src.adapters.db.postgresql import init_db_session
+from src.handlers.shop_index import get_shop_index
+from src.schemas.common import Operator, TableName
 
 # Chisinau area approximate bounding box
 CHISINAU_LAT_MIN = 46.95
@@ -12,12 +13,6 @@ CHISINAU_LON_MIN = 28.77
 CHISINAU_LON_MAX = 28.90
 
 
-def init_postgres_session(logger):
-    """Initialize PostgreSQL database session."""
-    env_name = os.environ.get("ENV_NAME", "local")
-    return PostgreSQLAdapter(EnvType(env_name), logger)
-
-
 def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dict]:
     """
     Get shops with optional filtering by query parameters.
@@ -27,11 +22,9 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
     - company_id: filter by company ID
     - lat_min, lat_max, lon_min, lon_max: bounding box for location (optional)
     - limit: max number of results (default 50)
-    - offset: pagination offset (default 0)
+    - cursor: next_cursor of the previous page; pages by id without an offset
+    - offset: pagination offset (default 0), ignored when a cursor is given
     """
-    session = init_postgres_session(logger)
-    session.use_table(TableName.SHOP)
-
     # Build where clause from query params
     where = {}
 
@@ -44,54 +37,107 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
     # Get limit and offset
     try:
         limit = int(query_params.get("limit", 50))
-        limit = min(limit, 100)  # Cap at 100
+        limit = max(min(limit, 100), 1)  # Cap at 100
     except (ValueError, TypeError):
         limit = 50
 
     try:
-        offset = int(query_params.get("offset", 0))
+        offset = max(int(query_params.get("offset", 0)), 0)
     except (ValueError, TypeError):
         offset = 0
 
-    # Check if location filtering is requested
-    has_location_filter = any(
-        key in query_params for key in ["lat_min", "lat_max", "lon_min", "lon_max"]
-    )
-
-    # Read shops from database
-    shops = session.read_many(where if where else None, limit=limit + offset)
-
     # Apply location filter only if explicitly requested
-    if has_location_filter:
+    bbox = None
+    if any(key in query_params for key in ["lat_min", "lat_max", "lon_min", "lon_max"]):
         try:
-            lat_min = float(query_params.get("lat_min", CHISINAU_LAT_MIN))
-            lat_max = float(query_params.get("lat_max", CHISINAU_LAT_MAX))
-            lon_min = float(query_params.get("lon_min", CHISINAU_LON_MIN))
-            lon_max = float(query_params.get("lon_max", CHISINAU_LON_MAX))
+            bbox = (
+                float(query_params.get("lat_min", CHISINAU_LAT_MIN)),
+                float(query_params.get("lat_max", CHISINAU_LAT_MAX)),
+                float(query_params.get("lon_min", CHISINAU_LON_MIN)),
+                float(query_params.get("lon_max", CHISINAU_LON_MAX)),
+            )
         except (ValueError, TypeError):
-            lat_min, lat_max = CHISINAU_LAT_MIN, CHISINAU_LAT_MAX
-            lon_min, lon_max = CHISINAU_LON_MIN, CHISINAU_LON_MAX
-
-        filtered_shops = []
-        for shop in shops:
-            osm_data = shop.get("osm_data", {})
-            if osm_data:
-                try:
-                    lat = float(osm_data.get("lat", 0))
-                    lon = float(osm_data.get("lon", 0))
-                    if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
-                        filtered_shops.append(shop)
-                except (ValueError, TypeError):
-                    continue
-        shops = filtered_shops
-
-    # Apply offset and limit
-    total = len(shops)
-    result_shops = shops[offset : offset + limit]
+            bbox = (
+                CHISINAU_LAT_MIN,
+                CHISINAU_LAT_MAX,
+                CHISINAU_LON_MIN,
+                CHISINAU_LON_MAX,
+            )
+
+    cursor = query_params.get("cursor")
+    try:
+        after_id = _cursor_id(cursor) if cursor is not None else None
+        shop_index = get_shop_index() if bbox else None
+        if shop_index and shop_index.ready:
+            total, shops, next_cursor = _page_from_index(
+                shop_index.bbox(*bbox), where, limit, offset, after_id
+            )
+        else:
+            if bbox:
+                # shop.lat / shop.lon are kept in sync with osm_data and indexed
+                where["lat"] = (Operator.BETWEEN, bbox[:2])
+                where["lon"] = (Operator.BETWEEN, bbox[2:])
+            total, shops, next_cursor = _page_from_db(
+                where, limit, offset, cursor, logger
+            )
+    except InvalidCursorError:
+        return HTTPStatus.BAD_REQUEST, {"msg": "Invalid cursor"}
 
     return HTTPStatus.OK, {
-        "items": result_shops,
+        "items": shops,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
+
+
+def _cursor_id(cursor: str) -> int:
+    """The shop id a cursor continues after; shop pages are keyed by id alone."""
+    values = decode_cursor(cursor)
+    if len(values) != 1:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    value = values[0]
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return value
+
+
+def _page_from_index(
+    shops: list[dict], where: dict, limit: int, offset: int, after_id: int | None
+) -> tuple[int, list[dict], str | None]:
+    shops = [
+        shop
+        for shop in shops
+        if all(shop.get(key) == value for key, value in where.items())
+    ]
+    total = len(shops)
+    if after_id is not None:
+        shops = [shop for shop in shops if shop["id"] > after_id]
+    else:
+        shops = shops[offset:]
+
+    next_cursor = (
+        encode_cursor([shops[limit - 1]["id"]]) if len(shops) > limit else None
+    )
+    return total, shops[:limit], next_cursor
+
+
+def _page_from_db(
+    where: dict, limit: int, offset: int, cursor: str | None, logger
+) -> tuple[int, list[dict], str | None]:
+    with init_db_session(logger) as session:
+        session.use_table(TableName.SHOP)
+        total = session.count(where)
+        if cursor is not None or not offset:
+            page = session.read_page(where, limit=limit, order_by="id", after=cursor)
+            return total, page.items, page.next_cursor
+
+        # legacy offset paging, later pages get slower; prefer the cursor
+        shops = (
+            session.read_many(where, limit=limit, offset=offset, order_by="id")
+            if offset < total
+            else []
+        )
+        more = offset + len(shops) < total
+        return total, shops, encode_cursor([shops[-1]["id"]]) if more else None
@@ -4,16 +4,39 @@ from uuid import UUID
 from pydantic import EmailStr
 
 from src.adapters.db.postgresql import PostgreSQLAdapter, init_db_session
+from src.adapters.db.postgresql_async import (
+    AsyncPostgreSQLAdapter,
+    init_async_db_session,
+)
 from src.schemas.common import TableName
 from src.schemas.user import User
 from src.schemas.user_identity import UserIdentity, IdentityProvider
 
 
+def identity_where(_id: str, provider: str) -> dict:
+    return {"id": _id, "provider": provider}
+
+
+def identity_update(identity: UserIdentity) -> tuple[dict, dict]:
+    """(where, data) updating the identity's row."""
+    data = identity.model_dump(mode="json")
+    return identity_where(data.pop("id"), data.pop("provider")), data
+
+
+def new_identity(_id: str, provider: str, user_id: str) -> UserIdentity:
+    return UserIdentity(
+        id=_id, provider=IdentityProvider(provider), user_id=UUID(user_id)
+    )
+
+
 class UserIdentityHandler:
     def __init__(self, logger):
         self.logger = logger
         self.db: PostgreSQLAdapter = init_db_session(self.logger)
 
+    def close(self) -> None:
+        self.db.close()
+
     def find(self, _id: str, provider: str) -> Optional[UserIdentity]:
         """
         Find a UserIdentity by its id and provider.
@@ -21,12 +44,8 @@ class UserIdentityHandler:
         self.logger.info(f"Finding user identity: {_id} for provider: {provider}")
 
         self.db.use_table(TableName.USER_IDENTITY)
-        data = self.db.read_many({"id": _id, "provider": provider}, limit=1)
-
-        if not data:
-            return None
-
-        return UserIdentity(**data[0])
+        data = self.db.read_many(identity_where(_id, provider), limit=1)
+        return UserIdentity.from_row(data[0]) if data else None
 
     def create(self, identity: UserIdentity) -> str:
         self.logger.info(
@@ -34,8 +53,7 @@ class UserIdentityHandler:
         )
 
         self.db.use_table(TableName.USER_IDENTITY)
-        data = identity.model_dump(mode="json")
-        return self.db.create_one(data)
+        return self.db.create_one(identity.model_dump(mode="json"))
 
     def update(self, identity: UserIdentity) -> bool:
         self.logger.info(
@@ -43,10 +61,7 @@ class UserIdentityHandler:
         )
 
         self.db.use_table(TableName.USER_IDENTITY)
-        data = identity.model_dump(mode="json")
-        _id = data.pop("id")
-        provider = data.pop("provider")
-        return self.db.update_one_by({"id": _id, "provider": provider}, data)
+        return self.db.update_one_by(*identity_update(identity))
 
     def get_or_create_user_by_identity(
         self, _id: str, provider: str, email: Optional[EmailStr], name: str
@@ -57,7 +72,7 @@ class UserIdentityHandler:
             self.logger.info(f"Found existing identity for user: {identity.user_id}")
 
             self.db.use_table(TableName.USER)
-            return User(**self.db.read_one(str(identity.user_id)))
+            return User.from_row(self.db.read_one(str(identity.user_id)))
 
         self.logger.info(
             f"Identity not found. Creating new user for {provider} id {_id}"
@@ -69,9 +84,66 @@ class UserIdentityHandler:
         new_user.id = UUID(user_id)
 
         self.logger.info(f"Creating new identity for user: {user_id}")
-        new_identity = UserIdentity(
-            id=_id, provider=IdentityProvider(provider), user_id=UUID(user_id)
+        self.create(new_identity(_id, provider, user_id))
+
+        return new_user
+
+
+class AsyncUserIdentityHandler:
+    def __init__(self, logger):
+        self.logger = logger
+        self.db: AsyncPostgreSQLAdapter = init_async_db_session(self.logger)
+
+    async def close(self) -> None:
+        await self.db.close()
+
+    async def find(self, _id: str, provider: str) -> Optional[UserIdentity]:
+        """
+        Find a UserIdentity by its id and provider.
+        """
+        self.logger.info(f"Finding user identity: {_id} for provider: {provider}")
+
+        self.db.use_table(TableName.USER_IDENTITY)
+        data = await self.db.read_many(identity_where(_id, provider), limit=1)
+        return UserIdentity.from_row(data[0]) if data else None
+
+    async def create(self, identity: UserIdentity) -> str:
+        self.logger.info(
+            f"Creating user identity: {identity.id} for provider: {identity.provider}"
         )
-        self.create(new_identity)
+
+        self.db.use_table(TableName.USER_IDENTITY)
+        return await self.db.create_one(identity.model_dump(mode="json"))
+
+    async def update(self, identity: UserIdentity) -> bool:
+        self.logger.info(
+            f"Updating user identity: {identity.id} for provider: {identity.provider}"
+        )
+
+        self.db.use_table(TableName.USER_IDENTITY)
+        return await self.db.update_one_by(*identity_update(identity))
+
+    async def get_or_create_user_by_identity(
+        self, _id: str, provider: str, email: Optional[EmailStr], name: str
+    ) -> User:
+        identity = await self.find(_id, provider)
+
+        if identity:
+            self.logger.info(f"Found existing identity for user: {identity.user_id}")
+
+            self.db.use_table(TableName.USER)
+            return User.from_row(await self.db.read_one(str(identity.user_id)))
+
+        self.logger.info(
+            f"Identity not found. Creating new user for {provider} id {_id}"
+        )
+
+        self.db.use_table(TableName.USER)
+        new_user = User(email=email, name=name)
+        user_id = await self.db.create_one(new_user.model_dump(mode="json"))
+        new_user.id = UUID(user_id)
+
+        self.logger.info(f"Creating new identity for user: {user_id}")
+        await self.create(new_identity(_id, provider, user_id))
 
         return new_user
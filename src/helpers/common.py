@@ -2,8 +2,6 @@ import hashlib
 import os
 from itertools import groupby
 
-import requests
-
 
 def get_templates_dir() -> str:
     return os.path.join("src", "static", "templates")
@@ -20,6 +18,9 @@ def split_list(lst, delimiter) -> list[list]:
 
 
 def get_html(url: str, logger) -> str | None:
+    # only scraping needs requests, keep it out of every cold start
+    import requests  # pylint: disable=import-outside-toplevel
+
     # temporary - return stub for testing
     if url == "https://mev.sfs.md/receipt-verifier/95F2415429F169F017CCA8AF6B8B76D4":
         stub_path = os.path.join(
@@ -97,3 +98,15 @@ def is_localhost() -> bool:
 
 def make_hash(url: str) -> str:
     return hashlib.md5(url.strip().encode("utf-8")).hexdigest()
+
+
+class LazyStr:
+    """Log argument whose text is computed only when the record is formatted."""
+
+    __slots__ = ("func",)
+
+    def __init__(self, func):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
@@ -0,0 +1,141 @@
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+# receipt lines repeat a lot, ITEM_NAME_CACHE_SIZE bounds the memoized names
+ITEM_NAME_CACHE_SIZE = int(os.environ.get("ITEM_NAME_CACHE_SIZE", "8192"))
+
+TOKEN_RE = re.compile(r"\d+(?:[.,]\d+)?%?|[^\W\d_]+")
+
+# units as printed on sfs.md receipts, Romanian and Russian, after case folding,
+# to the spelling quantities are normalized to
+UNITS = {
+    "g": "g", "gr": "g", "г": "g", "гр": "g",
+    "kg": "kg", "кг": "kg",
+    "mg": "mg", "мг": "mg",
+    "l": "l", "л": "l",
+    "ml": "ml", "мл": "ml",
+    "cl": "cl",
+    "buc": "pcs", "pcs": "pcs", "pc": "pcs", "bc": "pcs", "шт": "pcs",
+}  # fmt: skip
+# multipack markers: "6X", "X6", "6Х" (Cyrillic ha)
+PACK_MARKERS = frozenset({"x", "х"})
+
+# common receipt abbreviations, keyed by the token without its trailing dot
+ABBREVIATIONS = {
+    # Romanian
+    "baut": "bautura",
+    "bisc": "biscuiti",
+    "bomb": "bomboane",
+    "cioc": "ciocolata",
+    "ciocol": "ciocolata",
+    "crem": "crema",
+    "nat": "natural",
+    "veg": "vegetal",
+    # Russian
+    "йог": "йогурт",
+    "конф": "конфеты",
+    "мол": "молоко",
+    "нап": "напиток",
+    "печ": "печенье",
+    "раст": "растительный",
+    "шок": "шоколад",
+}
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    Drop accents from Latin letters (ă, â, î, ș, ş, ț, ţ, ...) and fold ё to е.
+    Other Cyrillic letters keep their marks, й is a letter of its own.
+    """
+    folded = []
+    for char in unicodedata.normalize("NFD", text):
+        if unicodedata.combining(char) and folded and folded[-1] < "ɐ":
+            continue
+        folded.append(char)
+    return unicodedata.normalize("NFC", "".join(folded)).replace("ё", "е")
+
+
+def canonical_number(number: str) -> str:
+    """One spelling per amount: "0,50" -> "0.5", "1.0" -> "1"."""
+    number = number.replace(",", ".")
+    if "." in number:
+        number = number.rstrip("0").rstrip(".")
+    return number
+
+
+def _quantities(tokens: list[str]) -> list[tuple[str, str]]:
+    """
+    (kind, text) per token, with amounts and their units merged into one
+    quantity: "word", "number", "quantity", "percent" or "pack" (a pack marker).
+    """
+    merged = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if token.endswith("%"):
+            merged.append(("percent", canonical_number(token[:-1]) + "%"))
+        elif token[0].isdigit() and following in UNITS:
+            merged.append(("quantity", canonical_number(token) + UNITS[following]))
+            i += 1
+        elif token[0].isdigit():
+            merged.append(("number", canonical_number(token)))
+        elif token in PACK_MARKERS:
+            merged.append(("pack", "x"))
+        else:
+            merged.append(("word", ABBREVIATIONS.get(token, token)))
+        i += 1
+    return merged
+
+
+@lru_cache(maxsize=ITEM_NAME_CACHE_SIZE)
+def normalize_item_name(name: str) -> str:
+    """
+    Key for matching receipt lines to shop items: case and diacritics folded,
+    common abbreviations expanded and quantities spelled one way, with the pack
+    count first, e.g. "COCA-COLA 0,33 L X6" -> "coca cola 6x0.33l". Quantities are
+    kept, they tell "PEPSI 0.5L" from "PEPSI 1.5L".
+    """
+    parts = _quantities(TOKEN_RE.findall(fold_diacritics(name.casefold())))
+
+    words = []
+    i = 0
+    while i < len(parts):
+        kind, text = parts[i]
+        following = parts[i + 1] if i + 1 < len(parts) else ("", "")
+        after = parts[i + 2] if i + 2 < len(parts) else ("", "")
+        if kind == "number" and following[0] == "pack":
+            if after[0] in ("quantity", "number"):
+                # "6X1L", "6 X 0.5"
+                words.append(f"{text}x{after[1]}")
+                i += 3
+            else:
+                # "OUA 10X"
+                words.append(f"{text}x")
+                i += 2
+            continue
+        if kind == "pack" and following[0] == "number":
+            if words and parts[i - 1][0] == "quantity":
+                # "0.33L X6"
+                words[-1] = f"{following[1]}x{words[-1]}"
+            else:
+                words.append(f"{following[1]}x")
+            i += 2
+            continue
+        words.append(text)
+        i += 1
+    return " ".join(words)
+
+
+def split_quantities(normalized_name: str) -> tuple[str, tuple[str, ...]]:
+    """
+    (words, quantities) of a normalized name, e.g. "lapte 2.5% 1l" ->
+    ("lapte", ("2.5%", "1l")). Similar names are compared by their words; names
+    whose quantities differ are different products however similar they read.
+    """
+    words, quantities = [], []
+    for word in normalized_name.split():
+        (quantities if word[0].isdigit() else words).append(word)
+    return " ".join(words), tuple(quantities)
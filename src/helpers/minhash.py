@@ -0,0 +1,170 @@
+import hashlib
+import random
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+# prime modulus of the (a * h + b) permutations over gram hashes
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def ngrams(text: str, n: int = 3) -> Set[str]:
+    """Character n-grams of text, padded so short words still produce some."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_bands(
+    threshold: float, num_perm: int, fn_weight: float = 0.9
+) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm minimizing the weighted chance of
+    missing pairs above threshold and of proposing pairs below it. Misses weigh
+    more: proposed pairs are checked exactly anyway, they only cost time.
+    """
+
+    def candidate(similarity: float, bands: int, rows: int) -> float:
+        return 1 - (1 - similarity**rows) ** bands
+
+    def error(br: Tuple[int, int]) -> float:
+        steps = 100
+        false_positive = sum(
+            candidate(threshold * i / steps, *br) for i in range(steps)
+        ) * (threshold / steps)
+        false_negative = sum(
+            1 - candidate(threshold + (1 - threshold) * i / steps, *br)
+            for i in range(steps)
+        ) * ((1 - threshold) / steps)
+        return (1 - fn_weight) * false_positive + fn_weight * false_negative
+
+    return min(
+        ((b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0),
+        key=error,
+    )
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over short texts by Jaccard similarity of their
+    character n-grams.
+
+    Each text gets a MinHash signature, split into bands; texts sharing any band
+    are candidates, and only candidates are compared exactly. Finding the
+    duplicates of one text costs about the number of its true neighbours, not
+    the size of the index, so nothing is compared pairwise.
+    """
+
+    def __init__(
+        self, threshold: float = 0.7, num_perm: int = 64, n: int = 3, seed: int = 1
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.n = n
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        rng = random.Random(seed)
+        # (a * h + b) mod p per "permutation", a and b drawn independently
+        self._permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[Hashable]] = defaultdict(
+            set
+        )
+        self._keys: Dict[Hashable, Tuple[Set[str], List[Tuple[int, ...]]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def _signature(self, grams: Set[str]) -> List[int]:
+        hashes = [
+            int.from_bytes(
+                hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            for gram in grams
+        ]
+        return [
+            min([(a * h + b) % MERSENNE_PRIME for h in hashes])
+            for a, b in self._permutations
+        ]
+
+    def _bands(self, grams: Set[str]) -> List[Tuple[int, ...]]:
+        signature = self._signature(grams)
+        return [
+            tuple(signature[band * self.rows : (band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index a text, replacing any previous text for the key."""
+        grams = ngrams(text, self.n)
+        self._add(key, grams, self._bands(grams))
+
+    def query(self, text: str) -> List[Tuple[Hashable, float]]:
+        """(key, similarity) of indexed texts at least threshold similar, best first."""
+        grams = ngrams(text, self.n)
+        return self._query(grams, self._bands(grams))
+
+    def insert(self, key: Hashable, text: str) -> List[Tuple[Hashable, float]]:
+        """query() then add(), hashing the text once."""
+        grams = ngrams(text, self.n)
+        bands = self._bands(grams)
+        found = self._query(grams, bands)
+        self._add(key, grams, bands)
+        return [(other, similarity) for other, similarity in found if other != key]
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def _add(self, key: Hashable, grams: Set[str], bands: List[Tuple[int, ...]]):
+        with self._lock:
+            self._remove(key)
+            self._keys[key] = (grams, bands)
+            for band, values in enumerate(bands):
+                self._buckets[(band, values)].add(key)
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._keys.pop(key, None)
+        if entry is None:
+            return False
+        for band, values in enumerate(entry[1]):
+            bucket = self._buckets[(band, values)]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[(band, values)]
+        return True
+
+    def _query(
+        self, grams: Set[str], bands: List[Tuple[int, ...]]
+    ) -> List[Tuple[Hashable, float]]:
+        with self._lock:
+            candidates = set().union(
+                *(
+                    self._buckets.get((band, values), ())
+                    for band, values in enumerate(bands)
+                )
+            )
+            entries = [(key, self._keys[key][0]) for key in candidates]
+
+        found = []
+        for key, other in entries:
+            similarity = jaccard(grams, other)
+            if similarity >= self.threshold:
+                found.append((key, similarity))
+        found.sort(key=lambda item: (-item[1], str(item[0])))
+        return found
@@ -0,0 +1,170 @@
+import math
+import threading
+from typing import Any, Dict, Hashable, List, Tuple
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(
+    lat: float, lon: float, radius_m: float
+) -> Tuple[float, float, float, float]:
+    """
+    Smallest lat/lon box (lat_min, lat_max, lon_min, lon_max) containing the circle
+    of radius_m around the point. The box does not wrap around the antimeridian.
+    """
+    angular = radius_m / EARTH_RADIUS_M
+    dlat = math.degrees(angular)
+    lat_min, lat_max = lat - dlat, lat + dlat
+    if lat_min <= -90 or lat_max >= 90 or angular >= math.pi / 2:
+        # the circle contains a pole, every longitude is in range
+        return max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(lat))))
+    return lat_min, lat_max, lon - dlon, lon + dlon
+
+
+class GridIndex:
+    """
+    Points bucketed into a uniform grid of ``cell_deg`` x ``cell_deg`` cells.
+
+    Bounding-box and radius queries only visit the cells that overlap the query,
+    and k-nearest queries search outwards ring by ring, so a query costs about the
+    number of points near the answer rather than the size of the index.
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        if cell_deg <= 0:
+            raise ValueError("cell_deg must be positive")
+
+        self.cell_deg = cell_deg
+        self._points: Dict[Hashable, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def insert(self, key: Hashable, lat: float, lon: float) -> None:
+        """Add a point, or move it if the key is already indexed."""
+        with self._lock:
+            self._remove(key)
+            self._points[key] = (lat, lon)
+            self._cells.setdefault(self._cell(lat, lon), {})[key] = (lat, lon)
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: Hashable) -> bool:
+        point = self._points.pop(key, None)
+        if point is None:
+            return False
+        cell = self._cell(*point)
+        del self._cells[cell][key]
+        if not self._cells[cell]:
+            del self._cells[cell]
+        return True
+
+    def bbox(
+        self, lat_min: float, lat_max: float, lon_min: float, lon_max: float
+    ) -> List[Hashable]:
+        """Keys of the points inside the box, edges included."""
+        return [
+            key
+            for key, (lat, lon) in self._candidates(lat_min, lat_max, lon_min, lon_max)
+            if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+        ]
+
+    def within(
+        self, lat: float, lon: float, radius_m: float
+    ) -> List[Tuple[Any, float]]:
+        """(key, distance in meters) of the points within radius_m, nearest first."""
+        found = []
+        for key, point in self._candidates(*radius_bbox(lat, lon, radius_m)):
+            distance = haversine_m(lat, lon, *point)
+            if distance <= radius_m:
+                found.append((key, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[Any, float]]:
+        """(key, distance in meters) of the k points nearest to (lat, lon)."""
+        if k < 1:
+            return []
+
+        with self._lock:
+            cells = list(self._cells)
+        if not cells:
+            return []
+
+        # grow a square of cells around the point until it holds k points; the
+        # k-th of those bounds the true k-th distance, which within() makes exact
+        i, j = self._cell(lat, lon)
+        candidates = []
+        ring = 0
+        while len(candidates) < k:
+            if (2 * ring + 1) ** 2 > len(cells):
+                # sparse index, checking every point is cheaper than more rings
+                with self._lock:
+                    candidates = list(self._points.items())
+                break
+            candidates.extend(self._ring(i, j, ring))
+            ring += 1
+        if not candidates:
+            return []
+
+        distances = sorted(haversine_m(lat, lon, *point) for _, point in candidates)
+        return self.within(lat, lon, distances[min(k, len(distances)) - 1])[:k]
+
+    def _ring(self, i: int, j: int, ring: int) -> List[Tuple[Any, Tuple[float, float]]]:
+        """Points in the cells at Chebyshev distance ring from cell (i, j)."""
+        found = []
+        with self._lock:
+            for ci in range(i - ring, i + ring + 1):
+                edge = ring == 0 or abs(ci - i) == ring
+                for cj in (
+                    range(j - ring, j + ring + 1) if edge else (j - ring, j + ring)
+                ):
+                    found.extend(self._cells.get((ci, cj), {}).items())
+        return found
+
+    def _candidates(
+        self, lat_min: float, lat_max: float, lon_min: float, lon_max: float
+    ) -> List[Tuple[Any, Tuple[float, float]]]:
+        i_min, j_min = self._cell(lat_min, lon_min)
+        i_max, j_max = self._cell(lat_max, lon_max)
+
+        with self._lock:
+            if (i_max - i_min + 1) * (j_max - j_min + 1) > len(self._cells):
+                # the box spans more cells than are occupied, check those instead
+                cells = [
+                    points
+                    for (ci, cj), points in self._cells.items()
+                    if i_min <= ci <= i_max and j_min <= cj <= j_max
+                ]
+            else:
+                cells = [
+                    self._cells[(ci, cj)]
+                    for ci in range(i_min, i_max + 1)
+                    for cj in range(j_min, j_max + 1)
+                    if (ci, cj) in self._cells
+                ]
+            return [item for points in cells for item in points.items()]
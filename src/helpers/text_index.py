@@ -0,0 +1,99 @@
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple
+
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD_RE.findall(text.casefold())
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of a word padded like pg_trgm does: two spaces before, one after."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def rank(score: float, key: Hashable) -> Tuple[float, str]:
+    return -score, str(key)
+
+
+class InvertedIndex:
+    """
+    Trigram inverted index over short texts (item names) for typo-tolerant search.
+
+    A document matches when at least threshold of the query's trigrams occur in it
+    (like pg_trgm's word_similarity). Its score adds that share to the trigram
+    similarity of the whole text, so closer names rank first; ties go by key.
+    """
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._trigrams: Dict[Hashable, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._trigrams)
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index a document, replacing any previous text for the key."""
+        grams = set().union(*(trigrams(word) for word in tokenize(text)))
+        with self._lock:
+            self._remove(key)
+            self._trigrams[key] = grams
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: Hashable) -> bool:
+        grams = self._trigrams.pop(key, None)
+        if grams is None:
+            return False
+        for gram in grams:
+            self._postings[gram].discard(key)
+            if not self._postings[gram]:
+                del self._postings[gram]
+        return True
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        after: Tuple[float, Any] | None = None,
+        accept: Callable[[Hashable], bool] | None = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Up to limit (key, score) pairs, best first. after is the (score, key) of
+        the last result of the previous page; accept filters keys.
+        """
+        query_grams = set().union(*(trigrams(word) for word in tokenize(query)))
+        if not query_grams or limit < 1:
+            return []
+
+        hits: Dict[Hashable, int] = defaultdict(int)
+        with self._lock:
+            for gram in query_grams:
+                for key in self._postings.get(gram, ()):
+                    hits[key] += 1
+
+        def ranked() -> Iterable[Tuple[float, Hashable]]:
+            for key, count in hits.items():
+                coverage = count / len(query_grams)
+                if coverage < self.threshold or (accept and not accept(key)):
+                    continue
+                # prefer names that are mostly the query over longer ones
+                overlap = count / (len(query_grams) + len(self._trigrams[key]) - count)
+                score = coverage + overlap
+                if after is not None and rank(score, key) <= rank(*after):
+                    continue
+                yield score, key
+
+        best = heapq.nsmallest(limit, ranked(), key=lambda item: rank(*item))
+        return [(key, score) for score, key in best]
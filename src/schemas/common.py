@@ -75,3 +75,6 @@ class ItemBarcodeStatus(StrEnum):
 class Operator(Enum):
     EQ = "eq"
     NE = "ne"
+    IN = "in"
+    BETWEEN = "between"
+    GTE = "gte"
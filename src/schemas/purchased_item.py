@@ -1,9 +1,18 @@
+from typing import List
 from uuid import UUID
 
 from src.schemas.common import ItemBarcodeStatus, QuantityUnit
 from src.schemas.schema_base import SchemaBase
 
 
+class BarcodeSuggestion(SchemaBase):
+    barcode: str
+    # share of the matching shop items with this barcode, weighted by name similarity
+    score: float
+    # number of matching shop items with this barcode
+    items: int
+
+
 class PurchasedItem(SchemaBase):
     name: str
     quantity: float
@@ -12,3 +21,5 @@ class PurchasedItem(SchemaBase):
     price: float
     item_id: UUID | None = None
     status: ItemBarcodeStatus = ItemBarcodeStatus.PENDING
+    # filled in for pending items when receipts are returned, never stored
+    barcode_suggestions: List[BarcodeSuggestion] = []
@@ -16,8 +16,9 @@ class LinkShopRequest(BaseModel):
 
 
 class AddBarcodesRequest(BaseModel):
-    shop_id: str
-    items: list
+    shop_id: int
+    # validated per item by the handler, so one bad item doesn't reject the rest
+    items: list[dict]
 
 
 class GetOrCreateUserByIdentityRequest(BaseModel):
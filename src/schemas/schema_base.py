@@ -1,5 +1,139 @@
+from datetime import date, datetime
+from enum import Enum
+from types import NoneType, UnionType
+from typing import Any, Callable, Dict, Type, Union, get_args, get_origin
+from uuid import UUID
+
 from pydantic import BaseModel, ConfigDict
+from pydantic.fields import FieldInfo
+from pydantic_core import CoreSchema, SchemaValidator, core_schema
 
 
 class SchemaBase(BaseModel):
     model_config = ConfigDict(strict=False)
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]):
+        """
+        Instance from a row read back through our own adapters.
+
+        Rows were validated on the way in, so for models with validators or
+        model_post_init only the values the adapters return as another type than
+        the field's are converted (str ids, Decimal amounts, enum values and codes,
+        nested purchases), see row_schema(). Their validators and model_post_init
+        don't run: derived fields (ids, hashes, canonical URLs) are stored already
+        and so are checked emails. Other models are validated by pydantic-core as
+        usual, which is faster than constructing them in Python. Missing required
+        fields raise a ValidationError either way. Inbound API payloads must use
+        the constructor.
+        """
+        validator = _ROW_VALIDATORS.get(cls)
+        if validator is None:
+            validator = _ROW_VALIDATORS[cls] = _row_validator(cls)
+        return validator(row)
+
+
+# of each model, built on its first from_row
+_ROW_VALIDATORS: Dict[type, Callable[[Dict[str, Any]], SchemaBase]] = {}
+
+CONVERTED_TYPES: Dict[type, CoreSchema] = {
+    float: core_schema.float_schema(),
+    UUID: core_schema.uuid_schema(),
+    datetime: core_schema.datetime_schema(),
+    date: core_schema.date_schema(),
+}
+
+
+def _checks_in_python(model: Type[SchemaBase]) -> bool:
+    decorators = model.__pydantic_decorators__
+    return bool(
+        model.__pydantic_post_init__
+        or decorators.field_validators
+        or decorators.model_validators
+    )
+
+
+def _row_validator(model: Type[SchemaBase]) -> Callable[[Dict[str, Any]], SchemaBase]:
+    if not _checks_in_python(model):
+        # nothing to skip, pydantic-core validates faster than we could construct
+        return model.__pydantic_validator__.validate_python
+    return SchemaValidator(row_schema(model)).validate_python
+
+
+def row_schema(model: Type[SchemaBase]) -> CoreSchema:
+    """
+    pydantic-core schema building model from a row. Fields are passed through as
+    stored, except for conversions to the types the adapters don't return.
+    """
+    fields = {}
+    for name, field in model.model_fields.items():
+        schema = _value_schema(field.annotation)
+        if not field.is_required():
+            schema = _with_default(schema, field)
+        fields[name] = core_schema.model_field(schema)
+
+    def construct(result) -> SchemaBase:
+        # what model_construct() does, less the model_post_init() call
+        values, _, fields_set = result
+        instance = model.__new__(model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    # not a model_schema: pydantic-core would use the model's own validator for it
+    return core_schema.no_info_after_validator_function(
+        construct, core_schema.model_fields_schema(fields, model_name=model.__name__)
+    )
+
+
+def _value_schema(annotation: Any) -> CoreSchema:
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        schema = _value_schema(args[0]) if len(args) == 1 else core_schema.any_schema()
+        return core_schema.nullable_schema(schema)
+    if origin is list:
+        return core_schema.list_schema(_value_schema(get_args(annotation)[0]))
+    if isinstance(annotation, type) and issubclass(annotation, SchemaBase):
+        return _nested_schema(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        # enums with codes look both up through get()
+        lookup = getattr(annotation, "get", None) or enum_lookup(annotation).__getitem__
+        return core_schema.no_info_plain_validator_function(lookup)
+    return CONVERTED_TYPES.get(annotation, core_schema.any_schema())
+
+
+def _nested_schema(model: Type[SchemaBase]) -> CoreSchema:
+    if not _checks_in_python(model):
+        return model.__pydantic_core_schema__
+    return core_schema.no_info_plain_validator_function(model.from_row)
+
+
+def _with_default(schema: CoreSchema, field: FieldInfo) -> CoreSchema:
+    if field.default_factory is None:
+        return core_schema.with_default_schema(schema, default=field.default)
+    return core_schema.with_default_schema(
+        schema,
+        default_factory=field.default_factory,
+        default_factory_takes_data=field.default_factory_takes_validated_data,
+    )
+
+
+def enum_lookup(
+    enum_cls: Type[Enum], code_cls: Type[Enum] | None = None
+) -> Dict[Any, Enum]:
+    """
+    Members of enum_cls by value and, with code_cls, by the value of the code
+    member of the same name, for O(1) lookups instead of scanning the members.
+    """
+    table: Dict[Any, Enum] = {member.value: member for member in enum_cls}
+    if code_cls is not None:
+        table.update({code.value: enum_cls[code.name] for code in code_cls})
+    return table
+
+
+def enum_codes(enum_cls: Type[Enum], code_cls: Type[Enum]) -> Dict[Any, Any]:
+    """Code value of each enum_cls member, by member (and so by str value)."""
+    return {enum_cls[code.name]: code.value for code in code_cls}
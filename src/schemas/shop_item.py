@@ -4,6 +4,7 @@ from uuid import UUID, uuid4
 from pydantic import Field
 
 from src.helpers.common import validate_barcode
+from src.helpers.item_names import normalize_item_name
 from src.schemas.common import ItemBarcodeStatus
 from src.schemas.schema_base import SchemaBase
 
@@ -16,8 +17,12 @@ class ShopItem(SchemaBase):
     name: str
     status: ItemBarcodeStatus
     barcode: str | None = None
+    # matching key for receipt lines, derived from name
+    normalized_name: str | None = None
 
     def model_post_init(self, __context) -> None:
+        self.normalized_name = normalize_item_name(self.name)
+
         if self.status == ItemBarcodeStatus.ADDED:
             if not self.barcode:
                 raise ValueError("Barcode must be provided for added items")
@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 
 from pydantic import Field, EmailStr, field_validator
 
-from src.schemas.schema_base import SchemaBase
+from src.schemas.schema_base import SchemaBase, enum_codes, enum_lookup
 
 
 class UserRightsGroup(StrEnum):
@@ -17,15 +17,11 @@ class UserRightsGroup(StrEnum):
 
     @classmethod
     def get(cls, value):
-        if isinstance(value, int):
-            # Map from UserRightsGroupCode
-            for member in UserRightsGroupCode:
-                if member.value == value:
-                    return cls[member.name]
-        for member in cls:
-            if member.value == value:
-                return member
-        raise ValueError(f"{value} does not exist in {cls.__name__}")
+        """Member by value or by UserRightsGroupCode value."""
+        try:
+            return USER_RIGHTS_GROUPS[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value} does not exist in {cls.__name__}") from None
 
 
 class UserRightsGroupCode(IntEnum):
@@ -45,15 +41,11 @@ class Gender(StrEnum):
 
     @classmethod
     def get(cls, value):
-        if isinstance(value, int):
-            # Map from GenderCode
-            for member in GenderCode:
-                if member.value == value:
-                    return cls[member.name]
-        for member in cls:
-            if member.value == value:
-                return member
-        raise ValueError(f"{value} does not exist in {cls.__name__}")
+        """Member by value or by GenderCode value."""
+        try:
+            return GENDERS[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value} does not exist in {cls.__name__}") from None
 
 
 class GenderCode(IntEnum):
@@ -64,6 +56,13 @@ class GenderCode(IntEnum):
     OTHER = 5
 
 
+# built once, users are read and written with every request
+USER_RIGHTS_GROUPS = enum_lookup(UserRightsGroup, UserRightsGroupCode)
+USER_RIGHTS_GROUP_CODES = enum_codes(UserRightsGroup, UserRightsGroupCode)
+GENDERS = enum_lookup(Gender, GenderCode)
+GENDER_CODES = enum_codes(Gender, GenderCode)
+
+
 class User(SchemaBase):
     id: Optional[UUID] = Field(default_factory=uuid4)
     email: EmailStr | None = None
@@ -92,10 +91,11 @@ class User(SchemaBase):
 
     def model_dump(self, **kwargs):
         data = super().model_dump(**kwargs)
+        # members and their str values (mode="json") hash alike
         if "user_rights_group" in data:
-            data["user_rights_group"] = UserRightsGroupCode[
-                UserRightsGroup(data["user_rights_group"]).name
-            ].value
-        if "gender" in data and data["gender"] is not None:
-            data["gender"] = GenderCode[Gender(data["gender"]).name].value
+            data["user_rights_group"] = USER_RIGHTS_GROUP_CODES[
+                data["user_rights_group"]
+            ]
+        if data.get("gender") is not None:
+            data["gender"] = GENDER_CODES[data["gender"]]
         return data
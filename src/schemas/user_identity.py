@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from enum import StrEnum
 from uuid import UUID
 
-from src.schemas.schema_base import SchemaBase
+from src.schemas.schema_base import SchemaBase, enum_lookup
 
 
 class IdentityProvider(StrEnum):
@@ -13,10 +13,13 @@ class IdentityProvider(StrEnum):
 
     @classmethod
     def get(cls, value):
-        for member in cls:
-            if member.value == value:
-                return member
-        raise ValueError(f"{value} does not exist in {cls.__name__}")
+        try:
+            return IDENTITY_PROVIDERS[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value} does not exist in {cls.__name__}") from None
+
+
+IDENTITY_PROVIDERS = enum_lookup(IdentityProvider)
 
 
 class UserIdentity(SchemaBase):
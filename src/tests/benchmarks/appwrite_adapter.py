@@ -0,0 +1,138 @@
+"""
+Measure AppwriteFastAPIAdapter overhead against response size.
+
+A bare ASGI app sends a ready JSON body, whole or in 64 KiB chunks, so only the
+adapter is timed: collecting the body and handing it to the runtime response.
+The previous adapter (body += chunk, json.loads, runtime json.dumps) is timed
+alongside:
+
+    python -m src.tests.benchmarks.appwrite_adapter --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from src.adapters.rest.appwrite_fastapi_adapter import AppwriteFastAPIAdapter
+
+PAYLOAD_SIZES = (1_000, 100_000, 1_000_000, 10_000_000)
+CHUNK_SIZE = 64 * 1024
+
+
+class RuntimeResponse:
+    """Like the Open Runtimes response: json() serializes, binary() does not."""
+
+    def json(self, obj, status_code=200, headers=None):
+        return self.binary(json.dumps(obj).encode("utf-8"), status_code, headers)
+
+    def send(self, body, status_code=200, headers=None):
+        return self.binary(body.encode("utf-8"), status_code, headers)
+
+    def binary(self, body, status_code=200, headers=None):
+        return {"body": body, "statusCode": status_code, "headers": headers or {}}
+
+
+class LegacyAdapter(AppwriteFastAPIAdapter):
+    """The response handling the adapter used to do."""
+
+    async def handle(self, context):
+        response_body = b""
+        response_status = 200
+        response_headers = {}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal response_body, response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                for key, value in message.get("headers", []):
+                    response_headers[key.decode("latin-1")] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response_body += message.get("body", b"")
+
+        await self.app({"type": "http"}, receive, send)
+
+        if "application/json" in response_headers.get("content-type", ""):
+            data = json.loads(response_body.decode("utf-8"))
+            return context.res.json(data, response_status)
+        return context.res.send(
+            response_body.decode("utf-8"), response_status, response_headers
+        )
+
+
+def make_app(body: bytes, chunked: bool):
+    chunks = (
+        [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+        if chunked
+        else [body]
+    )
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    return app
+
+
+def make_body(size: int) -> bytes:
+    item = {"id": 0, "name": "LAPTE DE SOIA ALPRO 1L", "status": "pending"}
+    count = max(1, size // len(json.dumps(item)))
+    return json.dumps({"items": [{**item, "id": i} for i in range(count)]}).encode(
+        "utf-8"
+    )
+
+
+def make_context() -> SimpleNamespace:
+    request = SimpleNamespace(
+        headers={}, method="GET", path="/", query_string="", body_text=""
+    )
+    return SimpleNamespace(req=request, res=RuntimeResponse())
+
+
+async def best_ms(adapter, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        context = make_context()
+        start = time.perf_counter()
+        await adapter.handle(context)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(repeat: int) -> None:
+    print(f"best of {repeat}")
+    print(f"{'bytes':>10} {'body':>8} {'legacy':>10} {'adapter':>10} {'speedup':>8}")
+    for size in PAYLOAD_SIZES:
+        body = make_body(size)
+        for chunked in (False, True):
+            app = make_app(body, chunked)
+            legacy = asyncio.run(best_ms(LegacyAdapter(app), repeat))
+            current = asyncio.run(best_ms(AppwriteFastAPIAdapter(app), repeat))
+            print(
+                f"{len(body):>10} {'chunked' if chunked else 'whole':>8} "
+                f"{legacy:>8.2f}ms {current:>8.2f}ms {legacy / current:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,85 @@
+"""
+Import-time profile of the Appwrite function entry point.
+
+Imports src.adapters.rest.appwrite_functions in fresh interpreters with
+python -X importtime (secrets set in the environment, so nothing is fetched),
+prints the slowest top-level imports and fails when the median import time is
+over budget or when a module kept out of cold starts gets imported again:
+
+    python -m src.tests.benchmarks.cold_start --budget-ms 1500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from src import constants as c
+
+ENTRY_POINT = "src.adapters.rest.appwrite_functions"
+# only needed off the request path: fetching secrets, scraping, other adapters
+LAZY_MODULES = ("dopplersdk", "requests", "azure.cosmos", "sentry_sdk")
+
+
+def import_profile() -> Dict[str, Tuple[int, int]]:
+    """(self, cumulative) import time in microseconds by module, one fresh import."""
+    env = {**os.environ, **{name: "x" for name in c.REQUIRED_ENV_VAR_NAMES}}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_POINT}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def slowest(profile: Dict[str, Tuple[int, int]], top: int) -> List[Tuple[str, int]]:
+    """Third-party packages and our modules by cumulative time, slowest first."""
+    roots = {
+        name: cumulative
+        for name, (_, cumulative) in profile.items()
+        if name.startswith("src.") or "." not in name
+    }
+    return sorted(roots.items(), key=lambda item: -item[1])[:top]
+
+
+def run(repeat: int, top: int, budget_ms: float) -> int:
+    profiles = [import_profile() for _ in range(repeat)]
+    totals = [profile[ENTRY_POINT][1] / 1000 for profile in profiles]
+    median_ms = statistics.median(totals)
+
+    print(f"{ENTRY_POINT}: median {median_ms:.0f}ms of {repeat} cold imports")
+    for name, cumulative in slowest(profiles[-1], top):
+        print(f"{cumulative / 1000:>10.1f}ms  {name}")
+
+    failures = [
+        f"{name} is imported at cold start"
+        for name in LAZY_MODULES
+        if any(name in profile for profile in profiles)
+    ]
+    if median_ms > budget_ms:
+        failures.append(
+            f"median {median_ms:.0f}ms is over the {budget_ms:.0f}ms budget"
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    args = parser.parse_args()
+    sys.exit(run(args.repeat, args.top, args.budget_ms))
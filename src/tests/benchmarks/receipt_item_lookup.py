@@ -0,0 +1,138 @@
+"""
+Compare per-purchase shop item lookups with the batched lookup used by
+SfsMdReceiptHandler.get_or_create.
+
+Only the shop item resolution is timed; the shop and receipt writes are the same
+for both strategies.
+
+Every adapter call sleeps for the configured round trip time and the fake
+adapter does no query work, so the "speedup" only counts round trips saved. It
+is not the speedup on a real database, where the one = ANY query still has to
+find every item; run both strategies against PostgreSQL for that:
+
+    python -m src.tests.benchmarks.receipt_item_lookup --rtt-ms 1
+"""
+
+import argparse
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from src.handlers.sfs_md.receipt import apply_shop_items, shop_items_where
+from src.helpers.item_names import normalize_item_name
+from src.schemas.common import TableName
+from src.schemas.purchased_item import PurchasedItem
+from src.schemas.sfs_md.receipt import SfsMdReceipt
+
+RECEIPT_SIZES = (1, 20, 100, 500)
+
+
+class FakeAdapter:
+    """Answers like PostgreSQLAdapter, paying one round trip per call."""
+
+    def __init__(self, rtt: float, items: list[dict]):
+        self.rtt = rtt
+        self.items = items
+        self.current_table = None
+        self.round_trips = 0
+
+    def use_table(self, table_name: TableName):
+        self.current_table = table_name
+        return self
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def read_many(self, where=None, limit=None, **_kwargs):
+        self._round_trip()
+        column = "normalized_name" if "normalized_name" in where else "name"
+        names = where[column]
+        if isinstance(names, tuple):
+            names = set(names[1])
+        else:
+            names = {names}
+        rows = [item for item in self.items if item[column] in names]
+        return rows[:limit] if limit else rows
+
+
+def item_name(i: int) -> str:
+    return f"Item {i} 1L"
+
+
+def make_receipt(lines: int) -> SfsMdReceipt:
+    return SfsMdReceipt(
+        date=datetime(2024, 1, 1),
+        user_id=uuid4(),
+        company_id="1003600000000",
+        company_name="Test Company",
+        shop_address="Test Address",
+        cash_register_id="J403001234",
+        key=123456,
+        total_amount=float(lines),
+        shop_id=1,
+        purchases=[
+            PurchasedItem(name=item_name(i), quantity=1.0, price=1.0)
+            for i in range(lines)
+        ],
+        receipt_url=(
+            "https://mev.sfs.md/receipt-verifier/J403001234/1.00/123456/2024-01-01"
+        ),
+    )
+
+
+def per_purchase_lookup(db: FakeAdapter, receipt: SfsMdReceipt) -> None:
+    """The lookup get_or_create used to do: one query per purchase."""
+    db.use_table(TableName.SHOP_ITEM)
+    for purchase in receipt.purchases:
+        items = db.read_many(
+            {"name": purchase.name, "shop_id": receipt.shop_id}, limit=1
+        )
+        if items:
+            purchase.item_id = items[0]["id"]
+
+
+def batched_lookup(db: FakeAdapter, receipt: SfsMdReceipt) -> None:
+    db.use_table(TableName.SHOP_ITEM)
+    apply_shop_items(receipt, db.read_many(shop_items_where(receipt)))
+
+
+def run(rtt_ms: float, repeat: int) -> None:
+    print(f"rtt={rtt_ms}ms, best of {repeat}, fake adapter: round trips only")
+    print(f"{'lines':>6} {'per-purchase':>14} {'batched':>10} {'speedup':>8}")
+    for lines in RECEIPT_SIZES:
+        items = [
+            {
+                "id": str(uuid4()),
+                "name": item_name(i),
+                "normalized_name": normalize_item_name(item_name(i)),
+            }
+            for i in range(lines)
+        ]
+        db = FakeAdapter(rtt_ms / 1000, items)
+
+        loop_times, batch_times = [], []
+        for _ in range(repeat):
+            receipt = make_receipt(lines)
+            start = time.perf_counter()
+            per_purchase_lookup(db, receipt)
+            loop_times.append(time.perf_counter() - start)
+
+            receipt = make_receipt(lines)
+            start = time.perf_counter()
+            batched_lookup(db, receipt)
+            batch_times.append(time.perf_counter() - start)
+
+        loop_ms, batch_ms = min(loop_times) * 1000, min(batch_times) * 1000
+        print(
+            f"{lines:>6} {loop_ms:>12.1f}ms {batch_ms:>8.1f}ms "
+            f"{loop_ms / batch_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rtt_ms, args.repeat)
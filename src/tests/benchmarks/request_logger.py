@@ -0,0 +1,138 @@
+"""
+Measure the per-request cost of logging from a route.
+
+Requests go through AppwriteFastAPIAdapter to a route that logs a record, awaits
+a simulated query and logs another, with the logger from get_logger (one handler
+collecting the request's records by context var, written when it is done) or
+from the previous get_logger, which built an AppwriteLogger per request in the
+thread pool and wrote records on the request path. --write-us simulates a slow
+runtime log write. Records that reach the console handlers are dropped, so the
+run prints only its results. Also counts the requests whose records reached
+their own request's context:
+
+    python -m src.tests.benchmarks.request_logger --write-us 200 --db-ms 1
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+
+from src.adapters.rest.appwrite_fastapi_adapter import AppwriteFastAPIAdapter
+from src.adapters.rest.fastapi_routes import get_logger
+
+
+class LegacyAppwriteHandler(logging.Handler):
+    def __init__(self, context):
+        super().__init__()
+        self.context = context
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            if record.levelno >= logging.ERROR:
+                self.context.error(msg)
+            else:
+                self.context.log(msg)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.handleError(record)
+
+
+class LegacyAppwriteLogger:
+    """The AppwriteLogger get_logger used to build per request."""
+
+    def __init__(self, context, level: int = logging.INFO):
+        # a logger of its own, so the current AppwriteHandler doesn't see these
+        self.log = logging.getLogger("pbapi_legacy")
+        self.log.propagate = False
+        self.log.setLevel(level)
+        if not logging.root.handlers:
+            logging.basicConfig(level=level)
+        if not any(isinstance(h, LegacyAppwriteHandler) for h in self.log.handlers):
+            handler = LegacyAppwriteHandler(context)
+            handler.setLevel(level)
+            handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+            self.log.addHandler(handler)
+
+
+def make_app(dependency, db_ms: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def route(logger=Depends(dependency)):
+        logger.info("receipt url")
+        await asyncio.sleep(db_ms / 1000)
+        logger.info("receipt _id")
+        return {}
+
+    return app
+
+
+def make_legacy_app(db_ms: float) -> FastAPI:
+    # a sync dependency, like the old get_logger, so FastAPI runs it in threads
+    def get_legacy_logger(request: Request) -> logging.Logger:
+        return LegacyAppwriteLogger(request.scope["appwrite_context"]).log
+
+    return make_app(get_legacy_logger, db_ms)
+
+
+class Context:
+    def __init__(self, write_us: float):
+        self.write_us = write_us
+        self.req = SimpleNamespace(
+            headers={}, method="GET", path="/", query_string="", body_text=""
+        )
+        self.res = SimpleNamespace(binary=lambda body, status, headers: body)
+        self.records = []
+
+    def log(self, msg):
+        if self.write_us:
+            time.sleep(self.write_us / 1e6)
+        self.records.append(msg)
+
+    error = log
+
+
+async def serve(app: FastAPI, requests: int, write_us: float):
+    adapter = AppwriteFastAPIAdapter(app)
+    contexts = [Context(write_us) for _ in range(requests)]
+    await adapter.handle(Context(write_us))  # warm up routing and the thread pool
+
+    start = time.perf_counter()
+    for context in contexts:
+        await adapter.handle(context)
+    elapsed = time.perf_counter() - start
+
+    delivered = sum(1 for context in contexts if context.records)
+    return elapsed / requests * 1e6, delivered
+
+
+def run(requests: int, write_us: float, db_ms: float) -> None:
+    # the console handlers both loggers find on the root logger; they drop records
+    logging.basicConfig(handlers=[logging.NullHandler()])
+
+    legacy_us, legacy_delivered = asyncio.run(
+        serve(make_legacy_app(db_ms), requests, write_us)
+    )
+    current_us, current_delivered = asyncio.run(
+        serve(make_app(get_logger, db_ms), requests, write_us)
+    )
+
+    print(f"{requests} requests, 2 records of {write_us:.0f}us, {db_ms}ms query")
+    print(f"{'':>8} {'per request':>12} {'records in own context':>24}")
+    print(f"{'legacy':>8} {legacy_us:>10.1f}us {legacy_delivered:>24}")
+    print(f"{'current':>8} {current_us:>10.1f}us {current_delivered:>24}")
+    print(f"speedup {legacy_us / current_us:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-us", type=float, default=0)
+    parser.add_argument("--db-ms", type=float, default=0)
+    args = parser.parse_args()
+    run(args.requests, args.write_us, args.db_ms)
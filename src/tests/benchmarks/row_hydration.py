@@ -0,0 +1,116 @@
+"""
+Compare validated construction of models from database rows with from_row.
+
+Rows are shaped like the PostgreSQL adapters return them (str ids, Decimal
+amounts, receipts with their purchases as JSON objects):
+
+    python -m src.tests.benchmarks.row_hydration --rounds 5000
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from src.helpers.common import make_hash
+from src.schemas.receipt_url import ReceiptUrl
+from src.schemas.sfs_md.receipt import SfsMdReceipt
+from src.schemas.user import User
+from src.schemas.user_identity import UserIdentity
+
+PURCHASES = 20
+
+
+def receipt_row() -> dict:
+    url = "https://mev.sfs.md/receipt-verifier/J403001234/1.00/123456/2024-01-01"
+    return {
+        "id": "md_j403001234_123456",
+        "date": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "user_id": str(uuid4()),
+        "company_id": "1003600000000",
+        "company_name": "Test Company",
+        "country_code": "md",
+        "shop_address": "Test Address",
+        "cash_register_id": "J403001234",
+        "key": 123456,
+        "currency_code": "mdl",
+        "total_amount": Decimal("20.00"),
+        "purchases": [
+            {
+                "name": f"Item {i}",
+                "quantity": 1,
+                "unit": "pcs",
+                "unit_quantity": None,
+                "price": 1.0,
+                "item_id": str(uuid4()),
+                "status": "pending",
+            }
+            for i in range(PURCHASES)
+        ],
+        "receipt_url": url,
+        "receipt_canonical_url": url,
+        "shop_id": 1,
+    }
+
+
+def user_row() -> dict:
+    return {
+        "id": str(uuid4()),
+        "email": "user@example.com",
+        "name": "User",
+        "creation_time": 1700000000,
+        "login_generation": 1,
+        "banned": False,
+        "self_description": None,
+        "gender": 2,
+        "birthday": None,
+        "user_rights_group": 1,
+        "avatar_id": None,
+    }
+
+
+def per_second(rounds: int, repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return rounds / best
+
+
+def run(rounds: int, repeat: int) -> None:
+    url = "https://example.com/receipt"
+    cases = [
+        (f"SfsMdReceipt ({PURCHASES} lines)", SfsMdReceipt, receipt_row()),
+        ("User", User, user_row()),
+        (
+            "UserIdentity",
+            UserIdentity,
+            {"id": "123", "provider": "telegram", "user_id": str(uuid4())},
+        ),
+        (
+            "ReceiptUrl",
+            ReceiptUrl,
+            {"id": make_hash(url), "url": url, "receipt_id": "r1"},
+        ),
+    ]
+
+    print(f"{rounds} rounds, best of {repeat}")
+    print(f"{'model':<24} {'validated':>12} {'from_row':>12} {'speedup':>8}")
+    for name, model, row in cases:
+        validated = per_second(rounds, repeat, lambda m=model, r=row: m(**r))
+        trusted = per_second(rounds, repeat, lambda m=model, r=row: m.from_row(r))
+        print(
+            f"{name:<24} {validated:>10,.0f}/s {trusted:>10,.0f}/s "
+            f"{trusted / validated:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rounds, args.repeat)
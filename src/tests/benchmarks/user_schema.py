@@ -0,0 +1,109 @@
+"""
+Measure User load / dump throughput and the enum lookups behind them.
+
+Users are loaded from rows that store user_rights_group and gender as int codes,
+and dumped back to codes by User.model_dump. The lookups are compared with the
+member scans the enums used to do:
+
+    python -m src.tests.benchmarks.user_schema --rounds 20000
+"""
+
+import argparse
+import time
+from uuid import uuid4
+
+from src.schemas.user import (
+    Gender,
+    GenderCode,
+    User,
+    UserRightsGroup,
+    UserRightsGroupCode,
+)
+
+
+def scan_get(enum_cls, code_cls, value):
+    """The lookup UserRightsGroup.get / Gender.get used to do."""
+    if isinstance(value, int):
+        for member in code_cls:
+            if member.value == value:
+                return enum_cls[member.name]
+    for member in enum_cls:
+        if member.value == value:
+            return member
+    raise ValueError(f"{value} does not exist in {enum_cls.__name__}")
+
+
+def scan_codes(data: dict) -> dict:
+    """The code mapping User.model_dump used to do."""
+    data["user_rights_group"] = UserRightsGroupCode[
+        UserRightsGroup(data["user_rights_group"]).name
+    ].value
+    if data.get("gender") is not None:
+        data["gender"] = GenderCode[Gender(data["gender"]).name].value
+    return data
+
+
+def make_row(i: int) -> dict:
+    return {
+        "id": str(uuid4()),
+        "email": f"user{i}@example.com",
+        "name": f"User {i}",
+        "creation_time": 1700000000 + i,
+        "login_generation": 1,
+        "banned": False,
+        "self_description": None,
+        "gender": i % 5 + 1,
+        "birthday": None,
+        "user_rights_group": i % 5 + 1,
+        "avatar_id": None,
+    }
+
+
+def per_second(rounds: int, repeat: int, fn) -> float:
+    best = min(_timed(rounds, fn) for _ in range(repeat))
+    return rounds / best
+
+
+def _timed(rounds: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(rounds):
+        fn(i)
+    return time.perf_counter() - start
+
+
+def run(rounds: int, repeat: int) -> None:
+    rows = [make_row(i) for i in range(256)]
+    users = [User(**row) for row in rows]
+    values = [5, "administrator", 1, "normal"]
+
+    lookups = [
+        (
+            "UserRightsGroup.get (scan)",
+            lambda i: scan_get(UserRightsGroup, UserRightsGroupCode, values[i % 4]),
+        ),
+        ("UserRightsGroup.get", lambda i: UserRightsGroup.get(values[i % 4])),
+    ]
+    models = [
+        ("User(**row)", lambda i: User(**rows[i % 256])),
+        (
+            "User.model_dump (scan)",
+            lambda i: scan_codes(super(User, users[i % 256]).model_dump()),
+        ),
+        ("User.model_dump", lambda i: users[i % 256].model_dump()),
+        (
+            "User.model_dump json",
+            lambda i: users[i % 256].model_dump(mode="json"),
+        ),
+    ]
+
+    print(f"{rounds} rounds, best of {repeat}")
+    for name, fn in lookups + models:
+        print(f"{name:<28} {per_second(rounds, repeat, fn):>12,.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rounds, args.repeat)
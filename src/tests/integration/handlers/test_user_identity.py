@@ -25,6 +25,9 @@ class TestUserIdentity(unittest.TestCase):
     def setUp(self):
         self.handler = UserIdentityHandler(logger)
 
+    def tearDown(self):
+        self.handler.close()
+
     def _create_test_user(self):
         user_uuid = uuid.uuid4()
         user_data = {
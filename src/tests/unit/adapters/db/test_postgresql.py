@@ -0,0 +1,291 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from src.adapters.db.base import InvalidCursorError, decode_cursor, encode_cursor
+from src.adapters.db.postgresql import PostgreSQLAdapter, PostgreSQLQueryBuilder
+from src.schemas.common import Operator, TableName
+
+
+@pytest.fixture
+def builder():
+    return PostgreSQLQueryBuilder().use_table(TableName.SHOP_ITEM)
+
+
+class TestBuildWhere:
+    def test_equality(self, builder):
+        conditions, params = builder._build_where({"shop_id": 7})
+
+        assert conditions == ["shop_id = %s"]
+        assert params == [7]
+
+    def test_in_uses_any(self, builder):
+        conditions, params = builder._build_where(
+            {"name": (Operator.IN, ("Milk", "Bread")), "shop_id": 7}
+        )
+
+        assert conditions == ["name = ANY(%s)", "shop_id = %s"]
+        assert params == [["Milk", "Bread"], 7]
+
+    def test_in_on_data_field(self):
+        builder = PostgreSQLQueryBuilder().use_table(TableName.SHOP)
+
+        conditions, params = builder._build_where({"osm_id": (Operator.IN, [1, 2])})
+
+        assert conditions == ["data->>%s = ANY(%s)"]
+        assert params == ["osm_id", ["1", "2"]]
+
+    def test_between(self):
+        builder = PostgreSQLQueryBuilder().use_table(TableName.SHOP)
+
+        conditions, params = builder._build_where(
+            {"lat": (Operator.BETWEEN, (46.9, 47.1))}
+        )
+
+        assert conditions == ["lat BETWEEN %s AND %s"]
+        assert params == [46.9, 47.1]
+
+    def test_delete_many_query(self):
+        builder = PostgreSQLQueryBuilder().use_table(TableName.PURCHASED_ITEM)
+
+        query, params = builder._delete_many_query(
+            {"receipt_id": "r1", "position": (Operator.GTE, 3)}
+        )
+
+        assert query == (
+            f'DELETE FROM "{TableName.PURCHASED_ITEM}" '
+            "WHERE receipt_id = %s AND position >= %s"
+        )
+        assert params == ["r1", 3]
+
+    def test_delete_many_query_needs_a_filter(self, builder):
+        with pytest.raises(ValueError):
+            builder._delete_many_query({"unknown": 1})
+
+    def test_select_many_query(self, builder):
+        query, params = builder._select_many_query(
+            {"name": (Operator.IN, ["Milk"]), "shop_id": 7}, None
+        )
+
+        assert query == (
+            f'SELECT * FROM "{TableName.SHOP_ITEM}" WHERE name = ANY(%s) AND shop_id = %s'
+        )
+        assert params == (["Milk"], 7)
+
+    def test_select_many_query_with_order_and_offset(self, builder):
+        query, params = builder._select_many_query(
+            {"shop_id": 7}, 20, offset=40, order_by="-name"
+        )
+
+        assert query.endswith("ORDER BY name DESC LIMIT %s OFFSET %s")
+        assert params == (7, 20, 40)
+
+    def test_select_many_query_rejects_unknown_order(self, builder):
+        with pytest.raises(ValueError):
+            builder._select_many_query(None, None, order_by="name; DROP TABLE x")
+
+
+class TestInsertManyQueries:
+    def test_create_many_is_one_multi_row_statement(self, builder):
+        ids, queries = builder._insert_many_queries(
+            [
+                {"id": "a", "shop_id": 7, "name": "Milk"},
+                {"id": "b", "shop_id": 7, "name": "Bread"},
+            ]
+        )
+
+        assert ids == ["a", "b"]
+        assert len(queries) == 1
+        query, values = queries[0]
+        assert query == (
+            f'INSERT INTO "{TableName.SHOP_ITEM}" (id, shop_id, name) '
+            "VALUES (%s, %s, %s), (%s, %s, %s) "
+            "ON CONFLICT (id) DO NOTHING RETURNING id"
+        )
+        assert values == ["a", 7, "Milk", "b", 7, "Bread"]
+
+    def test_create_many_generates_missing_ids(self, builder):
+        ids, _ = builder._insert_many_queries([{"name": "Milk"}])
+
+        assert len(ids) == 1 and ids[0]
+
+    def test_upsert_many_updates_and_reports_existing_rows(self, builder):
+        ids, queries = builder._insert_many_queries(
+            [
+                {"id": "a", "name": "Milk"},
+                {"id": "a", "name": "Milk 2.5%"},
+            ],
+            upsert=True,
+        )
+
+        assert ids == ["a", "a"]
+        query, values = queries[0]
+        assert query.endswith(
+            "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name "
+            "RETURNING id, xmax <> 0"
+        )
+        # a repeated id keeps only its last row
+        assert values == ["a", "Milk 2.5%"]
+
+    def test_upsert_many_requires_ids(self, builder):
+        with pytest.raises(ValueError):
+            builder._insert_many_queries([{"name": "Milk"}], upsert=True)
+
+    def test_rows_are_paged(self, builder, monkeypatch):
+        monkeypatch.setattr("src.adapters.db.postgresql.BULK_WRITE_PAGE_SIZE", 2)
+
+        _, queries = builder._insert_many_queries(
+            [{"id": str(i), "name": "Milk"} for i in range(5)]
+        )
+
+        assert [len(values) for _, values in queries] == [4, 4, 2]
+
+    def test_results(self):
+        created = PostgreSQLQueryBuilder._create_many_result(["a", "b", "a"], {"a"})
+        upserted = PostgreSQLQueryBuilder._upsert_many_result(["a", "b", "a"], {"a"})
+
+        assert created.ids == ["a", "b", "a"]
+        assert created.conflicts == ["b", "a"]
+        assert upserted.conflicts == ["a"]
+
+
+class TestSelectPageQuery:
+    def test_first_page(self, builder):
+        query, params = builder._select_page_query({"shop_id": 7}, 20)
+
+        assert query == (
+            'SELECT * FROM "shop_item" WHERE shop_id = %s ORDER BY id ASC LIMIT %s'
+        )
+        assert params == (7, 21)
+
+    def test_after_cursor(self, builder):
+        cursor = encode_cursor(["Milk", "abc"])
+
+        query, params = builder._select_page_query(None, 20, "-name", cursor)
+
+        assert query == (
+            'SELECT * FROM "shop_item" WHERE (name, id) < (%s, %s) '
+            "ORDER BY name DESC, id DESC LIMIT %s"
+        )
+        assert params == ("Milk", "abc", 21)
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(["a", "b"])])
+    def test_invalid_cursor(self, builder, cursor):
+        with pytest.raises(InvalidCursorError):
+            builder._select_page_query(None, 20, "id", cursor)
+
+    def test_page_result(self, builder):
+        rows = [{"id": "a", "name": "Milk"}, {"id": "b", "name": "Oat"}, {"id": "c"}]
+
+        page = builder._page_result(rows, 2, "name")
+        last_page = builder._page_result(rows[:2], 2, "name")
+
+        assert page.items == rows[:2]
+        assert decode_cursor(page.next_cursor) == ["Oat", "b"]
+        assert last_page.next_cursor is None
+
+
+class TestSearchQuery:
+    def test_first_page(self, builder):
+        query, params = builder._search_query("lapte", 20, {"shop_id": 7})
+
+        assert "word_similarity(%s, name)" in query
+        assert "%s <%% name" in query
+        assert "plainto_tsquery('simple', %s)" in query
+        assert "AND shop_id = %s) AS matches" in query
+        assert query.endswith("ORDER BY score DESC, id ASC LIMIT %s")
+        assert params == ("lapte", "lapte", "lapte", "lapte", 7, 21)
+
+    def test_after_cursor(self, builder):
+        cursor = encode_cursor([1.5, "abc"])
+
+        query, params = builder._search_query("lapte", 20, after=cursor)
+
+        assert "WHERE score < %s OR (score = %s AND id > %s)" in query
+        assert params[-4:] == (1.5, 1.5, "abc", 21)
+
+    def test_search_result(self):
+        rows = [{"id": "a", "score": 2.0}, {"id": "b", "score": 1.5}]
+
+        page = PostgreSQLQueryBuilder._search_result(rows, 1)
+
+        assert page.items == rows[:1]
+        assert decode_cursor(page.next_cursor) == [2.0, "a"]
+
+
+class TestSelectReceiptQuery:
+    def test_by_id(self, builder):
+        query, params = builder._select_receipt_query("md_cr_1_42")
+
+        assert f'FROM "{TableName.RECEIPT}" r\n' in query
+        assert "WHERE r.id = %s" in query
+        assert params == ("md_cr_1_42",)
+
+    def test_by_url_joins_receipt_url(self, builder):
+        query, params = builder._select_receipt_query("hash123", by_url=True)
+
+        assert (
+            f'FROM "{TableName.RECEIPT_URL}" u '
+            f'JOIN "{TableName.RECEIPT}" r ON r.id = u.receipt_id'
+        ) in query
+        assert "WHERE u.id = %s" in query
+        assert params == ("hash123",)
+
+
+class TestTransaction:
+    @pytest.fixture
+    def adapter(self):
+        pool = Mock()
+        pool.getconn.return_value = MagicMock(autocommit=True)
+        return PostgreSQLAdapter(Mock(), pool=pool)
+
+    def test_commits(self, adapter):
+        connection = adapter.connection
+
+        with adapter.transaction():
+            assert connection.autocommit is False
+
+        connection.commit.assert_called_once()
+        connection.rollback.assert_not_called()
+        assert connection.autocommit is True
+
+    def test_rolls_back_on_error(self, adapter):
+        connection = adapter.connection
+
+        with pytest.raises(RuntimeError):
+            with adapter.transaction():
+                raise RuntimeError
+
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
+        assert connection.autocommit is True
+
+    def test_nested_transaction_joins_outer_one(self, adapter):
+        connection = adapter.connection
+
+        with adapter.transaction():
+            with adapter.transaction():
+                pass
+            connection.commit.assert_not_called()
+
+        connection.commit.assert_called_once()
+
+
+class TestIterMany:
+    def test_streams_through_named_cursor(self):
+        pool = Mock()
+        connection = MagicMock(autocommit=True)
+        pool.getconn.return_value = connection
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.__iter__.return_value = iter([{"id": "a", "name": "Milk"}])
+        adapter = PostgreSQLAdapter(Mock(), pool=pool).use_table(TableName.SHOP_ITEM)
+
+        rows = list(adapter.iter_many({"shop_id": 7}, batch_size=500))
+
+        assert rows == [{"id": "a", "name": "Milk"}]
+        assert connection.cursor.call_args.kwargs["name"].startswith("iter_")
+        assert cursor.itersize == 500
+        cursor.execute.assert_called_once_with(
+            f'SELECT * FROM "{TableName.SHOP_ITEM}" WHERE shop_id = %s', (7,)
+        )
+        connection.commit.assert_called_once()
@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from src.adapters.db import postgresql_async
+from src.adapters.db.postgresql_async import AsyncPostgreSQLAdapter, get_async_pool
+
+
+@pytest.fixture
+def connection():
+    return MagicMock(broken=False)
+
+
+@pytest.fixture
+def adapter(connection):
+    adapter = AsyncPostgreSQLAdapter(Mock(), pool=AsyncMock())
+    adapter.connection = connection
+    return adapter
+
+
+class TestTransaction:
+    async def _write(self, adapter):
+        async with adapter.transaction():
+            pass
+
+    def test_pipelines_when_supported(self, adapter, connection):
+        with patch(
+            "src.adapters.db.postgresql_async.AsyncPipeline.is_supported",
+            return_value=True,
+        ):
+            asyncio.run(self._write(adapter))
+
+        connection.pipeline.return_value.__aenter__.assert_awaited_once()
+        connection.transaction.return_value.__aenter__.assert_awaited_once()
+
+    def test_plain_transaction_without_pipeline_support(self, adapter, connection):
+        with patch(
+            "src.adapters.db.postgresql_async.AsyncPipeline.is_supported",
+            return_value=False,
+        ):
+            asyncio.run(self._write(adapter))
+
+        connection.pipeline.assert_not_called()
+        connection.transaction.return_value.__aenter__.assert_awaited_once()
+
+
+class TestGetConnection:
+    def test_broken_connection_is_replaced(self, adapter, connection):
+        connection.broken = True
+        fresh = MagicMock(broken=False)
+        adapter.pool.getconn.return_value = fresh
+
+        assert asyncio.run(adapter._get_connection()) is fresh
+        adapter.pool.putconn.assert_awaited_once_with(connection)
+
+
+class TestGetAsyncPool:
+    @pytest.fixture
+    def pools(self, monkeypatch):
+        monkeypatch.setattr(postgresql_async, "_async_pool", None)
+        monkeypatch.setattr(postgresql_async, "_async_pool_loop", None)
+        pools = []
+
+        def make_pool(*args, **kwargs):
+            pool = Mock(open=AsyncMock(), close=AsyncMock())
+            pools.append(pool)
+            return pool
+
+        with patch.object(
+            postgresql_async, "AsyncConnectionPool", side_effect=make_pool
+        ):
+            yield pools
+
+    def test_one_pool_per_loop(self, pools):
+        async def twice():
+            return await get_async_pool(), await get_async_pool()
+
+        first, second = asyncio.run(twice())
+
+        assert first is second
+        assert len(pools) == 1
+
+    def test_new_loop_closes_the_old_pool(self, pools):
+        asyncio.run(get_async_pool())
+        asyncio.run(get_async_pool())
+
+        assert len(pools) == 2
+        pools[0].close.assert_awaited_once_with(timeout=0)
+        pools[1].close.assert_not_awaited()
+
+    def test_old_pool_of_a_closed_loop(self, pools):
+        asyncio.run(get_async_pool())
+        pools[0].close.side_effect = RuntimeError("Event loop is closed")
+
+        assert asyncio.run(get_async_pool()) is pools[1]
+
+    def test_checkouts_are_not_pinged(self, pools):
+        asyncio.run(get_async_pool())
+
+        kwargs = postgresql_async.AsyncConnectionPool.call_args.kwargs
+        assert "check" not in kwargs
+        assert kwargs["max_idle"] == 300.0
+
+    def test_close(self, pools):
+        async def open_and_close():
+            await get_async_pool()
+            await postgresql_async.close_async_pool()
+
+        asyncio.run(open_and_close())
+
+        pools[0].close.assert_awaited_once()
+        assert postgresql_async._async_pool is None
@@ -0,0 +1,182 @@
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+
+from src.adapters.db.postgresql_pool import (
+    PoolClosedError,
+    PoolTimeoutError,
+    PostgreSQLConnectionPool,
+)
+
+
+def make_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+
+    def close():
+        conn.closed = 1
+
+    conn.close.side_effect = close
+    return conn
+
+
+@pytest.fixture
+def connect():
+    return Mock(side_effect=lambda: make_connection())
+
+
+class TestCheckout:
+    def test_reuses_returned_connection(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=2)
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        assert pool.getconn() is conn
+        assert connect.call_count == 1
+
+    def test_opens_connections_lazily_up_to_max_size(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=2, timeout=0.01)
+
+        first = pool.getconn()
+        second = pool.getconn()
+
+        assert first is not second
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+        assert pool.stats()["checkout_timeouts"] == 1
+
+    def test_waiting_checkout_gets_released_connection(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1, timeout=1)
+        conn = pool.getconn()
+
+        timer = threading.Timer(0.05, pool.putconn, args=(conn,))
+        timer.start()
+
+        assert pool.getconn() is conn
+        timer.join()
+
+    def test_failed_connect_releases_slot(self):
+        connect = Mock(side_effect=[OperationalError("down"), make_connection()])
+        pool = PostgreSQLConnectionPool(connect, max_size=1, timeout=0.01)
+
+        with pytest.raises(OperationalError):
+            pool.getconn()
+
+        assert pool.getconn() is not None
+        assert pool.stats()["size"] == 1
+
+    def test_context_manager_returns_connection(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1)
+
+        with pool.connection() as conn:
+            assert pool.stats()["in_use"] == 1
+
+        assert pool.stats()["idle"] == 1
+        assert pool.getconn() is conn
+
+
+class TestHealth:
+    def test_pings_connection_idle_longer_than_check_interval(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1, check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        assert pool.getconn() is conn
+        conn.cursor.return_value.__enter__.return_value.execute.assert_called_with(
+            "SELECT 1"
+        )
+
+    def test_replaces_connection_failing_health_check(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1, check_interval=0)
+        broken = pool.getconn()
+        pool.putconn(broken)
+        cursor = broken.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = OperationalError("server closed the connection")
+
+        conn = pool.getconn()
+
+        assert conn is not broken
+        assert broken.closed
+        assert pool.stats()["health_check_failures"] == 1
+        assert pool.stats()["size"] == 1
+
+    def test_discards_closed_connection_on_return(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1)
+        conn = pool.getconn()
+        conn.closed = 2
+
+        pool.putconn(conn)
+
+        assert pool.stats()["size"] == 0
+        assert pool.getconn() is not conn
+
+    def test_rolls_back_open_transaction_on_return(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1)
+        conn = pool.getconn()
+        conn.get_transaction_status.return_value = TRANSACTION_STATUS_INERROR
+
+        pool.putconn(conn)
+
+        conn.rollback.assert_called_once()
+        assert pool.stats()["idle"] == 1
+
+
+class TestLifetime:
+    def test_recycles_connection_past_max_lifetime(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1, max_lifetime=60)
+
+        with patch("src.adapters.db.postgresql_pool.time.monotonic") as monotonic:
+            monotonic.return_value = 1000.0
+            old = pool.getconn()
+            monotonic.return_value = 1061.0
+            pool.putconn(old)
+            new = pool.getconn()
+
+        assert new is not old
+        assert old.closed
+        assert pool.stats()["connections_recycled"] == 1
+
+
+class TestClose:
+    def test_close_closes_idle_connections_and_rejects_checkouts(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=2)
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        pool.close()
+
+        assert conn.closed
+        with pytest.raises(PoolClosedError):
+            pool.getconn()
+
+    def test_connection_returned_after_close_is_closed(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=1)
+        conn = pool.getconn()
+
+        pool.close()
+        pool.putconn(conn)
+
+        assert conn.closed
+        assert pool.stats()["size"] == 0
+
+
+class TestStats:
+    def test_stats_track_usage(self, connect):
+        pool = PostgreSQLConnectionPool(connect, max_size=3)
+        first = pool.getconn()
+        pool.getconn()
+        pool.putconn(first)
+
+        stats = pool.stats()
+
+        assert stats["max_size"] == 3
+        assert stats["size"] == 2
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 1
+        assert stats["checkouts"] == 2
+        assert stats["connections_created"] == 2
@@ -0,0 +1,166 @@
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from src.adapters.db.sqlite import SQLiteDBAdapter
+from src.schemas.common import Operator
+
+
+@pytest.fixture
+def adapter():
+    adapter = SQLiteDBAdapter(Mock(), ":memory:")
+    adapter.cursor.execute("CREATE TABLE products (_id TEXT PRIMARY KEY, name TEXT)")
+    adapter.use_table("products")
+    yield adapter
+    adapter.conn.close()
+
+
+class TestBulkWrites:
+    def test_create_many(self, adapter):
+        adapter.create_one({"id": "a", "name": "Milk"})
+
+        result = adapter.create_many(
+            [
+                {"id": "a", "name": "Oat milk"},
+                {"id": "b", "name": "Bread"},
+                {"id": "b", "name": "Rye bread"},
+            ]
+        )
+
+        assert result.ids == ["a", "b", "b"]
+        assert result.conflicts == ["a", "b"]
+        assert adapter.read_one("a")["name"] == "Milk"
+        assert adapter.read_one("b")["name"] == "Bread"
+
+    def test_create_many_generates_missing_ids(self, adapter):
+        result = adapter.create_many([{"name": "Milk"}])
+
+        assert adapter.read_one(result.ids[0])["name"] == "Milk"
+
+    def test_upsert_many(self, adapter):
+        adapter.create_one({"id": "a", "name": "Milk"})
+
+        result = adapter.upsert_many(
+            [{"id": "a", "name": "Oat milk"}, {"id": "b", "name": "Bread"}]
+        )
+
+        assert result.ids == ["a", "b"]
+        assert result.conflicts == ["a"]
+        assert adapter.read_one("a")["name"] == "Oat milk"
+        assert adapter.read_one("b")["name"] == "Bread"
+
+    def test_failed_batch_is_rolled_back(self, adapter):
+        with pytest.raises(sqlite3.OperationalError):
+            adapter.create_many([{"id": "a", "name": "Milk"}, {"id": "b", "size": 1}])
+
+        assert adapter.read_many() == []
+
+
+class TestIterMany:
+    def test_yields_rows_in_batches(self, adapter):
+        adapter.create_many([{"id": str(i), "name": f"Item {i}"} for i in range(5)])
+
+        rows = adapter.iter_many(batch_size=2)
+
+        assert next(rows) == {"_id": "0", "name": "Item 0"}
+        assert [row["_id"] for row in rows] == ["1", "2", "3", "4"]
+
+    def test_filters(self, adapter):
+        adapter.create_many([{"id": str(i), "name": f"Item {i % 2}"} for i in range(5)])
+
+        rows = list(adapter.iter_many({"name": "Item 1"}))
+
+        assert [row["_id"] for row in rows] == ["1", "3"]
+
+    def test_adapter_is_usable_while_iterating(self, adapter):
+        adapter.create_many([{"id": str(i), "name": "Milk"} for i in range(3)])
+
+        for row in adapter.iter_many(batch_size=1):
+            adapter.update_one(row["_id"], {"name": "Oat milk"})
+
+        assert {row["name"] for row in adapter.read_many()} == {"Oat milk"}
+
+
+class TestReadMany:
+    def test_between_with_order_and_offset(self, adapter):
+        adapter.create_many([{"id": str(i), "name": f"Item {i}"} for i in range(6)])
+
+        rows = adapter.read_many(
+            {"_id": (Operator.BETWEEN, ("1", "4"))},
+            limit=2,
+            offset=1,
+            order_by="-_id",
+        )
+
+        assert [row["_id"] for row in rows] == ["3", "2"]
+
+    def test_order_by_id(self, adapter):
+        adapter.create_many([{"id": str(i), "name": f"Item {i}"} for i in range(3)])
+
+        assert [row["_id"] for row in adapter.read_many(order_by="-id")] == [
+            "2",
+            "1",
+            "0",
+        ]
+
+    def test_order_by_must_be_a_column(self, adapter):
+        with pytest.raises(ValueError):
+            adapter.read_many(order_by="name; DROP TABLE products")
+
+
+class TestReadPage:
+    def test_pages_follow_the_cursor(self, adapter):
+        adapter.create_many([{"id": str(i), "name": f"Item {i % 3}"} for i in range(7)])
+
+        pages, after = [], None
+        while True:
+            page = adapter.read_page(limit=3, order_by="-name", after=after)
+            pages.append([row["_id"] for row in page.items])
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+
+        assert pages == [["5", "2", "4"], ["1", "6", "3"], ["0"]]
+
+    def test_order_by_must_be_a_column(self, adapter):
+        with pytest.raises(ValueError):
+            adapter.read_page(order_by="(SELECT 1)")
+
+    def test_where(self, adapter):
+        adapter.create_many([{"id": str(i), "name": "Milk"} for i in range(3)])
+
+        page = adapter.read_page({"_id": (Operator.NE, "1")}, limit=5)
+
+        assert [row["_id"] for row in page.items] == ["0", "2"]
+        assert page.next_cursor is None
+
+
+class TestSearch:
+    def test_ranked_and_paged(self, adapter):
+        adapter.create_many(
+            [
+                {"id": "a", "name": "Lapte de soia"},
+                {"id": "b", "name": "Lapte"},
+                {"id": "c", "name": "Paine"},
+            ]
+        )
+
+        first = adapter.search("lapte", limit=1)
+        second = adapter.search("lapte", limit=1, after=first.next_cursor)
+
+        assert [row["_id"] for row in first.items] == ["b"]
+        assert [row["_id"] for row in second.items] == ["a"]
+        assert second.next_cursor is None
+        assert first.items[0]["score"] > second.items[0]["score"]
+
+    def test_where_and_writes_after_the_first_search(self, adapter):
+        adapter.create_many(
+            [{"id": "a", "name": "Lapte"}, {"id": "b", "name": "Lapte"}]
+        )
+        adapter.search("lapte")
+
+        adapter.create_one({"id": "c", "name": "Lapte ovaz"})
+        page = adapter.search("lapet", where={"_id": (Operator.NE, "a")})
+
+        assert [row["_id"] for row in page.items] == ["b", "c"]
@@ -0,0 +1,106 @@
+import logging
+import threading
+from contextvars import copy_context
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.adapters.logger import appwrite
+from src.adapters.logger.appwrite import (
+    AppwriteHandler,
+    appwrite_context,
+    appwrite_request,
+    get_appwrite_logger,
+    log_level,
+)
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("pbapi.test_appwrite")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.handlers = [AppwriteHandler()]
+    return logger
+
+
+class TestAppwriteRequest:
+    def test_records_reach_the_context_they_were_logged_in(self, logger):
+        contexts = [Mock(), Mock()]
+
+        for i, context in enumerate(contexts):
+            with appwrite_request(context):
+                logger.info("request %s", i)
+                context.log.assert_not_called()
+        logger.info("no request")
+
+        contexts[0].log.assert_called_once_with("request 0")
+        contexts[1].log.assert_called_once_with("request 1")
+        assert appwrite_context.get() is None
+
+    def test_errors_and_records_from_threads(self, logger):
+        context = Mock()
+
+        with appwrite_request(context):
+            thread_context = copy_context()
+            thread = threading.Thread(
+                target=thread_context.run, args=(logger.error, "in a thread")
+            )
+            thread.start()
+            thread.join()
+
+        context.error.assert_called_once_with("in a thread")
+
+    def test_records_are_written_when_the_request_fails(self, logger):
+        context = Mock()
+
+        with pytest.raises(RuntimeError):
+            with appwrite_request(context):
+                logger.info("before the error")
+                raise RuntimeError
+
+        context.log.assert_called_once_with("before the error")
+
+
+class TestLogLevel:
+    def test_unset_uses_the_default(self, monkeypatch):
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+
+        assert log_level(logging.DEBUG) == logging.DEBUG
+
+    def test_level_name(self, monkeypatch):
+        monkeypatch.setenv("LOG_LEVEL", " warning ")
+
+        assert log_level(logging.DEBUG) == logging.WARNING
+
+    def test_unknown_level_uses_the_default(self, monkeypatch, caplog):
+        monkeypatch.setenv("LOG_LEVEL", "LOUD")
+
+        with patch.object(logging.getLogger("pbapi"), "propagate", True):
+            assert log_level(logging.INFO) == logging.INFO
+
+        assert "'LOUD' is not a log level" in caplog.text
+
+
+class TestGetAppwriteLogger:
+    @pytest.fixture
+    def logger_class(self, monkeypatch):
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+        monkeypatch.setattr(appwrite, "_logger", None)
+        with patch.object(appwrite, "AppwriteLogger") as logger_class:
+            yield logger_class
+
+    def test_debug_when_run_locally(self, logger_class):
+        logger = get_appwrite_logger()
+
+        assert get_appwrite_logger() is logger
+        logger_class.assert_called_once_with(level=logging.DEBUG, queue_size=10000)
+
+    def test_info_under_appwrite(self, logger_class):
+        token = appwrite_context.set(Mock())
+        try:
+            get_appwrite_logger()
+        finally:
+            appwrite_context.reset(token)
+
+        logger_class.assert_called_once_with(level=logging.INFO, queue_size=10000)
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.adapters.logger.queued import BoundedQueueHandler
+from src.helpers.common import LazyStr
+
+
+class BlockingHandler(logging.Handler):
+    """Records its messages; holds the listener until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.released.wait(timeout=5)
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test.queued.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+@pytest.fixture
+def output():
+    handler = BlockingHandler()
+    yield handler
+    handler.released.set()
+
+
+class TestBoundedQueueHandler:
+    def test_records_are_handled_in_the_background(self, output):
+        queued = BoundedQueueHandler(output, max_size=10)
+        queued.start()
+        logger = make_logger("background", queued)
+
+        logger.info("one")
+        logger.info("two")
+        assert output.messages == []
+
+        output.released.set()
+        assert asyncio.run(queued.drain(timeout=5))
+        queued.close()
+        assert output.messages == ["one", "two"]
+
+    def test_full_queue_drops_records_below_error(self, output):
+        queued = BoundedQueueHandler(output, max_size=2)
+        logger = make_logger("drop", queued)
+
+        for i in range(4):
+            logger.info("info %s", i)
+
+        assert queued.stats() == {"queued": 2, "max_size": 2, "dropped": 2}
+        queued.start()
+        output.released.set()
+        queued.close()
+        assert output.messages == ["info 0", "info 1"]
+
+    def test_full_queue_keeps_errors_over_the_oldest(self, output):
+        queued = BoundedQueueHandler(output, max_size=2)
+        logger = make_logger("errors", queued)
+
+        logger.info("info 0")
+        logger.info("info 1")
+        logger.error("error")
+
+        assert queued.stats()["dropped"] == 1
+        queued.start()
+        output.released.set()
+        queued.close()
+        assert output.messages == ["info 1", "error"]
+
+    def test_drain_times_out(self, output):
+        queued = BoundedQueueHandler(output, max_size=10)
+        queued.start()
+        logger = make_logger("timeout", queued)
+
+        logger.info("held")
+
+        assert not asyncio.run(queued.drain(timeout=0.01))
+        output.released.set()
+        queued.close()
+
+    def test_lazy_payload_not_formatted_below_level(self, output):
+        output.setLevel(logging.WARNING)
+        queued = BoundedQueueHandler(output, max_size=10)
+        logger = make_logger("lazy", queued)
+        dump = Mock(return_value={"id": 1})
+
+        logger.debug("%s", LazyStr(dump))
+        logger.info("%s", LazyStr(dump))
+
+        dump.assert_not_called()
+        assert queued.stats()["queued"] == 0
+
+    def test_lazy_payload_formatted_in_the_listener(self, output):
+        queued = BoundedQueueHandler(output, max_size=10)
+        logger = make_logger("listener", queued)
+        dump = Mock(return_value={"id": 1})
+
+        logger.info("%s", LazyStr(dump))
+        dump.assert_not_called()
+
+        queued.start()
+        output.released.set()
+        queued.close()
+        dump.assert_called_once()
+        assert output.messages == ["{'id': 1}"]
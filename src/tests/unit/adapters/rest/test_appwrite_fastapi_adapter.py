@@ -0,0 +1,161 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from src.adapters.logger.appwrite import AppwriteLogger
+from src.adapters.rest.appwrite_fastapi_adapter import (
+    AppwriteFastAPIAdapter,
+    stream_methods,
+)
+
+app = FastAPI()
+logger = AppwriteLogger().log
+
+
+@app.get("/json")
+async def json_route():
+    return {"items": [{"id": i, "name": "Lapte"} for i in range(3)]}
+
+
+@app.get("/text")
+async def text_route():
+    return PlainTextResponse("hello", status_code=201)
+
+
+@app.get("/stream")
+async def stream_route():
+    async def lines():
+        for i in range(3):
+            yield f"{i}\n".encode()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/log")
+async def log_route():
+    logger.info("async route")
+    return {}
+
+
+@app.get("/log-sync")
+def log_sync_route():
+    logger.error("sync route")
+    return {}
+
+
+def make_context(path: str, res_methods: list[str]):
+    context = Mock()
+    context.req.headers = {"Accept": "application/json"}
+    context.req.method = "GET"
+    context.req.path = path
+    context.req.query_string = ""
+    context.req.body_text = ""
+    context.res = Mock(spec=res_methods)
+    return context
+
+
+def handle(context):
+    return asyncio.run(AppwriteFastAPIAdapter(app).handle(context))
+
+
+class TestStreamMethods:
+    def test_streaming_runtime(self):
+        res = Mock(spec=["start", "writeBinary", "end"])
+
+        assert stream_methods(res) == (res.start, res.writeBinary, res.end)
+
+    def test_older_runtime(self):
+        assert stream_methods(Mock(spec=["send", "json", "binary"])) is None
+
+
+class TestAppwriteFastAPIAdapter:
+    def test_json_bytes_pass_through(self):
+        context = make_context("/json", ["send", "json", "binary"])
+
+        result = handle(context)
+
+        assert result is context.res.binary.return_value
+        body, status, headers = context.res.binary.call_args.args
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {
+            "items": [{"id": i, "name": "Lapte"} for i in range(3)]
+        }
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        context.res.json.assert_not_called()
+
+    def test_text(self):
+        context = make_context("/text", ["send", "json", "binary"])
+
+        handle(context)
+
+        body, status, headers = context.res.binary.call_args.args
+        assert body == b"hello"
+        assert status == 201
+        assert headers["content-type"].startswith("text/plain")
+
+    def test_runtime_without_binary_gets_text(self):
+        context = make_context("/json", ["send", "json"])
+
+        handle(context)
+
+        body, status, headers = context.res.send.call_args.args
+        assert json.loads(body)["items"][0]["id"] == 0
+        assert headers["content-type"] == "application/json"
+
+    def test_streamed_response(self):
+        context = make_context(
+            "/stream", ["send", "json", "binary", "start", "writeBinary", "end"]
+        )
+
+        result = handle(context)
+
+        assert result is context.res.end.return_value
+        status, headers = context.res.start.call_args.args
+        assert status == 200
+        assert "content-length" not in headers
+        assert b"".join(
+            call.args[0] for call in context.res.writeBinary.call_args_list
+        ) == (b"0\n1\n2\n")
+        context.res.binary.assert_not_called()
+
+    def test_streamed_response_is_buffered_without_runtime_streaming(self):
+        context = make_context("/stream", ["send", "json", "binary"])
+
+        handle(context)
+
+        body, _, headers = context.res.binary.call_args.args
+        assert body == b"0\n1\n2\n"
+        assert headers["content-type"] == "application/x-ndjson"
+
+    @pytest.mark.parametrize("res_methods", [["send", "binary"], ["send"]])
+    def test_empty_body(self, res_methods):
+        empty = FastAPI()
+
+        @empty.get("/")
+        async def no_content():
+            from starlette.responses import Response
+
+            return Response(status_code=204)
+
+        context = make_context("/", res_methods)
+        asyncio.run(AppwriteFastAPIAdapter(empty).handle(context))
+
+        method = context.res.binary if "binary" in res_methods else context.res.send
+        assert method.call_args.args[1] == 204
+
+    def test_logs_reach_the_request_context(self):
+        first = make_context("/log", ["send", "binary"])
+        second = make_context("/log-sync", ["send", "binary"])
+
+        handle(first)
+        handle(second)
+
+        first.log.assert_called_once_with("INFO: async route")
+        first.error.assert_not_called()
+        second.error.assert_called_once_with("ERROR: sync route")
+        second.log.assert_not_called()
@@ -0,0 +1,203 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import constants as c
+from src.adapters import doppler
+
+KEY = "cache-key"
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    for name in c.REQUIRED_ENV_VAR_NAMES:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv(c.DOPPLER_TOKEN_NAME, "token")
+    monkeypatch.setenv("DOPPLER_ENVIRONMENT", "test")
+    monkeypatch.setenv("DOPPLER_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setenv(c.DOPPLER_CACHE_KEY_NAME, KEY)
+    with patch.object(doppler, "load_dotenv"):
+        yield monkeypatch
+
+
+def make_stale(path):
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+
+@pytest.fixture
+def secrets():
+    return {name: f"{name.lower()}-value" for name in c.REQUIRED_ENV_VAR_NAMES}
+
+
+class TestLoadDopplerSecrets:
+    def test_fetches_without_snapshot(self, env, secrets):
+        with patch.object(
+            doppler, "fetch_doppler_secrets", return_value=secrets
+        ) as fetch:
+            doppler.load_doppler_secrets()
+
+        fetch.assert_called_once_with("token", "test")
+        assert not os.path.exists(doppler.snapshot_path("test"))
+        for name, value in secrets.items():
+            assert os.environ[name] == value
+
+    def test_no_snapshot_without_cache_key(self, env, secrets):
+        env.delenv(c.DOPPLER_CACHE_KEY_NAME)
+
+        with patch.object(
+            doppler, "fetch_doppler_secrets", return_value=secrets
+        ) as fetch:
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        fetch.assert_called_once()
+        assert not os.path.exists(doppler.snapshot_path("test"))
+
+    def test_saves_snapshot_in_a_private_directory(self, env, secrets):
+        with patch.object(doppler, "fetch_doppler_secrets", return_value=secrets):
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        path = doppler.snapshot_path("test")
+        assert doppler.read_snapshot(path, KEY) == secrets
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+
+    def test_default_directory_is_per_user(self, env):
+        env.delenv("DOPPLER_SNAPSHOT_DIR")
+
+        assert doppler.snapshot_dir() == os.path.join(
+            tempfile.gettempdir(), f"pbapi-doppler-{os.getuid()}"
+        )
+
+    def test_fresh_snapshot_skips_fetch(self, env, secrets):
+        doppler.write_snapshot(doppler.snapshot_path("test"), secrets, KEY)
+
+        with patch.object(doppler, "fetch_doppler_secrets") as fetch:
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        fetch.assert_not_called()
+        for name, value in secrets.items():
+            assert os.environ[name] == value
+
+    def test_stale_snapshot_used_and_refreshed_in_background(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        doppler.write_snapshot(path, secrets, KEY)
+        make_stale(path)
+        fresh = {name: "fresh" for name in secrets}
+        doppler_answers = threading.Event()
+
+        def slow_fetch(*_):
+            doppler_answers.wait(timeout=5)
+            return fresh
+
+        with patch.object(doppler, "fetch_doppler_secrets", side_effect=slow_fetch):
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+            for name, value in secrets.items():
+                assert os.environ[name] == value
+            assert doppler.read_snapshot(path, KEY) == secrets
+
+            doppler_answers.set()
+            for thread in threading.enumerate():
+                if thread.name == "doppler-refresh":
+                    thread.join(timeout=5)
+
+        assert doppler.read_snapshot(path, KEY) == fresh
+
+    def test_stale_snapshot_kept_when_refresh_fails(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        doppler.write_snapshot(path, secrets, KEY)
+        make_stale(path)
+
+        with patch.object(
+            doppler, "fetch_doppler_secrets", side_effect=ConnectionError("down")
+        ):
+            doppler.refresh_snapshot("token", "test", path, KEY).join(timeout=5)
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        assert doppler.read_snapshot(path, KEY) == secrets
+        for name, value in secrets.items():
+            assert os.environ[name] == value
+
+    def test_snapshot_past_its_max_age_is_refetched(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        doppler.write_snapshot(path, {"OLD": "value"}, KEY)
+        make_stale(path)
+
+        with patch.object(
+            doppler, "fetch_doppler_secrets", return_value=secrets
+        ) as fetch:
+            doppler.load_doppler_secrets(snapshot_ttl=60, snapshot_max_age=90)
+
+        fetch.assert_called_once()
+        assert "OLD" not in os.environ
+        assert doppler.read_snapshot(path, KEY) == secrets
+
+    def test_fetch_error_without_snapshot_raises(self, env):
+        with patch.object(
+            doppler, "fetch_doppler_secrets", side_effect=ConnectionError("down")
+        ):
+            with pytest.raises(ConnectionError):
+                doppler.load_doppler_secrets(snapshot_ttl=60)
+
+    def test_snapshot_is_encrypted(self, env, secrets):
+        with patch.object(doppler, "fetch_doppler_secrets", return_value=secrets):
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        path = doppler.snapshot_path("test")
+        with open(path, "rb") as f:
+            data = f.read()
+        assert all(value.encode() not in data for value in secrets.values())
+        assert doppler.read_snapshot(path, "other-key") is None
+        assert doppler.read_snapshot(path, KEY) == secrets
+
+    def test_snapshot_with_another_key_is_refetched(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        doppler.write_snapshot(path, {"OLD": "value"}, "old-key")
+
+        with patch.object(
+            doppler, "fetch_doppler_secrets", return_value=secrets
+        ) as fetch:
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        fetch.assert_called_once()
+        assert doppler.read_snapshot(path, KEY) == secrets
+
+    def test_snapshot_others_can_read_is_ignored(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        doppler.write_snapshot(path, secrets, KEY)
+        os.chmod(path, 0o644)
+
+        assert doppler.read_snapshot(path, KEY) is None
+
+    def test_symlinked_snapshot_is_ignored(self, env, secrets, tmp_path):
+        target = str(tmp_path / "elsewhere")
+        doppler.write_snapshot(target, secrets, KEY)
+        path = doppler.snapshot_path("test")
+        os.makedirs(os.path.dirname(path), mode=0o700)
+        os.symlink(target, path)
+
+        assert doppler.read_snapshot(path, KEY) is None
+
+    def test_snapshot_not_saved_in_a_shared_directory(self, env, secrets):
+        path = doppler.snapshot_path("test")
+        os.makedirs(os.path.dirname(path), mode=0o755)
+        os.chmod(os.path.dirname(path), 0o755)
+
+        doppler.write_snapshot(path, secrets, KEY)
+
+        assert not os.path.exists(path)
+
+    def test_secrets_in_env_skip_doppler(self, env, secrets):
+        for name, value in secrets.items():
+            env.setenv(name, value)
+
+        with patch.object(doppler, "fetch_doppler_secrets") as fetch:
+            doppler.load_doppler_secrets(snapshot_ttl=60)
+
+        fetch.assert_not_called()
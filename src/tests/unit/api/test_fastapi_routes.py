@@ -1,15 +1,21 @@
 import asyncio
+import json
 import logging
-from unittest.mock import Mock, patch
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID
 
 import pytest
 from fastapi import HTTPException
 from starlette.requests import Request
 
+from src.adapters.logger.queued import BoundedQueueHandler
 from src.adapters.rest import fastapi_routes
 from src.schemas.common import QuantityUnit
-from src.schemas.request_schemas import GetOrCreateUserByIdentityRequest
+from src.schemas.request_schemas import (
+    AddBarcodesRequest,
+    GetOrCreateUserByIdentityRequest,
+)
 from src.schemas.user_identity import IdentityProvider
 from src.schemas.purchased_item import PurchasedItem
 from src.tests.unit import make_receipt
@@ -36,27 +42,15 @@ def make_request(scope_overrides=None):
 
 
 class TestGetLogger:
-    def test_returns_appwrite_logger_when_context_present(self):
-        mock_logger = Mock(spec=logging.Logger)
-        request = make_request({"appwrite_context": Mock()})
+    def test_returns_the_one_pbapi_logger(self):
+        first = run_async(fastapi_routes.get_logger())
+        second = run_async(fastapi_routes.get_logger())
 
-        with patch("src.adapters.rest.fastapi_routes.AppwriteLogger") as mock_appwrite:
-            mock_appwrite.return_value.log = mock_logger
-            result = fastapi_routes.get_logger(request)
-
-        assert result is mock_logger
-        mock_appwrite.assert_called_once()
-
-    def test_returns_default_logger_when_no_context(self):
-        mock_logger = Mock(spec=logging.Logger)
-        request = make_request()
-
-        with patch("src.adapters.rest.fastapi_routes.DefaultLogger") as mock_default:
-            mock_default.return_value.log = mock_logger
-            result = fastapi_routes.get_logger(request)
-
-        assert result is mock_logger
-        mock_default.assert_called_once_with(level=logging.DEBUG)
+        assert first is second is logging.getLogger("pbapi")
+        queue_handlers = [
+            h for h in first.handlers if isinstance(h, BoundedQueueHandler)
+        ]
+        assert len(queue_handlers) == 1
 
 
 class TestUserRoutes:
@@ -71,7 +65,7 @@ class TestUserRoutes:
         expected_response = {"id": "user_1"}
 
         with patch(
-            "src.adapters.rest.fastapi_routes.UserIdentityHandler"
+            "src.adapters.rest.fastapi_routes.AsyncUserIdentityHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create_user_by_identity.return_value = (
                 expected_response
@@ -101,7 +95,7 @@ class TestUserRoutes:
         )
 
         with patch(
-            "src.adapters.rest.fastapi_routes.UserIdentityHandler"
+            "src.adapters.rest.fastapi_routes.AsyncUserIdentityHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create_user_by_identity.return_value = {
                 "id": "user_2"
@@ -126,7 +120,7 @@ class TestReceiptRoutes:
         expected_response = {"id": "receipt_1"}
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = expected_response
 
@@ -155,7 +149,7 @@ class TestReceiptRoutes:
         ]
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -172,7 +166,7 @@ class TestReceiptRoutes:
         url = "https://example.com/receipt/42"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_by_url.return_value = receipt
 
@@ -192,7 +186,7 @@ class TestReceiptRoutes:
         url = "https://example.com/nonexistent/receipt"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_by_url.return_value = None
 
@@ -212,7 +206,7 @@ class TestReceiptRoutes:
         url = "https://example.com/receipt/42?param=value&other=test#anchor"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             receipt = make_receipt()
             receipt.receipt_url = url
@@ -233,7 +227,7 @@ class TestReceiptRoutes:
         request = make_receipt()
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = request
 
@@ -246,7 +240,7 @@ class TestReceiptRoutes:
         logger = Mock()
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_by_url.return_value = None
 
@@ -266,7 +260,7 @@ class TestReceiptRoutes:
         request.shop_id = UUID("87654321-4321-8765-4321-876543210987")
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = request
 
@@ -285,7 +279,7 @@ class TestReceiptRoutes:
         long_url = "https://example.com/" + "a" * 1000 + "/receipt/42"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             receipt = make_receipt()
             receipt.receipt_url = long_url
@@ -306,7 +300,7 @@ class TestReceiptRoutes:
         url_with_unicode = "https://example.com/receipt/42?name=тест&item=café"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             receipt = make_receipt()
             receipt.receipt_url = url_with_unicode
@@ -327,7 +321,7 @@ class TestReceiptRoutes:
         receipt.total_amount = 0.0
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -343,7 +337,7 @@ class TestReceiptRoutes:
         receipt.total_amount = -10.50
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -359,7 +353,7 @@ class TestReceiptRoutes:
         receipt.total_amount = 999999.99
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -379,7 +373,7 @@ class TestReceiptRoutes:
         ]
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -404,7 +398,7 @@ class TestReceiptRoutes:
         ]
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -419,7 +413,7 @@ class TestReceiptRoutes:
         url = "https://example.com/receipt/42"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_by_url.side_effect = Exception(
                 "Database connection error"
@@ -440,7 +434,7 @@ class TestReceiptRoutes:
         receipt = make_receipt()
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.side_effect = ValueError(
                 "Invalid receipt data"
@@ -452,6 +446,39 @@ class TestReceiptRoutes:
             except ValueError as e:
                 assert str(e) == "Invalid receipt data"
 
+    def test_receipt_handler_is_closed_after_request(self):
+        logger = Mock()
+        receipt = make_receipt()
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
+        ) as mock_handler:
+            mock_handler.return_value.get_or_create.return_value = receipt
+
+            run_async(fastapi_routes.get_or_create_receipt(receipt, logger=logger))
+
+        mock_handler.return_value.close.assert_called_once()
+
+    def test_receipt_handler_is_closed_when_handler_fails(self):
+        logger = Mock()
+        url = "https://example.com/receipt/42"
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
+        ) as mock_handler:
+            mock_handler.return_value.get_by_url.side_effect = Exception(
+                "Database connection error"
+            )
+
+            from src.schemas.request_schemas import GetReceiptByUrlRequest
+
+            request = GetReceiptByUrlRequest(url=url)
+
+            with pytest.raises(Exception):
+                run_async(fastapi_routes.get_receipt_by_url(request, logger=logger))
+
+        mock_handler.return_value.close.assert_called_once()
+
     def test_get_receipt_by_url_same_handler_instance(self):
         """Verify handler instance is consistent across calls"""
         logger = Mock()
@@ -459,9 +486,9 @@ class TestReceiptRoutes:
         receipt = make_receipt()
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
-            mock_instance = Mock()
+            mock_instance = AsyncMock()
             mock_handler.return_value = mock_instance
             mock_instance.get_by_url.return_value = receipt
 
@@ -482,7 +509,7 @@ class TestReceiptRoutes:
         receipt.shop_id = None
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -498,7 +525,7 @@ class TestReceiptRoutes:
         receipt.receipt_canonical_url = None
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -513,7 +540,7 @@ class TestReceiptRoutes:
         url = "https://example.com/receipt/42"
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_by_url.return_value = None
 
@@ -532,7 +559,7 @@ class TestReceiptRoutes:
         receipt = make_receipt()
 
         with patch(
-            "src.adapters.rest.fastapi_routes.SfsMdReceiptHandler"
+            "src.adapters.rest.fastapi_routes.AsyncSfsMdReceiptHandler", autospec=True
         ) as mock_handler:
             mock_handler.return_value.get_or_create.return_value = receipt
 
@@ -572,3 +599,118 @@ class TestHealthRoutes:
         assert result.message == "Plant-Based API is healthy"
         mock_sleep.assert_called_once_with(1)
         logger.info.assert_called_with("Deep ping endpoint called")
+
+    def test_receipt_cache_returns_stats(self):
+        logger = Mock()
+
+        with patch("src.adapters.rest.fastapi_routes.get_receipt_cache") as mock_cache:
+            mock_cache.return_value.stats.return_value = {"hits": 3}
+            result = run_async(fastapi_routes.receipt_cache_stats(logger=logger))
+
+        assert result == {"hits": 3}
+        logger.info.assert_called_with("Receipt cache stats endpoint called")
+
+    def test_receipt_url_filter_disabled(self):
+        logger = Mock()
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.get_receipt_url_filter",
+            return_value=None,
+        ):
+            result = run_async(fastapi_routes.receipt_url_filter_stats(logger=logger))
+
+        assert result == {"enabled": False}
+
+
+class TestShopRoutes:
+    def test_list_shops(self):
+        logger = Mock()
+        request = make_request(
+            {"path": "/shops", "query_string": b"limit=2&cursor=abc"}
+        )
+        body = {"items": [{"id": 1}], "next_cursor": "def"}
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.shops_handler",
+            return_value=(HTTPStatus.OK, body),
+        ) as mock_handler:
+            result = run_async(fastapi_routes.list_shops(request, logger=logger))
+
+        assert result == body
+        mock_handler.assert_called_once_with({"limit": "2", "cursor": "abc"}, logger)
+
+    def test_list_shops_invalid_cursor(self):
+        request = make_request({"path": "/shops", "query_string": b"cursor=abc"})
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.shops_handler",
+            return_value=(HTTPStatus.BAD_REQUEST, {"msg": "Invalid cursor"}),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                run_async(fastapi_routes.list_shops(request, logger=Mock()))
+
+        assert exc_info.value.status_code == 400
+
+    def test_nearby_shops(self):
+        logger = Mock()
+
+        with patch("src.adapters.rest.fastapi_routes.get_shop_index") as mock_index:
+            mock_index.return_value.ready = True
+            mock_index.return_value.nearby.return_value = [{"id": 1}]
+            result = run_async(
+                fastapi_routes.nearby_shops(
+                    47.0, 28.8, limit=5, radius_m=None, logger=logger
+                )
+            )
+
+        assert result == {"items": [{"id": 1}]}
+        mock_index.return_value.nearby.assert_called_once_with(
+            47.0, 28.8, limit=5, radius_m=None
+        )
+
+    def test_nearby_shops_index_not_ready(self):
+        with (
+            patch("src.adapters.rest.fastapi_routes.get_shop_index") as mock_index,
+            patch("src.adapters.rest.fastapi_routes.SHOP_INDEX_WAIT_SECONDS", 0),
+        ):
+            mock_index.return_value.ready = False
+            mock_index.return_value.wait_ready.return_value = False
+            with pytest.raises(HTTPException) as exc_info:
+                run_async(
+                    fastapi_routes.nearby_shops(
+                        47.0, 28.8, limit=5, radius_m=None, logger=Mock()
+                    )
+                )
+
+        assert exc_info.value.status_code == 503
+
+
+class TestBarcodeRoutes:
+    def test_add_barcodes(self):
+        logger = Mock()
+        request = AddBarcodesRequest(
+            shop_id="7", items=[{"purchase_id": "Tofu_0", "status": "missing"}]
+        )
+        body = {"msg": "ok", "possible_duplicates": []}
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.add_barcodes_handler",
+            return_value=(HTTPStatus.OK, body),
+        ) as mock_handler:
+            result = run_async(fastapi_routes.add_barcodes(request, logger=logger))
+
+        assert result == body
+        mock_handler.assert_called_once_with(7, request.items, logger)
+
+    def test_add_barcodes_keeps_invalid_items(self):
+        request = AddBarcodesRequest(shop_id=7, items=[{"status": "missing"}])
+        body = {"msg": "Failed to add some items", "invalid_items": [{"name": None}]}
+
+        with patch(
+            "src.adapters.rest.fastapi_routes.add_barcodes_handler",
+            return_value=(HTTPStatus.BAD_REQUEST, body),
+        ):
+            result = run_async(fastapi_routes.add_barcodes(request, logger=Mock()))
+
+        assert result.status_code == 400
+        assert json.loads(result.body) == body
@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.adapters.db.base import InvalidCursorError, Page
+from src.handlers import search
+from src.schemas.common import TableName
+
+
+@pytest.fixture
+def db():
+    with patch("src.handlers.search.init_async_db_session") as mock_init:
+        db = AsyncMock()
+        db.use_table = Mock()
+        db.__aenter__.return_value = db
+        mock_init.return_value = db
+        yield db
+
+
+class TestSearchItems:
+    def test_searches_shop_items(self, db):
+        page = Page(items=[{"id": "a", "name": "Lapte", "score": 2.0}])
+        db.search.return_value = page
+
+        result = asyncio.run(
+            search.search_items(
+                "lapte", shop_id=7, limit=10, cursor="abc", request_logger=Mock()
+            )
+        )
+
+        assert result == page
+        db.use_table.assert_called_once_with(TableName.SHOP_ITEM)
+        db.search.assert_awaited_once_with(
+            "lapte", 10, where={"shop_id": 7}, after="abc"
+        )
+
+    def test_invalid_cursor(self, db):
+        db.search.side_effect = InvalidCursorError("Invalid cursor")
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(
+                search.search_items(
+                    "lapte", shop_id=None, limit=10, cursor="x", request_logger=Mock()
+                )
+            )
+
+        assert exc_info.value.status_code == 400
+        db.__aexit__.assert_awaited()
@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.common import ItemBarcodeStatus, QuantityUnit
+from src.schemas.receipt_url import ReceiptUrl
+from src.schemas.sfs_md.receipt import SfsMdReceipt
+from src.schemas.user import Gender, User, UserRightsGroup
+from src.schemas.user_identity import IdentityProvider, UserIdentity
+from src.tests.unit import make_receipt
+
+USER_ID = "12345678-1234-5678-1234-567812345678"
+
+
+def receipt_row() -> dict:
+    """A receipt as read_receipt returns it from psycopg2."""
+    row = make_receipt().model_dump(mode="json")
+    row["date"] = datetime(2026, 2, 14, tzinfo=timezone.utc)
+    row["total_amount"] = Decimal("12.34")
+    row["purchases"] = [
+        {
+            "name": "Item A",
+            "quantity": 2,
+            "unit": "pcs",
+            "unit_quantity": None,
+            "price": 6.17,
+            "item_id": USER_ID,
+            "status": "added",
+        }
+    ]
+    return row
+
+
+class TestFromRow:
+    def test_matches_validated_receipt(self):
+        row = receipt_row()
+
+        receipt = SfsMdReceipt.from_row(row)
+
+        assert receipt == SfsMdReceipt(**row)
+        assert receipt.total_amount == 12.34
+        assert isinstance(receipt.total_amount, float)
+        assert receipt.user_id == UUID(USER_ID)
+        purchase = receipt.purchases[0]
+        assert purchase.item_id == UUID(USER_ID)
+        assert purchase.unit is QuantityUnit.PIECE
+        assert purchase.status is ItemBarcodeStatus.ADDED
+        assert purchase.quantity == 2.0
+        assert purchase.barcode_suggestions == []
+
+    def test_skips_post_init(self):
+        row = {"id": "stored", "url": "https://example.com", "receipt_id": "r1"}
+
+        assert ReceiptUrl.from_row(row).id == "stored"
+        assert ReceiptUrl(**row).id != "stored"
+
+    def test_skips_email_validation(self):
+        row = {"name": "Ana", "email": "legacy-login"}
+
+        assert User.from_row(row).email == "legacy-login"
+        with pytest.raises(ValidationError):
+            User(**row)
+
+    def test_still_validates_types(self):
+        with pytest.raises(ValidationError):
+            ReceiptUrl.from_row({"id": "a", "url": "u"})
+
+    def test_user_codes(self):
+        user = User.from_row(
+            {"id": USER_ID, "name": "Ana", "user_rights_group": 5, "gender": None}
+        )
+
+        assert user.user_rights_group is UserRightsGroup.ADMINISTRATOR
+        assert user.gender is None
+        assert user.model_dump()["user_rights_group"] == 5
+
+        assert User.from_row({"name": "Ana", "gender": 2}).gender is Gender.FEMALE
+
+    def test_user_identity(self):
+        identity = UserIdentity.from_row(
+            {"id": "tg1", "provider": "telegram", "user_id": USER_ID}
+        )
+
+        assert identity.provider is IdentityProvider.TELEGRAM
+        assert identity.user_id == UUID(USER_ID)
+
+    def test_models_without_python_checks_are_validated(self):
+        with pytest.raises(ValidationError):
+            UserIdentity.from_row({"id": "tg1", "provider": "fax", "user_id": USER_ID})
@@ -0,0 +1,62 @@
+import pytest
+
+from src.schemas.user import Gender, GenderCode, User, UserRightsGroup
+from src.schemas.user_identity import IdentityProvider
+
+
+class TestEnumLookups:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("tester", UserRightsGroup.TESTER),
+            (2, UserRightsGroup.TESTER),
+            (UserRightsGroup.ADMINISTRATOR, UserRightsGroup.ADMINISTRATOR),
+            (5, UserRightsGroup.ADMINISTRATOR),
+        ],
+    )
+    def test_user_rights_group(self, value, expected):
+        assert UserRightsGroup.get(value) is expected
+
+    @pytest.mark.parametrize("value", ["nobody", 0, 6, None, ["normal"]])
+    def test_unknown_user_rights_group(self, value):
+        with pytest.raises(ValueError):
+            UserRightsGroup.get(value)
+
+    def test_gender(self):
+        assert Gender.get("non-binary") is Gender.NON_BINARY
+        assert Gender.get(GenderCode.NON_BINARY.value) is Gender.NON_BINARY
+        with pytest.raises(ValueError):
+            Gender.get("unknown")
+
+    def test_identity_provider(self):
+        assert IdentityProvider.get("telegram") is IdentityProvider.TELEGRAM
+        with pytest.raises(ValueError):
+            IdentityProvider.get(1)
+
+
+class TestUser:
+    def test_loads_codes(self):
+        user = User(name="Ana", user_rights_group=3, gender=2)
+
+        assert user.user_rights_group is UserRightsGroup.CONTENT_MODERATOR
+        assert user.gender is Gender.FEMALE
+
+    @pytest.mark.parametrize("mode", ["python", "json"])
+    def test_dumps_codes(self, mode):
+        user = User(name="Ana", user_rights_group="tester", gender="other")
+
+        data = user.model_dump(mode=mode)
+
+        assert data["user_rights_group"] == 2
+        assert data["gender"] == 5
+
+    def test_round_trip(self):
+        user = User(name="Ana", user_rights_group="administrator")
+
+        assert User(**user.model_dump()) == user
+
+    def test_dump_without_gender(self):
+        data = User(name="Ana").model_dump(exclude={"user_rights_group"})
+
+        assert data["gender"] is None
+        assert "user_rights_group" not in data
@@ -1,14 +1,33 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from uuid import UUID
 
 import pytest
 
-from src.handlers.sfs_md.receipt import SfsMdReceiptHandler
-from src.schemas.common import TableName, ItemBarcodeStatus
+from src.handlers.sfs_md.receipt import (
+    AsyncSfsMdReceiptHandler,
+    SfsMdReceiptHandler,
+    get_receipt_cache,
+)
+from src.helpers.common import make_hash
+from src.schemas.common import TableName, ItemBarcodeStatus, Operator
+from src.schemas.purchased_item import PurchasedItem
 from src.schemas.sfs_md.receipt import SfsMdReceipt
 from src.tests.unit import make_receipt
 
 
+@pytest.fixture(autouse=True)
+def receipt_cache(monkeypatch):
+    monkeypatch.setattr("src.handlers.sfs_md.receipt._receipt_cache", None)
+    return get_receipt_cache()
+
+
+@pytest.fixture(autouse=True)
+def barcode_index():
+    with patch("src.handlers.sfs_md.receipt.get_barcode_index") as mock_get:
+        yield mock_get.return_value
+
+
 @pytest.fixture
 def mock_logger():
     return Mock()
@@ -17,14 +36,24 @@ def mock_logger():
 @pytest.fixture
 def handler(mock_logger):
     with patch("src.handlers.sfs_md.receipt.init_db_session") as mock_init:
-        mock_init.return_value = Mock()
+        mock_init.return_value = MagicMock()
         return SfsMdReceiptHandler(mock_logger)
 
 
+@pytest.fixture
+def async_handler(mock_logger):
+    with patch("src.handlers.sfs_md.receipt.init_async_db_session") as mock_init:
+        mock_init.return_value = Mock()
+        handler = AsyncSfsMdReceiptHandler(mock_logger)
+        handler.db = AsyncMock()
+        handler.db.use_table = Mock()
+        handler.db.transaction = MagicMock()
+        return handler
+
+
 class TestSfsMdReceiptHandlerGetByUrl:
     def test_get_by_url_success(self, handler, mock_logger):
         url = "https://example.com/receipt"
-        receipt_url_data = {"id": "hash123", "url": url, "receipt_id": "receipt123"}
         receipt_data = {
             "id": "receipt123",
             "date": "2026-02-14T00:00:00+00:00",
@@ -39,39 +68,29 @@ class TestSfsMdReceiptHandlerGetByUrl:
             "receipt_url": url,
         }
 
-        handler.db.read_one = Mock(side_effect=[receipt_url_data, receipt_data])
+        handler.db.read_receipt = Mock(return_value=receipt_data)
 
         with patch("src.handlers.sfs_md.receipt.make_hash", return_value="hash123"):
             result = handler.get_by_url(url)
 
         assert result is not None
         assert isinstance(result, SfsMdReceipt)
-        assert handler.db.use_table.call_count == 2
-
-    def test_get_by_url_receipt_url_not_found(self, handler, mock_logger):
-        url = "https://example.com/receipt"
-        handler.db.read_one = Mock(return_value=None)
-
-        with patch("src.handlers.sfs_md.receipt.make_hash", return_value="hash123"):
-            result = handler.get_by_url(url)
-
-        assert result is None
-        assert handler.db.use_table.call_count == 1
+        handler.db.read_receipt.assert_called_once_with("hash123", by_url=True)
+        handler.db.read_one.assert_not_called()
+        mock_logger.info.assert_called_with("receipt _id: receipt123")
 
     def test_get_by_url_receipt_not_found(self, handler, mock_logger):
         url = "https://example.com/receipt"
-        receipt_url_data = {"id": "hash123", "url": url, "receipt_id": "receipt123"}
-        handler.db.read_one = Mock(side_effect=[receipt_url_data, None])
+        handler.db.read_receipt = Mock(return_value=None)
 
         with patch("src.handlers.sfs_md.receipt.make_hash", return_value="hash123"):
             result = handler.get_by_url(url)
 
         assert result is None
-        assert handler.db.use_table.call_count == 2
 
     def test_get_by_url_logs_correctly(self, handler, mock_logger):
         url = "https://example.com/receipt"
-        handler.db.read_one = Mock(return_value=None)
+        handler.db.read_receipt = Mock(return_value=None)
 
         with patch("src.handlers.sfs_md.receipt.make_hash", return_value="hash123"):
             handler.get_by_url(url)
@@ -79,24 +98,106 @@ class TestSfsMdReceiptHandlerGetByUrl:
         mock_logger.info.assert_called_with("receipt url: " + url)
 
 
+class TestSfsMdReceiptHandlerCache:
+    def test_get_by_url_is_served_from_cache(self, handler, receipt_cache):
+        receipt = make_receipt()
+        handler.db.read_receipt = Mock(return_value=receipt.model_dump())
+
+        first = handler.get_by_url(receipt.receipt_url)
+        first.purchases.clear()
+        second = handler.get_by_url(receipt.receipt_url)
+
+        handler.db.read_receipt.assert_called_once()
+        assert second.id == receipt.id
+        assert len(second.purchases) == 1
+        assert receipt_cache.stats()["hits"] == 2
+
+    def test_get_by_url_misses_are_not_cached(self, handler):
+        handler.db.read_receipt = Mock(return_value=None)
+
+        handler.get_by_url("https://example.com/receipt")
+        handler.get_by_url("https://example.com/receipt")
+
+        assert handler.db.read_receipt.call_count == 2
+
+    def test_get_or_create_refreshes_cache(self, handler, receipt_cache):
+        receipt = make_receipt()
+        receipt_cache.set(receipt.id, "stale")
+        handler.db.read_many = Mock(return_value=[])
+        handler.db.read_receipt = Mock()
+
+        handler.get_or_create(receipt)
+
+        assert handler.get_by_url(receipt.receipt_url).id == receipt.id
+        assert handler.get_by_url(receipt.receipt_canonical_url).id == receipt.id
+        handler.db.read_receipt.assert_not_called()
+
+    def test_failed_get_or_create_invalidates_cache(self, handler, receipt_cache):
+        receipt = make_receipt()
+        receipt_cache.set(receipt.id, receipt)
+        handler.db.read_many = Mock(return_value=[])
+        handler.db.create_or_update_one = Mock(side_effect=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            handler.get_or_create(receipt)
+
+        assert receipt_cache.get(receipt.id) is None
+
+
+class TestSfsMdReceiptHandlerUrlFilter:
+    @pytest.fixture
+    def url_filter(self):
+        url_filter = Mock()
+        with patch(
+            "src.handlers.sfs_md.receipt.get_receipt_url_filter",
+            return_value=url_filter,
+        ):
+            yield url_filter
+
+    def test_definite_miss_skips_database(self, handler, url_filter):
+        url_filter.might_contain.return_value = False
+
+        assert handler.get_by_url("https://example.com/receipt") is None
+
+        handler.db.read_receipt.assert_not_called()
+
+    def test_possible_hit_reads_database(self, handler, url_filter):
+        url_filter.might_contain.return_value = True
+        handler.db.read_receipt = Mock(return_value=None)
+
+        assert handler.get_by_url("https://example.com/receipt") is None
+
+        handler.db.read_receipt.assert_called_once()
+
+    def test_get_or_create_adds_urls(self, handler, url_filter):
+        receipt = make_receipt()
+        handler.db.read_many = Mock(return_value=[])
+
+        handler.get_or_create(receipt)
+
+        assert list(url_filter.add.call_args.args[0]) == [
+            make_hash(receipt.receipt_url),
+            make_hash(receipt.receipt_canonical_url),
+        ]
+
+
 class TestSfsMdReceiptHandlerGetOrCreate:
     @pytest.fixture
     def sample_receipt(self):
         return make_receipt()
 
     def test_get_or_create_with_shop_match(self, handler, sample_receipt):
-        shop_uuid = UUID("12345678-1234-5678-1234-567812345678")
-        shop_data = [{"id": str(shop_uuid), "name": "Test Shop"}]
+        shop_data = [{"id": 7, "name": "Test Shop"}]
         # Need side_effect for shop lookup AND purchase item lookup
         handler.db.read_many = Mock(
             side_effect=[shop_data, []]
         )  # [] for no matching item
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         result = handler.get_or_create(sample_receipt)
 
-        assert result.shop_id == shop_uuid
+        assert result.shop_id == 7
         handler.db.use_table.assert_any_call(TableName.SHOP)
         handler.db.use_table.assert_any_call(TableName.RECEIPT)
         handler.db.use_table.assert_any_call(TableName.RECEIPT_URL)
@@ -104,7 +205,7 @@ class TestSfsMdReceiptHandlerGetOrCreate:
     def test_get_or_create_without_shop_match(self, handler, sample_receipt):
         handler.db.read_many = Mock(return_value=[])
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         result = handler.get_or_create(sample_receipt)
 
@@ -112,22 +213,26 @@ class TestSfsMdReceiptHandlerGetOrCreate:
         handler.db.use_table.assert_any_call(TableName.SHOP)
 
     def test_get_or_create_with_purchases(self, handler, sample_receipt):
-        shop_uuid = UUID("12345678-1234-5678-1234-567812345678")
         item_uuid = UUID("87654321-4321-8765-4321-876543210987")
-        purchase = Mock()
-        purchase.name = "Test Item"
-        purchase.item_id = None
-        purchase.status = None
-        sample_receipt.purchases = [purchase]
+        sample_receipt.purchases = [
+            PurchasedItem(name="Test Item", quantity=1.0, price=1.0)
+        ]
 
         handler.db.read_many = Mock(
             side_effect=[
-                [{"id": str(shop_uuid)}],
-                [{"id": str(item_uuid), "status": ItemBarcodeStatus.PENDING}],
+                [{"id": 7}],
+                [
+                    {
+                        "id": str(item_uuid),
+                        "name": "Test Item",
+                        "normalized_name": "test item",
+                        "status": ItemBarcodeStatus.PENDING,
+                    }
+                ],
             ]
         )
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         result = handler.get_or_create(sample_receipt)
 
@@ -135,14 +240,13 @@ class TestSfsMdReceiptHandlerGetOrCreate:
         assert result.purchases[0].status == ItemBarcodeStatus.PENDING
 
     def test_get_or_create_with_purchase_no_match(self, handler, sample_receipt):
-        purchase = Mock()
-        purchase.name = "Nonexistent Item"
-        purchase.item_id = None
-        sample_receipt.purchases = [purchase]
+        sample_receipt.purchases = [
+            PurchasedItem(name="Nonexistent Item", quantity=1.0, price=1.0)
+        ]
 
         handler.db.read_many = Mock(return_value=[])
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         result = handler.get_or_create(sample_receipt)
 
@@ -151,41 +255,237 @@ class TestSfsMdReceiptHandlerGetOrCreate:
     def test_get_or_create_purchase_status_defaults_to_pending(
         self, handler, sample_receipt
     ):
-        shop_uuid = UUID("12345678-1234-5678-1234-567812345678")
         item_uuid = UUID("87654321-4321-8765-4321-876543210987")
-        purchase = Mock()
-        purchase.name = "Test Item"
-        purchase.item_id = None
-        sample_receipt.purchases = [purchase]
+        sample_receipt.purchases = [
+            PurchasedItem(name="Test Item", quantity=1.0, price=1.0)
+        ]
 
         handler.db.read_many = Mock(
             side_effect=[
-                [{"id": str(shop_uuid)}],
-                [{"id": str(item_uuid)}],
+                [{"id": 7}],
+                [
+                    {
+                        "id": str(item_uuid),
+                        "name": "Test Item",
+                        "normalized_name": "test item",
+                    }
+                ],
             ]
         )
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         result = handler.get_or_create(sample_receipt)
 
         assert result.purchases[0].status == ItemBarcodeStatus.PENDING
 
+    def test_get_or_create_resolves_all_purchases_in_one_query(
+        self, handler, sample_receipt
+    ):
+        sample_receipt.purchases = [
+            PurchasedItem(name=name, quantity=1.0, price=1.0)
+            for name in ["Item A", "Item B", "Item A", "Item C"]
+        ]
+        item_a = UUID("87654321-4321-8765-4321-876543210987")
+        item_b = UUID("87654321-4321-8765-4321-876543210988")
+        handler.db.read_many = Mock(
+            side_effect=[
+                [{"id": 7}],
+                [
+                    {"id": str(item_a), "normalized_name": "item a", "status": "added"},
+                    {
+                        "id": str(item_b),
+                        "normalized_name": "item b",
+                        "status": "missing",
+                    },
+                ],
+            ]
+        )
+        handler.db.create_or_update_one = Mock()
+        handler.db.create_many = Mock()
+
+        result = handler.get_or_create(sample_receipt)
+
+        assert handler.db.read_many.call_count == 2
+        handler.db.read_many.assert_called_with(
+            {
+                "normalized_name": (Operator.IN, ["item a", "item b", "item c"]),
+                "shop_id": 7,
+            }
+        )
+        assert [p.item_id for p in result.purchases] == [item_a, item_b, item_a, None]
+        assert result.purchases[1].status == ItemBarcodeStatus.MISSING
+        assert result.purchases[3].status == ItemBarcodeStatus.PENDING
+
+    def test_get_or_create_matches_normalized_names(self, handler, sample_receipt):
+        sample_receipt.purchases = [
+            PurchasedItem(name="LAPTE DE SOIA ALPRO 1L", quantity=1.0, price=1.0),
+            PurchasedItem(name="ШОК. МОЛОЧНЫЙ 90Г", quantity=1.0, price=1.0),
+        ]
+        item_a = UUID("87654321-4321-8765-4321-876543210987")
+        item_b = UUID("87654321-4321-8765-4321-876543210988")
+        handler.db.read_many = Mock(
+            side_effect=[
+                [{"id": 7}],
+                [
+                    {
+                        "id": str(item_a),
+                        "name": "Lapte de soia Alpro 1 l",
+                        "normalized_name": "lapte de soia alpro 1l",
+                        "status": "added",
+                    },
+                    {
+                        "id": str(item_b),
+                        "name": "Шоколад молочный 90 г",
+                        "normalized_name": "шоколад молочный 90g",
+                    },
+                ],
+            ]
+        )
+
+        result = handler.get_or_create(sample_receipt)
+
+        assert [p.item_id for p in result.purchases] == [item_a, item_b]
+
+    def test_get_or_create_writes_purchases_as_rows(self, handler, sample_receipt):
+        handler.db.read_many = Mock(return_value=[])
+
+        handler.get_or_create(sample_receipt)
+
+        handler.db.transaction.assert_called_once()
+        receipt_data = handler.db.create_or_update_one.call_args.args[0]
+        assert "purchases" not in receipt_data
+        handler.db.use_table.assert_any_call(TableName.PURCHASED_ITEM)
+        rows = handler.db.upsert_many.call_args.args[0]
+        assert rows == [
+            {
+                "id": str(UUID(make_hash(f"{sample_receipt.id}/0"))),
+                "receipt_id": sample_receipt.id,
+                "position": 0,
+                "name": "Item A",
+                "quantity": 2.0,
+                "unit": "pcs",
+                "unit_quantity": None,
+                "price": 6.17,
+                "item_id": None,
+            }
+        ]
+
+    def test_get_or_create_suggests_barcodes_for_pending_purchases(
+        self, handler, sample_receipt, barcode_index
+    ):
+        handler.db.read_many = Mock(return_value=[])
+
+        result = handler.get_or_create(sample_receipt)
+
+        barcode_index.apply.assert_called_once_with(result)
+
+    def test_get_or_create_skips_suggestions_without_pending_purchases(
+        self, handler, sample_receipt, barcode_index
+    ):
+        sample_receipt.purchases[0].status = ItemBarcodeStatus.ADDED
+        handler.db.read_many = Mock(return_value=[])
+
+        handler.get_or_create(sample_receipt)
+
+        barcode_index.apply.assert_not_called()
+
+    def test_get_or_create_writes_in_one_transaction(self, handler, sample_receipt):
+        handler.db.read_many = Mock(return_value=[])
+
+        handler.get_or_create(sample_receipt)
+
+        calls = [name for name, _, _ in handler.db.mock_calls]
+        begin = calls.index("transaction().__enter__")
+        commit = calls.index("transaction().__exit__")
+        for write in [
+            "create_or_update_one",
+            "upsert_many",
+            "delete_many",
+            "create_many",
+        ]:
+            assert begin < calls.index(write) < commit
+
+    def test_get_or_create_deletes_rows_past_the_last_purchase(
+        self, handler, sample_receipt
+    ):
+        handler.db.read_many = Mock(return_value=[])
+
+        handler.get_or_create(sample_receipt)
+
+        handler.db.delete_many.assert_called_once_with(
+            {"receipt_id": sample_receipt.id, "position": (Operator.GTE, 1)}
+        )
+
     def test_get_or_create_with_canonical_url(self, handler, sample_receipt):
         handler.db.read_many = Mock(return_value=[])
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         handler.get_or_create(sample_receipt)
 
-        assert handler.db.create_one.call_count == 2
+        handler.db.create_many.assert_called_once()
+        urls = handler.db.create_many.call_args.args[0]
+        assert [url["url"] for url in urls] == [
+            sample_receipt.receipt_url,
+            sample_receipt.receipt_canonical_url,
+        ]
+        assert {url["receipt_id"] for url in urls} == {sample_receipt.id}
 
     def test_get_or_create_without_canonical_url(self, handler, sample_receipt):
         sample_receipt.receipt_canonical_url = None
         handler.db.read_many = Mock(return_value=[])
         handler.db.create_or_update_one = Mock()
-        handler.db.create_one = Mock()
+        handler.db.create_many = Mock()
 
         handler.get_or_create(sample_receipt)
 
-        assert handler.db.create_one.call_count == 1
+        handler.db.create_many.assert_called_once()
+        assert len(handler.db.create_many.call_args.args[0]) == 1
+
+
+class TestAsyncSfsMdReceiptHandler:
+    def test_get_by_url_success(self, async_handler):
+        url = "https://example.com/receipt"
+        receipt_data = {
+            "id": "receipt123",
+            "date": "2026-02-14T00:00:00+00:00",
+            "user_id": "12345678-1234-5678-1234-567812345678",
+            "company_id": "cmp_1",
+            "company_name": "Test Co",
+            "shop_address": "123 Test Street",
+            "cash_register_id": "cr_1",
+            "key": 42,
+            "total_amount": 12.34,
+            "purchases": [],
+            "receipt_url": url,
+        }
+        async_handler.db.read_receipt.return_value = receipt_data
+
+        with patch("src.handlers.sfs_md.receipt.make_hash", return_value="hash123"):
+            result = asyncio.run(async_handler.get_by_url(url))
+
+        assert isinstance(result, SfsMdReceipt)
+        async_handler.db.read_receipt.assert_awaited_once_with("hash123", by_url=True)
+
+    def test_get_by_url_not_found(self, async_handler):
+        async_handler.db.read_receipt.return_value = None
+
+        result = asyncio.run(async_handler.get_by_url("https://example.com/receipt"))
+
+        assert result is None
+        async_handler.db.read_one.assert_not_awaited()
+
+    def test_get_or_create_writes_receipt_and_urls(self, async_handler):
+        receipt = make_receipt()
+        async_handler.db.read_many.return_value = []
+
+        result = asyncio.run(async_handler.get_or_create(receipt))
+
+        async_handler.db.transaction.return_value.__aenter__.assert_awaited_once()
+        async_handler.db.transaction.return_value.__aexit__.assert_awaited_once()
+
+        assert result.shop_id is None
+        async_handler.db.create_or_update_one.assert_awaited_once()
+        async_handler.db.create_many.assert_awaited_once()
+        assert len(async_handler.db.create_many.call_args.args[0]) == 2
@@ -0,0 +1,169 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.handlers.sfs_md import receipt_url_filter
+from src.handlers.sfs_md.receipt_url_filter import (
+    ReceiptUrlFilter,
+    get_receipt_url_filter,
+)
+
+
+@pytest.fixture
+def db():
+    with (
+        patch(
+            "src.handlers.sfs_md.receipt_url_filter.PostgreSQLAdapter"
+        ) as mock_adapter,
+        patch("src.handlers.sfs_md.receipt_url_filter.get_pool"),
+    ):
+        session = MagicMock()
+        session.count.return_value = 2
+        session.iter_ids.return_value = iter(["hash1", "hash2"])
+        mock_adapter.return_value.__enter__.return_value = session
+        yield session
+
+
+class TestReceiptUrlFilter:
+    def test_everything_might_exist_before_the_first_build(self):
+        url_filter = ReceiptUrlFilter()
+
+        assert not url_filter.ready
+        assert url_filter.might_contain("hash1")
+        assert url_filter.might_contain("unknown")
+
+    def test_build_scans_receipt_urls(self, db):
+        url_filter = ReceiptUrlFilter()
+
+        assert url_filter.build()
+
+        assert url_filter.ready
+        assert url_filter.might_contain("hash1")
+        assert url_filter.might_contain("hash2")
+        assert not url_filter.might_contain("unknown")
+        assert url_filter.stats()["builds"] == 1
+        assert url_filter.stats()["capacity"] == receipt_url_filter.MIN_CAPACITY
+
+    def test_add_after_build(self, db):
+        url_filter = ReceiptUrlFilter()
+        url_filter.build()
+
+        url_filter.add(["hash3"])
+
+        assert url_filter.might_contain("hash3")
+
+    def test_urls_added_during_a_build_are_kept(self, db):
+        url_filter = ReceiptUrlFilter()
+
+        def scan():
+            url_filter.add(["hash3"])
+            yield "hash1"
+
+        db.iter_ids.side_effect = scan
+
+        url_filter.build()
+
+        assert url_filter.might_contain("hash3")
+
+    def test_only_one_build_at_a_time(self, db):
+        url_filter = ReceiptUrlFilter()
+
+        def scan():
+            assert not url_filter.build()
+            assert not url_filter.start_build()
+            yield "hash1"
+
+        db.iter_ids.side_effect = scan
+
+        assert url_filter.build()
+        assert not url_filter.stats()["building"]
+
+    def test_failed_build_keeps_previous_filter(self, db):
+        url_filter = ReceiptUrlFilter()
+        url_filter.build()
+        db.iter_ids.side_effect = RuntimeError
+
+        with pytest.raises(RuntimeError):
+            url_filter.build()
+
+        assert url_filter.might_contain("hash1")
+        assert not url_filter.might_contain("unknown")
+        assert not url_filter.stats()["building"]
+
+    def test_urls_stored_here_keep_misses_exact(self, db):
+        url_filter = ReceiptUrlFilter()
+        url_filter.build()
+
+        url_filter.add(["hash3", "hash4"])
+        db.count.return_value = 4
+        db.iter_ids.return_value = iter(["hash1", "hash2", "hash3", "hash4"])
+        url_filter.build()
+
+        assert url_filter.exact
+        assert not url_filter.might_contain("unknown")
+
+    def test_urls_stored_by_other_processes_stop_answering_misses(self, db):
+        logger = MagicMock()
+        url_filter = ReceiptUrlFilter(logger=logger)
+        url_filter.build()
+
+        url_filter.add(["hash3"])
+        db.count.return_value = 4
+        db.iter_ids.return_value = iter(["hash1", "hash2", "hash3", "other"])
+        with patch.object(url_filter, "start_build") as start_build:
+            url_filter.build()
+
+            assert not url_filter.exact
+            assert url_filter.might_contain("unknown")
+            assert url_filter.stats()["exact"] is False
+
+        start_build.assert_not_called()
+        logger.error.assert_called_once()
+
+    def test_stale_filter_falls_back_to_the_database_and_rebuilds(self, db):
+        now = [100.0]
+        url_filter = ReceiptUrlFilter(max_age=60, clock=lambda: now[0])
+        url_filter.build()
+        assert not url_filter.might_contain("unknown")
+
+        now[0] = 161.0
+        with patch.object(url_filter, "start_build") as start_build:
+            assert url_filter.might_contain("unknown")
+
+        start_build.assert_called_once()
+
+    def test_age_is_counted_from_the_start_of_the_scan(self, db):
+        now = [100.0]
+        url_filter = ReceiptUrlFilter(max_age=60, clock=lambda: now[0])
+
+        def scan():
+            now[0] = 130.0
+            yield "hash1"
+
+        db.iter_ids.side_effect = scan
+        url_filter.build()
+
+        assert url_filter.stats()["age"] == 30.0
+        now[0] = 161.0
+        assert url_filter.stale
+
+
+class TestGetReceiptUrlFilter:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("RECEIPT_URL_FILTER_ENABLED", raising=False)
+
+        assert get_receipt_url_filter() is None
+
+    def test_enabled_starts_build(self, monkeypatch):
+        monkeypatch.setenv("RECEIPT_URL_FILTER_ENABLED", "true")
+        monkeypatch.setenv("RECEIPT_URL_FILTER_FP_RATE", "0.001")
+        monkeypatch.setattr(receipt_url_filter, "_url_filter", None)
+
+        with patch.object(ReceiptUrlFilter, "start_build") as start_build:
+            url_filter = get_receipt_url_filter()
+
+            assert get_receipt_url_filter() is url_filter
+
+        assert url_filter.fp_rate == 0.001
+        assert url_filter.max_age == 300
+        start_build.assert_called_once()
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.handlers.add_barcodes import add_barcodes_handler, shop_item_row
+from src.schemas.common import TableName
+
+ITEM_ID = "12345678-1234-5678-1234-567812345678"
+
+
+@pytest.fixture
+def session():
+    with patch("src.handlers.add_barcodes.init_db_session") as mock_init:
+        session = MagicMock()
+        mock_init.return_value.__enter__.return_value = session
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def deduplicator():
+    with patch("src.handlers.add_barcodes.get_shop_item_deduplicator") as mock_get:
+        mock_get.return_value.find.return_value = []
+        yield mock_get.return_value
+
+
+@pytest.fixture(autouse=True)
+def index_barcode():
+    with patch("src.handlers.add_barcodes.index_barcode") as mock_index:
+        yield mock_index
+
+
+class TestShopItemRow:
+    def test_existing_item(self):
+        row = shop_item_row(
+            7,
+            {
+                "item_id": ITEM_ID,
+                "purchase_id": "Lapte de soia_0",
+                "status": "added",
+                "barcode": "4006381 333931",
+            },
+        )
+
+        assert row["id"] == ITEM_ID
+        assert row["name"] == "Lapte de soia"
+        assert row["barcode"] == "4006381333931"
+
+    def test_new_item_gets_an_id(self):
+        row = shop_item_row(7, {"purchase_id": "Tofu_1", "status": "missing"})
+
+        assert row["id"]
+        assert row["shop_id"] == 7
+
+    def test_invalid_barcode(self):
+        with pytest.raises(ValueError):
+            shop_item_row(7, {"purchase_id": "Tofu_1", "status": "added"})
+
+
+class TestAddBarcodesHandler:
+    def test_upserts_all_items_in_one_call(self, session, index_barcode):
+        items = [
+            {"item_id": ITEM_ID, "purchase_id": "Tofu_0", "status": "missing"},
+            {"purchase_id": "Paine_1", "status": "irrelevant"},
+        ]
+
+        status, body = add_barcodes_handler(7, items, Mock())
+
+        assert status == HTTPStatus.OK
+        assert body["possible_duplicates"] == []
+        session.use_table.assert_called_with(TableName.SHOP_ITEM)
+        session.upsert_many.assert_called_once()
+        rows = session.upsert_many.call_args.args[0]
+        assert [row["name"] for row in rows] == ["Tofu", "Paine"]
+        session.create_or_update_one.assert_not_called()
+        assert index_barcode.call_count == 2
+
+    def test_invalid_items_are_reported_and_valid_ones_written(self, session):
+        items = [
+            {"purchase_id": "Tofu_0", "status": "added", "barcode": "123"},
+            {"purchase_id": "Paine_1", "status": "unknown"},
+            {"status": "missing"},
+            {"purchase_id": "Lapte_2", "status": "missing"},
+        ]
+
+        status, body = add_barcodes_handler(7, items, Mock())
+
+        assert status == HTTPStatus.BAD_REQUEST
+        assert [item["name"] for item in body["invalid_items"]] == [
+            "Tofu_0",
+            "Paine_1",
+            None,
+        ]
+        assert body["invalid_items"][2]["error"] == "Missing field 'purchase_id'"
+        rows = session.upsert_many.call_args.args[0]
+        assert [row["name"] for row in rows] == ["Lapte"]
+
+    def test_no_valid_items_skips_the_database(self, session):
+        status, _ = add_barcodes_handler(7, [{"status": "missing"}], Mock())
+
+        assert status == HTTPStatus.BAD_REQUEST
+        session.upsert_many.assert_not_called()
+
+    def test_new_items_are_checked_for_duplicates(self, session, deduplicator):
+        deduplicator.find.return_value = [{"id": "x", "name": "TOFU NATURAL"}]
+        items = [
+            {"purchase_id": "Tofu natural_0", "status": "missing"},
+            {"item_id": ITEM_ID, "purchase_id": "Paine_1", "status": "missing"},
+        ]
+
+        status, body = add_barcodes_handler(7, items, Mock())
+
+        assert status == HTTPStatus.OK
+        deduplicator.find.assert_called_once_with(session, 7, "Tofu natural")
+        assert body["possible_duplicates"] == [
+            {"name": "Tofu natural", "duplicates": deduplicator.find.return_value}
+        ]
+        deduplicator.add.assert_called_once()
+
+    def test_failed_write_does_not_index_items(self, session, index_barcode):
+        session.upsert_many.side_effect = RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            add_barcodes_handler(
+                7, [{"purchase_id": "Tofu_0", "status": "missing"}], Mock()
+            )
+
+        index_barcode.assert_not_called()
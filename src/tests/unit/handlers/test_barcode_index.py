@@ -0,0 +1,153 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.handlers import barcode_index as barcode_index_module
+from src.handlers.barcode_index import BarcodeIndex, index_barcode
+from src.schemas.common import ItemBarcodeStatus
+from src.tests.unit import make_receipt
+
+ITEMS = [
+    {"id": "a", "name": "LAPTE DE SOIA ALPRO 1L", "status": "added", "barcode": "111"},
+    {"id": "b", "name": "Lapte de soia Alpro 1 l", "status": "added", "barcode": "111"},
+    {"id": "c", "name": "LAPTE DE SOIA ALPRO 1 L", "status": "added", "barcode": "222"},
+    {"id": "d", "name": "Paine neagra", "status": "added", "barcode": "333"},
+]
+
+
+@pytest.fixture
+def db():
+    with (
+        patch("src.handlers.barcode_index.PostgreSQLAdapter") as mock_adapter,
+        patch("src.handlers.barcode_index.get_pool"),
+    ):
+        session = MagicMock()
+        session.iter_many.return_value = iter(ITEMS)
+        mock_adapter.return_value.__enter__.return_value = session
+        yield session
+
+
+class TestBarcodeIndex:
+    def test_empty_before_the_first_build(self):
+        barcode_index = BarcodeIndex()
+
+        assert not barcode_index.ready
+        assert barcode_index.suggest("Lapte de soia Alpro") == []
+
+    def test_build_scans_added_items(self, db):
+        barcode_index = BarcodeIndex()
+
+        assert barcode_index.build()
+
+        db.iter_many.assert_called_once_with({"status": "added"})
+        assert barcode_index.ready
+        assert barcode_index.stats()["names"] == 2
+        assert barcode_index.stats()["items"] == 4
+
+    def test_suggestions_are_ranked(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        suggestions = barcode_index.suggest("LAPTE DE SOIA ALPRO 1,0L")
+
+        assert [s.barcode for s in suggestions] == ["111", "222"]
+        assert [s.items for s in suggestions] == [2, 1]
+        assert suggestions[0].score == pytest.approx(2 / 3, abs=0.001)
+
+    def test_no_suggestions_from_other_quantities(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        assert barcode_index.suggest("LAPTE DE SOIA ALPRO 0,5L") == []
+        assert barcode_index.suggest("LAPTE DE SOIA ALPRO") == []
+
+    def test_suggestions_tolerate_typos(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        suggestions = barcode_index.suggest("LAPTE DE SOIA ALPOR 1L")
+
+        assert [s.barcode for s in suggestions] == ["111", "222"]
+        assert barcode_index.suggest("Tofu") == []
+
+    def test_add_after_build(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        barcode_index.add(
+            {"id": "e", "name": "Tofu", "status": "added", "barcode": "444"}
+        )
+
+        assert [s.barcode for s in barcode_index.suggest("TOFU")] == ["444"]
+
+    def test_re_added_item_moves_its_barcode(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        barcode_index.add({**ITEMS[3], "barcode": "555"})
+
+        assert [s.barcode for s in barcode_index.suggest("Paine neagra")] == ["555"]
+
+    def test_items_without_barcode_are_dropped(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+
+        barcode_index.add({**ITEMS[3], "status": "missing", "barcode": None})
+
+        assert barcode_index.suggest("Paine neagra") == []
+        assert barcode_index.stats()["names"] == 1
+
+    def test_items_added_during_a_build_are_kept(self, db):
+        barcode_index = BarcodeIndex()
+
+        def scan(_):
+            barcode_index.add(
+                {"id": "e", "name": "Tofu", "status": "added", "barcode": "444"}
+            )
+            return iter(ITEMS)
+
+        db.iter_many.side_effect = scan
+        barcode_index.build()
+
+        assert [s.barcode for s in barcode_index.suggest("Tofu")] == ["444"]
+
+    def test_apply_sets_pending_purchases_only(self, db):
+        barcode_index = BarcodeIndex()
+        barcode_index.build()
+        receipt = make_receipt()
+        receipt.purchases[0].name = "Lapte de soia Alpro 1L"
+        receipt.purchases.append(
+            receipt.purchases[0].model_copy(update={"status": ItemBarcodeStatus.ADDED})
+        )
+
+        barcode_index.apply(receipt, limit=1)
+
+        assert [s.barcode for s in receipt.purchases[0].barcode_suggestions] == ["111"]
+        assert receipt.purchases[1].barcode_suggestions == []
+
+    def test_build_failure_in_background_is_logged(self):
+        logger = MagicMock()
+        barcode_index = BarcodeIndex(logger=logger)
+        with patch(
+            "src.handlers.barcode_index.get_pool", side_effect=RuntimeError("down")
+        ):
+            barcode_index._begin_build()
+            barcode_index._build_in_background()
+
+        assert not barcode_index.ready
+        logger.error.assert_called_once()
+
+
+def test_index_barcode_without_an_index(monkeypatch):
+    monkeypatch.setattr(barcode_index_module, "_barcode_index", None)
+
+    index_barcode(ITEMS[0])
+
+
+def test_index_barcode_adds_to_the_index(monkeypatch):
+    barcode_index = MagicMock()
+    monkeypatch.setattr(barcode_index_module, "_barcode_index", barcode_index)
+
+    index_barcode(ITEMS[0])
+
+    barcode_index.add.assert_called_once_with(ITEMS[0])
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.handlers.link_shop import link_shop_handler
+
+URL = "https://www.openstreetmap.org/node/123"
+RECEIPT = {
+    "id": "r1",
+    "company_id": "1003600000000",
+    "shop_address": "Test Address",
+    "country_code": "md",
+}
+OSM = {"lat": "47.0", "lon": "28.8", "display_name": "Shop", "address": {}}
+
+
+@pytest.fixture
+def init_session():
+    with patch("src.handlers.link_shop.init_db_session") as mock_init:
+        session = MagicMock()
+        session.read_one.return_value = dict(RECEIPT)
+        session.read_many.return_value = []
+        mock_init.return_value.__enter__.return_value = session
+        yield mock_init
+
+
+@pytest.fixture
+def session(init_session):
+    return init_session.return_value.__enter__.return_value
+
+
+@pytest.fixture(autouse=True)
+def index_shop():
+    with patch("src.handlers.link_shop.index_shop") as mock_index:
+        yield mock_index
+
+
+class TestLinkShopHandler:
+    def test_existing_shop(self, session, index_shop):
+        session.read_many.return_value = [{"id": 5}]
+
+        with patch("src.handlers.link_shop.lookup_osm_data") as lookup:
+            status, body = link_shop_handler(URL, "u1", "r1", MagicMock())
+
+        assert status == HTTPStatus.OK
+        assert body["data"] == {"shop_id": 5}
+        lookup.assert_not_called()
+        session.create_one.assert_not_called()
+        index_shop.assert_not_called()
+
+    def test_new_shop_indexes_the_stored_row(self, init_session, session, index_shop):
+        stored = {"id": 9, "address": "Test Address", "lat": 47.0, "lon": 28.8}
+        session.create_one.return_value = 9
+        session.read_one.side_effect = [dict(RECEIPT), stored]
+        closed_during_lookup = []
+
+        def lookup(*_):
+            context = init_session.return_value
+            closed_during_lookup.append(
+                context.__exit__.call_count == context.__enter__.call_count
+            )
+            return OSM
+
+        with patch("src.handlers.link_shop.lookup_osm_data", side_effect=lookup):
+            status, body = link_shop_handler(URL, "u1", "r1", MagicMock())
+
+        assert status == HTTPStatus.OK
+        assert body["data"] == {"shop_id": 9}
+        assert closed_during_lookup == [True]
+        assert session.create_one.call_args[0][0]["shop_address"] == "Test Address"
+        session.read_one.assert_called_with(9, partition_key="md")
+        index_shop.assert_called_once_with(stored)
+        assert session.update_one.call_args[0][1]["shop_id"] == 9
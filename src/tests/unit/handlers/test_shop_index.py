@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.handlers import shop_index as shop_index_module
+from src.handlers.shop_index import ShopIndex, index_shop, shop_coordinates
+
+SHOPS = [
+    {"id": 1, "company_id": "c1", "lat": 47.01, "lon": 28.85},
+    {"id": 2, "company_id": "c1", "lat": 47.02, "lon": 28.86},
+    {"id": 3, "company_id": "c2", "lat": 46.80, "lon": 29.50},
+    {"id": 4, "company_id": "c2", "lat": None, "lon": None, "osm_data": {}},
+]
+
+
+@pytest.fixture
+def db():
+    with (
+        patch("src.handlers.shop_index.PostgreSQLAdapter") as mock_adapter,
+        patch("src.handlers.shop_index.get_pool"),
+    ):
+        session = MagicMock()
+        session.iter_many.return_value = iter(SHOPS)
+        mock_adapter.return_value.__enter__.return_value = session
+        yield session
+
+
+class TestShopCoordinates:
+    def test_columns(self):
+        assert shop_coordinates({"lat": 47.0, "lon": 28.8}) == (47.0, 28.8)
+
+    def test_osm_data(self):
+        shop = {"osm_data": {"lat": "47.0", "lon": "28.8"}}
+
+        assert shop_coordinates(shop) == (47.0, 28.8)
+
+    def test_missing(self):
+        assert shop_coordinates({"osm_data": None}) is None
+
+
+class TestShopIndex:
+    def test_empty_before_the_first_build(self):
+        shop_index = ShopIndex()
+
+        assert not shop_index.ready
+        assert shop_index.nearby(47.0, 28.8) == []
+        assert shop_index.bbox(46, 48, 28, 30) == []
+
+    def test_build_scans_shops(self, db):
+        shop_index = ShopIndex()
+
+        assert shop_index.build()
+
+        assert shop_index.ready
+        assert shop_index.wait_ready(0)
+        assert shop_index.stats()["shops"] == 3
+        assert [shop["id"] for shop in shop_index.bbox(46.9, 47.1, 28.8, 28.9)] == [
+            1,
+            2,
+        ]
+
+    def test_nearby(self, db):
+        shop_index = ShopIndex()
+        shop_index.build()
+
+        shops = shop_index.nearby(47.0, 28.84, limit=2)
+
+        assert [shop["id"] for shop in shops] == [1, 2]
+        assert shops[0]["distance_m"] < shops[1]["distance_m"]
+        assert shops[0]["company_id"] == "c1"
+
+    def test_nearby_within_radius(self, db):
+        shop_index = ShopIndex()
+        shop_index.build()
+
+        shops = shop_index.nearby(47.0, 28.84, limit=10, radius_m=5000)
+
+        assert [shop["id"] for shop in shops] == [1, 2]
+
+    def test_add_after_build(self, db):
+        shop_index = ShopIndex()
+        shop_index.build()
+
+        shop_index.add({"id": 5, "osm_data": {"lat": "47.0", "lon": "28.84"}})
+
+        assert shop_index.nearby(47.0, 28.84, limit=1)[0]["id"] == 5
+
+    def test_shops_added_during_a_build_are_kept(self, db):
+        shop_index = ShopIndex()
+
+        def scan():
+            shop_index.add({"id": 5, "lat": 47.0, "lon": 28.84})
+            yield from SHOPS
+
+        db.iter_many.return_value = scan()
+        shop_index.build()
+
+        assert shop_index.stats()["shops"] == 4
+
+    def test_stale_index_rebuilds_in_the_background(self, db):
+        now = [100.0]
+        shop_index = ShopIndex(max_age=60, clock=lambda: now[0])
+        shop_index.build()
+
+        with patch.object(shop_index, "start_build") as start_build:
+            shop_index.nearby(47.0, 28.8)
+            start_build.assert_not_called()
+
+            now[0] = 161.0
+            shop_index.bbox(46.9, 47.1, 28.8, 28.9)
+            shop_index.nearby(47.0, 28.8)
+
+        assert start_build.call_count == 2
+        assert shop_index.stats()["age"] == 61.0
+
+    def test_index_shop_without_an_index(self, monkeypatch):
+        monkeypatch.setattr(shop_index_module, "_shop_index", None)
+
+        index_shop({"id": 5, "lat": 47.0, "lon": 28.84})
+
+        assert shop_index_module._shop_index is None
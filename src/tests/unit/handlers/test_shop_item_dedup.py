@@ -0,0 +1,105 @@
+import threading
+from unittest.mock import MagicMock
+
+from src.handlers.shop_item_dedup import ShopItemDeduplicator, duplicate_groups
+from src.schemas.common import TableName
+
+ITEMS = [
+    {"id": "a", "name": "LAPTE DE SOIA ALPRO 1L"},
+    {"id": "b", "name": "Paine neagra"},
+    {"id": "c", "name": "Lapte de soia Alpro 500 ml"},
+    {"id": "d", "name": "LAPTE DE SOIA ALPOR 1L"},
+    {"id": "e", "name": "PAINE NEAGRA"},
+    {"id": "f", "name": "Tofu"},
+]
+
+
+class TestDuplicateGroups:
+    def test_groups_near_duplicates(self):
+        groups = duplicate_groups(ITEMS)
+
+        assert [[item["id"] for item in group] for group in groups] == [
+            ["a", "d"],
+            ["b", "e"],
+        ]
+
+    def test_different_quantities_are_not_duplicates(self):
+        items = [
+            {"id": "a", "name": "PEPSI 0.5L"},
+            {"id": "b", "name": "PEPSI 1.5L"},
+            {"id": "c", "name": "PEPSI 6X0.5L"},
+        ]
+
+        assert duplicate_groups(items) == []
+
+    def test_uses_stored_normalized_names(self):
+        items = [
+            {"id": "a", "name": "X", "normalized_name": "lapte de soia"},
+            {"id": "b", "name": "Y", "normalized_name": "lapte de soia"},
+        ]
+
+        assert len(duplicate_groups(items)) == 1
+
+
+class TestShopItemDeduplicator:
+    def test_find_builds_the_shop_index_once(self):
+        db = MagicMock()
+        db.iter_many.side_effect = lambda *_: iter(ITEMS)
+        deduplicator = ShopItemDeduplicator()
+
+        first = deduplicator.find(db, 7, "Lapte de soia Alpro 1 l")
+        second = deduplicator.find(db, 7, "Tofu natural")
+
+        assert [item["id"] for item in first] == ["a", "d"]
+        assert first[0]["similarity"] == 1.0
+        assert second == []
+        db.use_table.assert_called_once_with(TableName.SHOP_ITEM)
+        db.iter_many.assert_called_once_with({"shop_id": 7})
+
+    def test_find_skips_other_quantities(self):
+        db = MagicMock()
+        db.iter_many.return_value = iter(ITEMS)
+        deduplicator = ShopItemDeduplicator()
+
+        assert deduplicator.find(db, 7, "LAPTE DE SOIA ALPRO 0.5L") == []
+
+    def test_added_items_are_found(self):
+        db = MagicMock()
+        db.iter_many.return_value = iter([])
+        deduplicator = ShopItemDeduplicator()
+        deduplicator.find(db, 7, "Tofu")
+
+        deduplicator.add(7, {"id": "g", "name": "Tofu afumat"})
+
+        assert [item["id"] for item in deduplicator.find(db, 7, "TOFU AFUMAT")] == ["g"]
+
+    def test_add_before_the_index_is_built_is_ignored(self):
+        deduplicator = ShopItemDeduplicator()
+
+        deduplicator.add(7, {"id": "g", "name": "Tofu"})
+
+        db = MagicMock()
+        db.iter_many.return_value = iter([])
+        assert deduplicator.find(db, 7, "Tofu") == []
+
+    def test_a_shop_build_does_not_block_other_shops(self):
+        scanning, release = threading.Event(), threading.Event()
+
+        def iter_many(query):
+            if query["shop_id"] == 7:
+                scanning.set()
+                release.wait(5)
+            return iter(ITEMS)
+
+        db = MagicMock()
+        db.iter_many.side_effect = iter_many
+        deduplicator = ShopItemDeduplicator()
+        cold = threading.Thread(target=deduplicator.find, args=(db, 7, "Tofu"))
+        cold.start()
+        scanning.wait(5)
+
+        try:
+            assert [item["id"] for item in deduplicator.find(db, 8, "Tofu")] == ["f"]
+        finally:
+            release.set()
+            cold.join()
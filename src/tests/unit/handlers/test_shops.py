@@ -0,0 +1,158 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.adapters.db.base import (
+    InvalidCursorError,
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
+from src.handlers.shops import (
+    CHISINAU_LAT_MAX,
+    CHISINAU_LON_MAX,
+    CHISINAU_LON_MIN,
+    shops_handler,
+)
+from src.schemas.common import Operator, TableName
+
+
+@pytest.fixture
+def session():
+    with patch("src.handlers.shops.init_db_session") as mock_init:
+        session = MagicMock()
+        session.count.return_value = 120
+        session.read_many.return_value = [{"id": 1}]
+        session.read_page.return_value = Page(items=[{"id": 1}], next_cursor="next")
+        mock_init.return_value.__enter__.return_value = session
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def shop_index():
+    with patch("src.handlers.shops.get_shop_index") as mock_get:
+        mock_get.return_value.ready = False
+        yield mock_get.return_value
+
+
+class TestShopsHandler:
+    def test_filters_and_paginates_in_the_database(self, session):
+        status, body = shops_handler(
+            {"country_code": "md", "limit": "20", "offset": "40"}, Mock()
+        )
+
+        assert status == HTTPStatus.OK
+        assert body == {
+            "items": [{"id": 1}],
+            "total": 120,
+            "limit": 20,
+            "offset": 40,
+            "next_cursor": encode_cursor([1]),
+        }
+        session.use_table.assert_called_once_with(TableName.SHOP)
+        session.count.assert_called_once_with({"country_code": "md"})
+        session.read_many.assert_called_once_with(
+            {"country_code": "md"}, limit=20, offset=40, order_by="id"
+        )
+
+    def test_bounding_box(self, session):
+        shops_handler({"lat_min": "46.9", "lon_max": "28.95"}, Mock())
+
+        where = session.read_page.call_args.args[0]
+        assert where == {
+            "lat": (Operator.BETWEEN, (46.9, CHISINAU_LAT_MAX)),
+            "lon": (Operator.BETWEEN, (CHISINAU_LON_MIN, 28.95)),
+        }
+        session.count.assert_called_once_with(where)
+
+    def test_limit_is_capped(self, session):
+        _, body = shops_handler({"limit": "1000"}, Mock())
+
+        assert body["limit"] == 100
+
+    def test_invalid_pagination_falls_back_to_defaults(self, session):
+        _, body = shops_handler({"limit": "many", "offset": "-5"}, Mock())
+
+        assert body["limit"] == 50
+        assert body["offset"] == 0
+
+    def test_offset_past_the_end_skips_the_read(self, session):
+        _, body = shops_handler({"offset": "500"}, Mock())
+
+        assert body["items"] == []
+        assert body["total"] == 120
+        session.read_many.assert_not_called()
+
+    def test_first_page_uses_keyset_pagination(self, session):
+        _, body = shops_handler({"country_code": "md", "limit": "20"}, Mock())
+
+        assert body["items"] == [{"id": 1}]
+        assert body["next_cursor"] == "next"
+        session.read_page.assert_called_once_with(
+            {"country_code": "md"}, limit=20, order_by="id", after=None
+        )
+        session.read_many.assert_not_called()
+
+    def test_cursor_takes_precedence_over_offset(self, session):
+        cursor = encode_cursor([20])
+
+        shops_handler({"cursor": cursor, "offset": "40"}, Mock())
+
+        session.read_page.assert_called_once_with(
+            {}, limit=50, order_by="id", after=cursor
+        )
+        session.read_many.assert_not_called()
+
+    def test_invalid_cursor(self, session):
+        session.read_page.side_effect = InvalidCursorError("Invalid cursor")
+
+        status, body = shops_handler({"cursor": "garbage"}, Mock())
+
+        assert status == HTTPStatus.BAD_REQUEST
+        assert body == {"msg": "Invalid cursor"}
+
+    @pytest.mark.parametrize("values", [["abc"], [1.5], [True], [1, 2], [{"id": 1}]])
+    def test_cursor_must_be_a_single_shop_id(self, session, shop_index, values):
+        shop_index.ready = True
+        shop_index.bbox.return_value = [{"id": 1}, {"id": 2}]
+
+        status, body = shops_handler(
+            {"lat_min": "46.9", "cursor": encode_cursor(values)}, Mock()
+        )
+
+        assert status == HTTPStatus.BAD_REQUEST
+        assert body == {"msg": "Invalid cursor"}
+
+    def test_bounding_box_from_the_shop_index(self, session, shop_index):
+        shop_index.ready = True
+        shop_index.bbox.return_value = [
+            {"id": 1, "country_code": "md"},
+            {"id": 2, "country_code": "ro"},
+            {"id": 3, "country_code": "md"},
+        ]
+
+        _, body = shops_handler(
+            {"country_code": "md", "lat_min": "46.9", "offset": "1"}, Mock()
+        )
+
+        assert body["items"] == [{"id": 3, "country_code": "md"}]
+        assert body["total"] == 2
+        shop_index.bbox.assert_called_once_with(
+            46.9, CHISINAU_LAT_MAX, CHISINAU_LON_MIN, CHISINAU_LON_MAX
+        )
+        session.read_many.assert_not_called()
+
+    def test_shop_index_pages_by_cursor(self, session, shop_index):
+        shop_index.ready = True
+        shop_index.bbox.return_value = [{"id": i} for i in range(1, 6)]
+
+        _, first = shops_handler({"lat_min": "46.9", "limit": "2"}, Mock())
+        _, second = shops_handler(
+            {"lat_min": "46.9", "limit": "2", "cursor": first["next_cursor"]}, Mock()
+        )
+
+        assert first["items"] == [{"id": 1}, {"id": 2}]
+        assert decode_cursor(first["next_cursor"]) == [2]
+        assert second["items"] == [{"id": 3}, {"id": 4}]
+        assert second["total"] == 5
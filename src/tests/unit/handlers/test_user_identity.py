@@ -1,9 +1,10 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID
 
 import pytest
 
-from src.handlers.user_identity import UserIdentityHandler
+from src.handlers.user_identity import AsyncUserIdentityHandler, UserIdentityHandler
 from src.schemas.common import TableName
 from src.schemas.user_identity import UserIdentity, IdentityProvider
 
@@ -27,6 +28,16 @@ def user_identity_handler(mock_logger):
         return handler
 
 
+@pytest.fixture
+def async_user_identity_handler(mock_logger):
+    with patch("src.handlers.user_identity.init_async_db_session") as mock_init:
+        mock_init.return_value = Mock()
+        handler = AsyncUserIdentityHandler(mock_logger)
+        handler.db = AsyncMock()
+        handler.db.use_table = Mock()
+        return handler
+
+
 class TestUserIdentityHandlerFind:
     def test_find_existing_identity(self, user_identity_handler):
         """Test finding an existing user identity"""
@@ -255,3 +266,63 @@ class TestUserIdentityHandlerGetOrCreateUserByIdentity:
         ]
         assert TableName.USER_IDENTITY in use_table_calls
         assert TableName.USER in use_table_calls
+
+
+class TestAsyncUserIdentityHandler:
+    def test_get_existing_user_by_identity(self, async_user_identity_handler):
+        user_id = UUID("12345678-1234-5678-1234-567812345678")
+        identity_data = {"id": "google_123", "provider": "google", "user_id": user_id}
+        user_data = {
+            "id": str(user_id),
+            "email": "test@example.com",
+            "name": "Test User",
+        }
+        async_user_identity_handler.db.read_many.return_value = [identity_data]
+        async_user_identity_handler.db.read_one.return_value = user_data
+
+        result = asyncio.run(
+            async_user_identity_handler.get_or_create_user_by_identity(
+                "google_123", "google", "test@example.com", "Test User"
+            )
+        )
+
+        assert result.id == user_id
+        async_user_identity_handler.db.read_many.assert_awaited_once_with(
+            {"id": "google_123", "provider": "google"}, limit=1
+        )
+        async_user_identity_handler.db.read_one.assert_awaited_once_with(str(user_id))
+        async_user_identity_handler.db.create_one.assert_not_awaited()
+
+    def test_create_new_user_when_identity_not_found(self, async_user_identity_handler):
+        new_user_id = "87654321-4321-8765-4321-876543218765"
+        async_user_identity_handler.db.read_many.return_value = []
+        async_user_identity_handler.db.create_one.side_effect = [
+            new_user_id,
+            "google_123",
+        ]
+
+        result = asyncio.run(
+            async_user_identity_handler.get_or_create_user_by_identity(
+                "google_123", "google", "newuser@example.com", "New User"
+            )
+        )
+
+        assert result.id == UUID(new_user_id)
+        assert async_user_identity_handler.db.create_one.await_count == 2
+
+    def test_update_awaits_update_one_by(self, async_user_identity_handler):
+        identity = UserIdentity(
+            id="google_123",
+            provider=IdentityProvider.GOOGLE,
+            user_id=UUID("12345678-1234-5678-1234-567812345678"),
+        )
+        async_user_identity_handler.db.update_one_by.return_value = True
+
+        assert asyncio.run(async_user_identity_handler.update(identity)) is True
+        where = async_user_identity_handler.db.update_one_by.call_args[0][0]
+        assert where == {"id": "google_123", "provider": "google"}
+
+    def test_close_returns_connection(self, async_user_identity_handler):
+        asyncio.run(async_user_identity_handler.close())
+
+        async_user_identity_handler.db.close.assert_awaited_once()
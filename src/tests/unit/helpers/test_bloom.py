@@ -0,0 +1,44 @@
+import pytest
+
+from src.helpers.bloom import BloomFilter
+from src.helpers.common import make_hash
+
+
+class TestBloomFilter:
+    def test_added_keys_are_always_found(self):
+        bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+        keys = [make_hash(f"https://example.com/{i}") for i in range(1000)]
+
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate_is_close_to_target(self):
+        bloom = BloomFilter(capacity=5000, fp_rate=0.01)
+        for i in range(5000):
+            bloom.add(make_hash(f"https://example.com/{i}"))
+
+        false_positives = sum(
+            make_hash(f"https://example.org/{i}") in bloom for i in range(10000)
+        )
+
+        assert false_positives / 10000 < 0.02
+
+    def test_sizing(self):
+        bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+
+        # ~9.6 bits and ~7 hashes per key for 1%
+        assert bloom.stats() == {
+            "capacity": 1000,
+            "count": 0,
+            "fp_rate": 0.01,
+            "num_bits": 9586,
+            "num_hashes": 7,
+        }
+
+    @pytest.mark.parametrize("capacity, fp_rate", [(0, 0.01), (10, 0), (10, 1)])
+    def test_rejects_invalid_settings(self, capacity, fp_rate):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity, fp_rate)
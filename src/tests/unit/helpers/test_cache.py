@@ -0,0 +1,79 @@
+import pytest
+
+from src.helpers.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestLRUCache:
+    def test_get_and_set(self, clock):
+        cache = LRUCache(max_size=2, ttl=10, clock=clock)
+
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", 0) == 0
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_evicts_least_recently_used(self, clock):
+        cache = LRUCache(max_size=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, clock):
+        cache = LRUCache(max_size=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 10
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+        assert cache.stats()["expirations"] == 1
+
+    def test_set_renews_ttl(self, clock):
+        cache = LRUCache(max_size=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 5
+        cache.set("a", 2)
+
+        clock.now = 12
+
+        assert cache.get("a") == 2
+
+    def test_delete_and_clear(self, clock):
+        cache = LRUCache(max_size=3, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        cache.delete("a", "missing")
+        assert cache.get("a") is None
+        assert len(cache) == 2
+
+        cache.clear()
+        assert cache.stats()["size"] == 0
+
+    def test_rejects_empty_cache(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
@@ -0,0 +1,65 @@
+import pytest
+
+from src.helpers.item_names import (
+    fold_diacritics,
+    normalize_item_name,
+    split_quantities,
+)
+
+
+class TestFoldDiacritics:
+    def test_romanian(self):
+        assert fold_diacritics("ăâîșşțţ") == "aaisstt"
+
+    def test_cyrillic_keeps_short_i(self):
+        assert fold_diacritics("йогурт мёд") == "йогурт мед"
+
+
+class TestNormalizeItemName:
+    @pytest.mark.parametrize(
+        "name, normalized",
+        [
+            ("LAPTE DE SOIA ALPRO 1L", "lapte de soia alpro 1l"),
+            ("Lapte de soia Alpro 1 l", "lapte de soia alpro 1l"),
+            ("CIOC. NEAGRĂ 70% 100G", "ciocolata neagra 70% 100g"),
+            ("Băutură veg. ovăz 6X1L", "bautura vegetal ovaz 6x1l"),
+            ("Băutură veg. ovăz 6 x 1,0 L", "bautura vegetal ovaz 6x1l"),
+            ("COCA-COLA ZERO 0.33L X6", "coca cola zero 6x0.33l"),
+            ("Lapte 2,5% 1L", "lapte 2.5% 1l"),
+            ("ШОК. МОЛОЧНЫЙ 90Г", "шоколад молочный 90g"),
+            ("Мёд натуральный 0,5 кг", "мед натуральный 0.5kg"),
+            ("OUA 10X", "oua 10x"),
+            ("7UP 0.5L", "7 up 0.5l"),
+        ],
+    )
+    def test_normalizes(self, name, normalized):
+        assert normalize_item_name(name) == normalized
+
+    @pytest.mark.parametrize(
+        "name, other",
+        [
+            ("PEPSI 0.5L", "PEPSI 1.5L"),
+            ("PEPSI 0.5L", "PEPSI 0.5KG"),
+            ("PEPSI 0.5L", "PEPSI 6X0.5L"),
+            ("7UP 0.5L", "UP 0.5L"),
+            ("Lapte 2,5% 1L", "Lapte 3,2% 1L"),
+        ],
+    )
+    def test_quantities_tell_products_apart(self, name, other):
+        assert normalize_item_name(name) != normalize_item_name(other)
+
+    def test_units_without_a_quantity_are_kept(self):
+        assert normalize_item_name("Sos G") == "sos g"
+
+    def test_results_are_cached(self):
+        normalize_item_name.cache_clear()
+
+        normalize_item_name("LAPTE 1L")
+        normalize_item_name("LAPTE 1L")
+
+        assert normalize_item_name.cache_info().hits == 1
+
+
+def test_split_quantities():
+    assert split_quantities("lapte 2.5% 6x1l") == ("lapte", ("2.5%", "6x1l"))
+    assert split_quantities("paine neagra") == ("paine neagra", ())
@@ -0,0 +1,75 @@
+import pytest
+
+from src.helpers.minhash import MinHashLSH, jaccard, lsh_bands, ngrams
+
+
+class TestNgrams:
+    def test_padded(self):
+        assert ngrams("ab") == {" ab", "ab "}
+
+    def test_short_text(self):
+        assert ngrams("") == {"  "}
+
+    def test_jaccard(self):
+        assert jaccard({"a", "b"}, {"b", "c"}) == pytest.approx(1 / 3)
+        assert jaccard(set(), set()) == 1.0
+
+
+class TestLshBands:
+    @pytest.mark.parametrize("threshold", [0.5, 0.7, 0.9])
+    def test_bands_cover_the_signature(self, threshold):
+        bands, rows = lsh_bands(threshold, 64)
+
+        assert bands * rows == 64
+
+    def test_lower_thresholds_use_more_bands(self):
+        assert lsh_bands(0.5, 64)[0] > lsh_bands(0.9, 64)[0]
+
+
+class TestMinHashLSH:
+    def test_finds_near_duplicates(self):
+        lsh = MinHashLSH(threshold=0.7)
+        lsh.add("a", "lapte de soia alpro")
+        lsh.add("b", "paine neagra feliata")
+
+        found = lsh.query("lapte de soia alpor")
+
+        assert [key for key, _ in found] == ["a"]
+        assert 0.7 <= found[0][1] < 1
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_signatures_estimate_jaccard(self, seed):
+        lsh = MinHashLSH(num_perm=256, seed=seed)
+        a = {f"gram {i}" for i in range(100)}
+        b = {f"gram {i}" for i in range(50, 150)}
+
+        signatures = zip(lsh._signature(a), lsh._signature(b))
+        agreement = sum(x == y for x, y in signatures) / 256
+
+        assert agreement == pytest.approx(jaccard(a, b), abs=0.08)
+
+    def test_exact_duplicate(self):
+        lsh = MinHashLSH()
+        lsh.add("a", "lapte de soia")
+
+        assert lsh.query("lapte de soia") == [("a", 1.0)]
+
+    def test_insert_returns_earlier_duplicates(self):
+        lsh = MinHashLSH()
+
+        assert lsh.insert("a", "lapte de soia") == []
+        assert lsh.insert("b", "lapte de soia") == [("a", 1.0)]
+        assert len(lsh) == 2
+
+    def test_remove(self):
+        lsh = MinHashLSH()
+        lsh.add("a", "lapte de soia")
+
+        assert lsh.remove("a")
+        assert not lsh.remove("a")
+        assert "a" not in lsh
+        assert lsh.query("lapte de soia") == []
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError):
+            MinHashLSH(threshold=0)
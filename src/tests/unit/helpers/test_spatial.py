@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from src.helpers.spatial import GridIndex, haversine_m, radius_bbox
+
+
+def brute_force_nearest(points, lat, lon, k):
+    return sorted(points, key=lambda key: haversine_m(lat, lon, *points[key]))[:k]
+
+
+@pytest.fixture
+def points():
+    rng = random.Random(42)
+    return {
+        i: (46.9 + rng.random() * 0.2, 28.7 + rng.random() * 0.3) for i in range(500)
+    }
+
+
+@pytest.fixture
+def grid(points):
+    grid = GridIndex(cell_deg=0.01)
+    for key, (lat, lon) in points.items():
+        grid.insert(key, lat, lon)
+    return grid
+
+
+class TestHaversine:
+    def test_one_degree_of_latitude(self):
+        assert haversine_m(47.0, 28.8, 48.0, 28.8) == pytest.approx(111_195, rel=1e-3)
+
+    def test_same_point(self):
+        assert haversine_m(47.0, 28.8, 47.0, 28.8) == 0
+
+    def test_radius_bbox_contains_the_circle(self):
+        lat_min, lat_max, lon_min, lon_max = radius_bbox(47.0, 28.8, 1000)
+
+        assert haversine_m(47.0, 28.8, lat_max, 28.8) == pytest.approx(1000)
+        assert haversine_m(47.0, 28.8, 47.0, lon_max) > 1000
+        assert lat_min < 47.0 and lon_min < 28.8
+
+
+class TestGridIndex:
+    def test_insert_moves_existing_keys(self, grid):
+        grid.insert("shop", 47.0, 28.8)
+        grid.insert("shop", 46.0, 27.0)
+
+        assert "shop" in grid
+        assert grid.bbox(46.9, 47.1, 28.7, 28.9).count("shop") == 0
+        assert grid.bbox(45.9, 46.1, 26.9, 27.1) == ["shop"]
+
+    def test_remove(self, grid, points):
+        assert grid.remove(0)
+        assert not grid.remove(0)
+        assert len(grid) == len(points) - 1
+
+    def test_bbox_matches_a_scan(self, grid, points):
+        found = grid.bbox(46.95, 47.0, 28.8, 28.85)
+
+        assert sorted(found) == [
+            key
+            for key, (lat, lon) in points.items()
+            if 46.95 <= lat <= 47.0 and 28.8 <= lon <= 28.85
+        ]
+
+    def test_within_is_sorted_by_distance(self, grid, points):
+        found = grid.within(47.0, 28.85, 2000)
+
+        distances = [distance for _, distance in found]
+        assert distances == sorted(distances)
+        assert sorted(key for key, _ in found) == sorted(
+            key
+            for key, point in points.items()
+            if haversine_m(47.0, 28.85, *point) <= 2000
+        )
+
+    @pytest.mark.parametrize(
+        "lat, lon, k", [(47.0, 28.85, 1), (46.95, 28.75, 10), (45.0, 30.0, 5)]
+    )
+    def test_nearest_matches_brute_force(self, grid, points, lat, lon, k):
+        found = grid.nearest(lat, lon, k)
+
+        assert [key for key, _ in found] == brute_force_nearest(points, lat, lon, k)
+
+    def test_nearest_with_fewer_points_than_k(self):
+        grid = GridIndex()
+        grid.insert("a", 0.0, 0.0)
+        grid.insert("b", 60.0, 100.0)
+
+        assert [key for key, _ in grid.nearest(59.0, 99.0, 5)] == ["b", "a"]
+
+    def test_empty(self):
+        grid = GridIndex()
+
+        assert grid.nearest(47.0, 28.8, 3) == []
+        assert grid.within(47.0, 28.8, 100) == []
+        assert grid.bbox(-90, 90, -180, 180) == []
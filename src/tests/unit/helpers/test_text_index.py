@@ -0,0 +1,62 @@
+from src.helpers.text_index import InvertedIndex, tokenize, trigrams
+
+
+def make_index():
+    index = InvertedIndex()
+    index.add(1, "Lapte de soia Alpro 1L")
+    index.add(2, "Lapte ovaz")
+    index.add(3, "Paine neagra")
+    index.add(4, "Lapte")
+    index.add(5, "Молоко соевое")
+    return index
+
+
+class TestTokenize:
+    def test_words_are_casefolded(self):
+        assert tokenize("Lapte de SOIA, 1L") == ["lapte", "de", "soia", "1l"]
+
+    def test_trigrams_are_padded(self):
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+class TestInvertedIndex:
+    def test_closest_names_rank_first(self):
+        found = make_index().search("lapte")
+
+        assert [key for key, _ in found] == [4, 2, 1]
+        assert found[0][1] == 2.0
+
+    def test_typos_are_tolerated(self):
+        assert [key for key, _ in make_index().search("lapet soia")] == [1]
+
+    def test_cyrillic(self):
+        assert [key for key, _ in make_index().search("молоко")] == [5]
+
+    def test_no_match(self):
+        assert make_index().search("tofu") == []
+        assert make_index().search("!!") == []
+
+    def test_pages_continue_after_the_last_result(self):
+        index = make_index()
+
+        first = index.search("lapte", limit=2)
+        second = index.search("lapte", limit=2, after=(first[-1][1], first[-1][0]))
+
+        assert [key for key, _ in first] == [4, 2]
+        assert [key for key, _ in second] == [1]
+
+    def test_accept_filters_keys(self):
+        found = make_index().search("lapte", accept={1, 2}.__contains__)
+
+        assert [key for key, _ in found] == [2, 1]
+
+    def test_add_replaces_and_remove(self):
+        index = make_index()
+
+        index.add(4, "Tofu")
+        assert index.remove(3)
+        assert not index.remove(3)
+
+        assert [key for key, _ in index.search("tofu")] == [4]
+        assert [key for key, _ in index.search("lapte")] == [2, 1]
+        assert len(index) == 4